@@ -0,0 +1,192 @@
+/**
+ * Awareness relay tests
+ * Runs the relay on an ephemeral port and talks to it with a minimal
+ * WebSocket client over node:http (no client package, any Node version):
+ * `npm test`
+ */
+
+import { test, before, after } from 'node:test';
+import assert from 'node:assert/strict';
+import { request } from 'node:http';
+import { Socket } from 'node:net';
+import { randomBytes } from 'node:crypto';
+import { startAwarenessRelay, AwarenessRelay } from './awareness-relay';
+
+let relay: AwarenessRelay;
+
+before(async () => {
+    relay = await startAwarenessRelay(0);
+});
+
+after(async () => {
+    await relay.close();
+});
+
+/**
+ * Encode a masked client frame
+ */
+function encodeClientFrame(opcode: number, payload: Buffer): Buffer {
+    let header: Buffer;
+    if (payload.length < 126) {
+        header = Buffer.from([0x80 | opcode, 0x80 | payload.length]);
+    } else if (payload.length < 0x10000) {
+        header = Buffer.alloc(4);
+        header[0] = 0x80 | opcode;
+        header[1] = 0x80 | 126;
+        header.writeUInt16BE(payload.length, 2);
+    } else {
+        header = Buffer.alloc(10);
+        header[0] = 0x80 | opcode;
+        header[1] = 0x80 | 127;
+        header.writeBigUInt64BE(BigInt(payload.length), 2);
+    }
+
+    const mask = randomBytes(4);
+    const masked = Buffer.alloc(payload.length);
+    for (let i = 0; i < payload.length; i++) masked[i] = payload[i] ^ mask[i & 3];
+    return Buffer.concat([header, mask, masked]);
+}
+
+class TestClient {
+    private buffered = Buffer.alloc(0);
+    private received: Uint8Array[] = [];
+    private waiting: ((message: Uint8Array) => void) | null = null;
+    private closed: Promise<void>;
+
+    constructor(private socket: Socket, head: Buffer) {
+        this.closed = new Promise(resolve => socket.on('close', () => resolve()));
+        socket.on('data', (chunk: Buffer) => this.receive(chunk));
+        if (head.length > 0) this.receive(head);
+    }
+
+    send(message: Uint8Array) {
+        this.socket.write(encodeClientFrame(0x2, Buffer.from(message)));
+    }
+
+    /**
+     * Next message, or null if none arrives in time
+     */
+    nextMessage(timeout = 500): Promise<Uint8Array | null> {
+        const queued = this.received.shift();
+        if (queued) return Promise.resolve(queued);
+
+        return new Promise((resolve) => {
+            const timer = setTimeout(() => {
+                this.waiting = null;
+                resolve(null);
+            }, timeout);
+            this.waiting = (message) => {
+                clearTimeout(timer);
+                this.waiting = null;
+                resolve(message);
+            };
+        });
+    }
+
+    /**
+     * Close handshake; resolves once the relay has closed the connection
+     */
+    close(): Promise<void> {
+        this.socket.write(encodeClientFrame(0x8, Buffer.alloc(0)));
+        return this.closed;
+    }
+
+    // Server frames are unmasked
+    private receive(chunk: Buffer) {
+        this.buffered = Buffer.concat([this.buffered, chunk]);
+
+        while (this.buffered.length >= 2) {
+            const opcode = this.buffered[0] & 0x0f;
+            let length = this.buffered[1] & 0x7f;
+            let offset = 2;
+            if (length === 126) {
+                if (this.buffered.length < 4) return;
+                length = this.buffered.readUInt16BE(2);
+                offset = 4;
+            } else if (length === 127) {
+                if (this.buffered.length < 10) return;
+                length = Number(this.buffered.readBigUInt64BE(2));
+                offset = 10;
+            }
+            if (this.buffered.length < offset + length) return;
+
+            const payload = new Uint8Array(this.buffered.subarray(offset, offset + length));
+            this.buffered = this.buffered.subarray(offset + length);
+
+            if (opcode === 0x2) {
+                if (this.waiting) this.waiting(payload);
+                else this.received.push(payload);
+            }
+        }
+    }
+}
+
+function connect(room: string): Promise<TestClient> {
+    return new Promise((resolve, reject) => {
+        const req = request({
+            host: '127.0.0.1',
+            port: relay.port,
+            path: `/${encodeURIComponent(room)}`,
+            headers: {
+                Connection: 'Upgrade',
+                Upgrade: 'websocket',
+                'Sec-WebSocket-Key': randomBytes(16).toString('base64'),
+                'Sec-WebSocket-Version': '13',
+            },
+        });
+        req.on('upgrade', (res, socket: Socket, head: Buffer) => resolve(new TestClient(socket, head)));
+        req.on('response', () => reject(new Error(`Failed to connect to room ${room}`)));
+        req.on('error', reject);
+        req.end();
+    });
+}
+
+function nextMessage(client: TestClient, timeout = 500): Promise<Uint8Array | null> {
+    return client.nextMessage(timeout);
+}
+
+function close(client: TestClient): Promise<void> {
+    return client.close();
+}
+
+test('forwards binary messages to the other peers in the room only', async () => {
+    const [sender, peer, stranger] = await Promise.all([connect('page-1'), connect('page-1'), connect('page-2')]);
+
+    const message = Uint8Array.from([1, 2, 3, 250]);
+    const received = nextMessage(peer);
+    const echoed = nextMessage(sender);
+    const leaked = nextMessage(stranger);
+    sender.send(message);
+
+    assert.deepEqual(await received, message);
+    assert.equal(await echoed, null);
+    assert.equal(await leaked, null);
+
+    await Promise.all([close(sender), close(peer), close(stranger)]);
+});
+
+test('relays messages with 16- and 64-bit lengths intact', async () => {
+    const [sender, peer] = await Promise.all([connect('large'), connect('large')]);
+
+    for (const size of [300, 70000]) {
+        const message = new Uint8Array(size);
+        for (let i = 0; i < size; i++) message[i] = (i * 31) & 0xff;
+
+        const received = nextMessage(peer);
+        sender.send(message);
+        assert.deepEqual(await received, message);
+    }
+
+    await Promise.all([close(sender), close(peer)]);
+});
+
+test('keeps relaying after a peer leaves', async () => {
+    const [first, second, third] = await Promise.all([connect('leave'), connect('leave'), connect('leave')]);
+    await close(first);
+
+    const received = nextMessage(third);
+    second.send(Uint8Array.from([42]));
+    assert.deepEqual(await received, Uint8Array.from([42]));
+
+    await Promise.all([close(second), close(third)]);
+});
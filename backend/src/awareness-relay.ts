@@ -0,0 +1,240 @@
+/**
+ * Awareness relay
+ * Stateless WebSocket relay for the web app's awareness channel: binary
+ * messages are forwarded to the other sockets in the same room (the URL
+ * path). Nothing is stored; clients expire peers that go quiet themselves.
+ * Meant for local development and tests: `npm run relay`, or
+ * startAwarenessRelay(0) for an ephemeral port. Deployments without a relay
+ * fall back to Firestore presence documents on the client.
+ *
+ * Speaks just enough of RFC 6455 for awareness traffic (binary messages,
+ * ping/close), so the backend needs no WebSocket dependency.
+ */
+
+import { createServer, IncomingMessage } from 'http';
+import { AddressInfo, Socket } from 'net';
+import { createHash } from 'crypto';
+
+export interface AwarenessRelay {
+    port: number;
+    close(): Promise<void>;
+}
+
+const WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11';
+// Awareness messages are tiny; anything larger is dropped with the connection
+const MAX_MESSAGE_BYTES = 1024 * 1024;
+
+const OPCODE_CONTINUATION = 0x0;
+const OPCODE_BINARY = 0x2;
+const OPCODE_CLOSE = 0x8;
+const OPCODE_PING = 0x9;
+const OPCODE_PONG = 0xa;
+
+/**
+ * Encode an unmasked server frame
+ */
+function encodeFrame(opcode: number, payload: Buffer): Buffer {
+    let header: Buffer;
+    if (payload.length < 126) {
+        header = Buffer.from([0x80 | opcode, payload.length]);
+    } else if (payload.length < 0x10000) {
+        header = Buffer.alloc(4);
+        header[0] = 0x80 | opcode;
+        header[1] = 126;
+        header.writeUInt16BE(payload.length, 2);
+    } else {
+        header = Buffer.alloc(10);
+        header[0] = 0x80 | opcode;
+        header[1] = 127;
+        header.writeBigUInt64BE(BigInt(payload.length), 2);
+    }
+    return Buffer.concat([header, payload]);
+}
+
+/**
+ * One upgraded connection: parses incoming frames and reassembles
+ * fragmented messages
+ */
+class RelayConnection {
+    private buffered = Buffer.alloc(0);
+    private fragments: Buffer[] = [];
+    private fragmentBytes = 0;
+    private closed = false;
+
+    constructor(
+        private socket: Socket,
+        private onMessage: (message: Buffer) => void,
+        private onClose: () => void
+    ) {
+        socket.on('data', (chunk: Buffer) => this.receive(chunk));
+        socket.on('close', () => this.terminate());
+        socket.on('error', (error) => {
+            console.error('Awareness relay socket error:', error);
+            this.terminate();
+        });
+    }
+
+    send(message: Buffer) {
+        if (!this.closed) this.socket.write(encodeFrame(OPCODE_BINARY, message));
+    }
+
+    /**
+     * Answer a close handshake; the client then closes the TCP connection
+     */
+    close() {
+        if (this.closed) return;
+        this.closed = true;
+        this.socket.end(encodeFrame(OPCODE_CLOSE, Buffer.alloc(0)));
+        this.onClose();
+    }
+
+    terminate() {
+        if (this.closed) return;
+        this.closed = true;
+        this.socket.destroy();
+        this.onClose();
+    }
+
+    private receive(chunk: Buffer) {
+        this.buffered = Buffer.concat([this.buffered, chunk]);
+
+        while (!this.closed && this.buffered.length >= 2) {
+            const first = this.buffered[0];
+            const second = this.buffered[1];
+            const fin = (first & 0x80) !== 0;
+            const opcode = first & 0x0f;
+            const masked = (second & 0x80) !== 0;
+
+            let length = second & 0x7f;
+            let offset = 2;
+            if (length === 126) {
+                if (this.buffered.length < 4) return;
+                length = this.buffered.readUInt16BE(2);
+                offset = 4;
+            } else if (length === 127) {
+                if (this.buffered.length < 10) return;
+                const long = this.buffered.readBigUInt64BE(2);
+                if (long > BigInt(MAX_MESSAGE_BYTES)) return this.terminate();
+                length = Number(long);
+                offset = 10;
+            }
+            if (length > MAX_MESSAGE_BYTES) return this.terminate();
+
+            const maskOffset = offset;
+            if (masked) offset += 4;
+            if (this.buffered.length < offset + length) return;
+
+            const payload = Buffer.from(this.buffered.subarray(offset, offset + length));
+            if (masked) {
+                for (let i = 0; i < payload.length; i++) {
+                    payload[i] ^= this.buffered[maskOffset + (i & 3)];
+                }
+            }
+            this.buffered = this.buffered.subarray(offset + length);
+
+            this.handleFrame(fin, opcode, payload);
+        }
+    }
+
+    private handleFrame(fin: boolean, opcode: number, payload: Buffer) {
+        switch (opcode) {
+            case OPCODE_PING:
+                this.socket.write(encodeFrame(OPCODE_PONG, payload));
+                return;
+            case OPCODE_CLOSE:
+                this.close();
+                return;
+            case OPCODE_BINARY:
+            case OPCODE_CONTINUATION: {
+                this.fragments.push(payload);
+                this.fragmentBytes += payload.length;
+                if (this.fragmentBytes > MAX_MESSAGE_BYTES) return this.terminate();
+                if (!fin) return;
+
+                const message = Buffer.concat(this.fragments);
+                this.fragments = [];
+                this.fragmentBytes = 0;
+                this.onMessage(message);
+                return;
+            }
+            default:
+                // Text frames and pongs are not part of the protocol
+                return;
+        }
+    }
+}
+
+export function startAwarenessRelay(port: number): Promise<AwarenessRelay> {
+    const rooms = new Map<string, Set<RelayConnection>>();
+
+    const server = createServer((req, res) => {
+        res.writeHead(426, { 'Content-Type': 'text/plain' });
+        res.end('Upgrade Required');
+    });
+
+    server.on('upgrade', (req: IncomingMessage, socket: Socket) => {
+        const key = req.headers['sec-websocket-key'];
+        if (req.headers.upgrade?.toLowerCase() !== 'websocket' || typeof key !== 'string') {
+            socket.end('HTTP/1.1 400 Bad Request\r\n\r\n');
+            return;
+        }
+
+        let room: string;
+        try {
+            room = decodeURIComponent((req.url || '/').split('?')[0].slice(1));
+        } catch {
+            socket.end('HTTP/1.1 400 Bad Request\r\n\r\n');
+            return;
+        }
+
+        const accept = createHash('sha1').update(key + WEBSOCKET_GUID).digest('base64');
+        socket.write([
+            'HTTP/1.1 101 Switching Protocols',
+            'Upgrade: websocket',
+            'Connection: Upgrade',
+            `Sec-WebSocket-Accept: ${accept}`,
+            '',
+            '',
+        ].join('\r\n'));
+        socket.setNoDelay(true);
+
+        let peers = rooms.get(room);
+        if (!peers) {
+            peers = new Set();
+            rooms.set(room, peers);
+        }
+
+        const connection: RelayConnection = new RelayConnection(
+            socket,
+            (message) => {
+                peers!.forEach(peer => {
+                    if (peer !== connection) peer.send(message);
+                });
+            },
+            () => {
+                peers!.delete(connection);
+                if (peers!.size === 0) rooms.delete(room);
+            }
+        );
+        peers.add(connection);
+    });
+
+    return new Promise((resolve) => {
+        server.listen(port, () => {
+            resolve({
+                port: (server.address() as AddressInfo).port,
+                close: () => new Promise<void>((done) => {
+                    rooms.forEach(peers => peers.forEach(peer => peer.terminate()));
+                    server.close(() => done());
+                }),
+            });
+        });
+    });
+}
+
+if (require.main === module) {
+    const port = Number(process.env.AWARENESS_RELAY_PORT) || 1234;
+    startAwarenessRelay(port).then(relay => {
+        console.log(`Awareness relay running on port ${relay.port}`);
+    });
+}
@@ -0,0 +1,123 @@
+/**
+ * Move inline page bodies into their body documents (pages/{id}/body/current)
+ * so listeners on the pages collection stop receiving them. Safe to re-run:
+ * pages whose body was already moved have no inline content left.
+ *
+ *   npm run migrate:page-bodies [-- --workspace <workspaceId>]
+ */
+
+import * as admin from 'firebase-admin';
+import dotenv from 'dotenv';
+dotenv.config();
+
+type PageDoc = admin.firestore.QueryDocumentSnapshot;
+
+// Pages read per query
+const SCAN_SIZE = 100;
+// Firestore caps a commit at 500 writes and about 10 MiB; two writes per page
+const BATCH_MAX_PAGES = 200;
+const BATCH_MAX_BYTES = 8 * 1024 * 1024;
+
+const results = { scannedPages: 0, movedPages: 0, failedPages: [] as string[] };
+
+function bodyRef(pageDoc: PageDoc) {
+    return pageDoc.ref.collection('body').doc('current');
+}
+
+/**
+ * Move one batch of bodies. A batch that fails is retried in halves, so one
+ * oversized or concurrently edited page doesn't hold back the others.
+ */
+async function moveBodies(db: admin.firestore.Firestore, chunk: PageDoc[]): Promise<void> {
+    try {
+        const bodies = await db.getAll(...chunk.map(bodyRef));
+        const batch = db.batch();
+
+        chunk.forEach((pageDoc, i) => {
+            const page = pageDoc.data();
+            const body = bodies[i];
+            // A body saved since the split is newer than the inline copy
+            const keepBody = body.exists && (body.data()?.content || '') !== '';
+
+            batch.set(body.ref, keepBody
+                ? { workspaceId: page.workspaceId ?? null }
+                : {
+                    workspaceId: page.workspaceId ?? null,
+                    content: page.content || '',
+                    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+                }, { merge: true });
+            // Only if the page hasn't changed since it was read
+            batch.update(pageDoc.ref, { content: admin.firestore.FieldValue.delete() }, {
+                lastUpdateTime: pageDoc.updateTime,
+            });
+        });
+
+        await batch.commit();
+        results.movedPages += chunk.length;
+    } catch (e) {
+        if (chunk.length === 1) {
+            console.error(`Failed to move the body of page ${chunk[0].id}:`, e);
+            results.failedPages.push(chunk[0].id);
+            return;
+        }
+        const middle = Math.ceil(chunk.length / 2);
+        await moveBodies(db, chunk.slice(0, middle));
+        await moveBodies(db, chunk.slice(middle));
+    }
+}
+
+async function main() {
+    const workspaceArg = process.argv.indexOf('--workspace');
+    const workspaceId = workspaceArg >= 0 ? process.argv[workspaceArg + 1] : undefined;
+
+    if (!admin.apps.length) {
+        admin.initializeApp();
+    }
+    const db = admin.firestore();
+
+    console.log(`Moving inline page bodies${workspaceId ? ` in workspace ${workspaceId}` : ''}...`);
+
+    let pages: admin.firestore.Query = db.collection('pages');
+    if (workspaceId) pages = pages.where('workspaceId', '==', workspaceId);
+    pages = pages.orderBy(admin.firestore.FieldPath.documentId()).limit(SCAN_SIZE);
+
+    let last: PageDoc | undefined;
+    for (;;) {
+        const snapshot = await (last ? pages.startAfter(last) : pages).get();
+        if (snapshot.empty) break;
+        last = snapshot.docs[snapshot.docs.length - 1];
+        results.scannedPages += snapshot.size;
+
+        // Batches are sized by body bytes as well as by page count
+        let chunk: PageDoc[] = [];
+        let chunkBytes = 0;
+        for (const pageDoc of snapshot.docs) {
+            const content = pageDoc.data().content;
+            if (content === undefined) continue;
+
+            const bytes = Buffer.byteLength(String(content ?? ''), 'utf8');
+            if (chunk.length > 0 && (chunk.length >= BATCH_MAX_PAGES || chunkBytes + bytes > BATCH_MAX_BYTES)) {
+                await moveBodies(db, chunk);
+                chunk = [];
+                chunkBytes = 0;
+            }
+            chunk.push(pageDoc);
+            chunkBytes += bytes;
+        }
+        if (chunk.length > 0) await moveBodies(db, chunk);
+
+        console.log(`${results.scannedPages} pages scanned, ${results.movedPages} bodies moved`);
+    }
+
+    if (results.failedPages.length > 0) {
+        console.error(`${results.failedPages.length} pages failed (re-run to retry): ${results.failedPages.join(', ')}`);
+        process.exitCode = 1;
+    } else {
+        console.log('Page bodies moved successfully.');
+    }
+}
+
+main().catch(e => {
+    console.error('Page body migration failed:', e);
+    process.exitCode = 1;
+});
@@ -0,0 +1,101 @@
+/**
+ * Filter engine benchmark
+ * Times a compiled filter group with text operators over a synthetic
+ * database against a filter that lowercases every cell on every test (how
+ * text filters ran before they were compiled into case-insensitive matchers).
+ *
+ *   npm run bench:filter-engine -- [rows]
+ */
+
+import assert from 'node:assert/strict';
+import type { Page } from '../src/lib/workspace';
+import { FilterGroup, compileFilterGroup } from '../src/lib/filter-engine';
+
+type Property = NonNullable<Page['properties']>[number];
+
+const ROWS = Number(process.argv[2]) || 50000;
+const RUNS = 10;
+
+let seed = 11;
+const random = () => (seed = (seed * 16807) % 2147483647) / 2147483647;
+const pick = <T,>(items: T[]) => items[Math.floor(random() * items.length)];
+
+const words = ['Alpha', 'Budget', 'Review', 'Launch', 'Design', 'Meeting', 'Quarterly', 'Roadmap', 'Hiring', 'Sync'];
+const statuses = ['Not started', 'In progress', 'Blocked', 'Done'];
+
+const schema = [
+  { id: 'name', name: 'Name', type: 'text' },
+  { id: 'status', name: 'Status', type: 'select' },
+  { id: 'notes', name: 'Notes', type: 'text' },
+] as Property[];
+
+const pages = Array.from({ length: ROWS }, (_, i) => ({
+  id: `row-${i}`,
+  propertyValues: {
+    name: `${pick(words)} ${pick(words)} ${i}`,
+    status: pick(statuses),
+    notes: Array.from({ length: 12 }, () => pick(words)).join(' '),
+  },
+})) as unknown as Page[];
+
+const filterGroup: FilterGroup = {
+  condition: 'OR',
+  filters: [
+    { id: 'f1', propertyId: 'status', operator: 'equals', value: 'Done' },
+  ],
+  groups: [{
+    condition: 'AND',
+    filters: [
+      { id: 'f2', propertyId: 'name', operator: 'contains', value: 'REVIEW' },
+      { id: 'f3', propertyId: 'notes', operator: 'not_contains', value: 'hiring' },
+      { id: 'f4', propertyId: 'status', operator: 'starts_with', value: 'in' },
+    ],
+  }],
+};
+
+// Reference: every cell is lowercased each time it is tested
+function lowercasingPredicate(page: Page): boolean {
+  const values = page.propertyValues || {};
+  const lower = (value: any) => String(value || '').toLowerCase();
+  return values.status == 'Done' || (
+    lower(values.name).includes('review') &&
+    !lower(values.notes).includes('hiring') &&
+    lower(values.status).startsWith('in')
+  );
+}
+
+function median(samples: number[]): number {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+function time(label: string, run: () => void) {
+  run(); // warm up
+  const samples: number[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    const start = performance.now();
+    run();
+    samples.push(performance.now() - start);
+  }
+  console.log(`${label.padEnd(40)} ${median(samples).toFixed(2).padStart(9)} ms`);
+}
+
+console.log(`${ROWS} rows\n`);
+
+const expected = pages.filter(lowercasingPredicate);
+assert.deepEqual(pages.filter(compileFilterGroup(filterGroup, schema)), expected);
+console.log(`${expected.length} matching rows\n`);
+
+time('lowercasing every cell', () => {
+  pages.filter(lowercasingPredicate);
+});
+time('compile + first pass', () => {
+  pages.filter(compileFilterGroup(filterGroup, schema));
+});
+
+// A live query keeps its predicate and re-tests rows as they change
+const predicate = compileFilterGroup(filterGroup, schema);
+pages.filter(predicate);
+time('compiled, re-testing rows', () => {
+  pages.filter(predicate);
+});
@@ -0,0 +1,104 @@
+/**
+ * Formula engine benchmark
+ * Times formula evaluation over a synthetic database: parsing per cell (how
+ * formulas were evaluated before compilation was cached) against the cached
+ * compile, the columnar pass and FormulaEvaluator's incremental updates.
+ *
+ *   npm run bench:formula-engine -- [rows]
+ */
+
+import assert from 'node:assert/strict';
+import * as math from 'mathjs';
+import type { Page } from '../src/lib/workspace';
+import {
+  PropertyMap,
+  evaluateFormula,
+  evaluateFormulaColumn,
+  FormulaEvaluator,
+} from '../src/lib/formula-engine';
+
+type Property = NonNullable<Page['properties']>[number];
+
+const ROWS = Number(process.argv[2]) || 10000;
+const RUNS = 5;
+
+const FORMULA = "prop('Price') * prop('Quantity') * (1 - prop('Discount'))";
+
+const properties: Property[] = [
+  { id: 'price', name: 'Price', type: 'number' },
+  { id: 'quantity', name: 'Quantity', type: 'number' },
+  { id: 'discount', name: 'Discount', type: 'number' },
+  { id: 'total', name: 'Total', type: 'formula', formula: FORMULA },
+  { id: 'taxed', name: 'Taxed', type: 'formula', formula: "prop('Total') * 1.1" },
+] as Property[];
+
+let seed = 7;
+const random = () => (seed = (seed * 16807) % 2147483647) / 2147483647;
+
+const pages = Array.from({ length: ROWS }, (_, i) => ({
+  id: `row-${i}`,
+  propertyValues: {
+    price: Math.round(random() * 10000) / 100,
+    quantity: Math.floor(random() * 20),
+    discount: Math.round(random() * 30) / 100,
+  },
+})) as unknown as Page[];
+
+const rows: PropertyMap[] = pages.map(page => ({
+  Price: page.propertyValues!.price,
+  Quantity: page.propertyValues!.quantity,
+  Discount: page.propertyValues!.discount,
+}));
+
+function median(samples: number[]): number {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+function time(label: string, run: () => void) {
+  run(); // warm up
+  const samples: number[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    const start = performance.now();
+    run();
+    samples.push(performance.now() - start);
+  }
+  console.log(`${label.padEnd(44)} ${median(samples).toFixed(2).padStart(9)} ms`);
+}
+
+console.log(`${ROWS} rows, formula: ${FORMULA}\n`);
+
+// Same results whichever way a cell is evaluated
+const column = evaluateFormulaColumn(FORMULA, pages, properties);
+rows.forEach((row, i) => {
+  const parsed = math.evaluate(FORMULA, { prop: (name: string) => row[name] ?? 0 });
+  assert.equal(evaluateFormula(FORMULA, row), parsed);
+  assert.equal(column.values[i], parsed);
+});
+
+time('parse per cell (math.evaluate)', () => {
+  rows.forEach(row => math.evaluate(FORMULA, { prop: (name: string) => row[name] ?? 0 }));
+});
+time('evaluateFormula per cell (cached compile)', () => {
+  rows.forEach(row => evaluateFormula(FORMULA, row));
+});
+time('evaluateFormulaColumn', () => {
+  evaluateFormulaColumn(FORMULA, pages, properties);
+});
+time('FormulaEvaluator, first evaluation', () => {
+  new FormulaEvaluator(properties).evaluate(pages);
+});
+
+// One edited row: only that row's formulas are recomputed
+const evaluator = new FormulaEvaluator(properties);
+evaluator.evaluate(pages);
+let edit = 0;
+time('FormulaEvaluator, one row edited', () => {
+  const row = edit++ % ROWS;
+  const edited = pages.slice();
+  edited[row] = {
+    ...pages[row],
+    propertyValues: { ...pages[row].propertyValues, quantity: edit },
+  } as Page;
+  evaluator.evaluate(edited);
+});
@@ -0,0 +1,82 @@
+/**
+ * Search index benchmark
+ * Indexes synthetic blocks into ClientSearchIndex (in-thread, no IndexedDB)
+ * and times typical command-palette queries.
+ *
+ *   npm run bench:search-index -- [blocks]
+ */
+
+import assert from 'node:assert/strict';
+import { ClientSearchIndex } from '../src/lib/search-index';
+
+const BLOCK_COUNT = Number(process.argv[2]) || 50000;
+const PAGE_SIZE = 100; // blocks per page
+const WORDS_PER_BLOCK = 24;
+const VOCABULARY_SIZE = 8000;
+const RUNS = 200;
+
+let seed = 42;
+const random = () => (seed = (seed * 16807) % 2147483647) / 2147483647;
+
+// Pronounceable words; a few hundred of them are common (Zipf-like)
+const syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'shi', 'po', 'ven', 'dor', 'gal', 'mex'];
+const vocabulary = Array.from({ length: VOCABULARY_SIZE }, (_, i) => {
+    let word = '';
+    for (let n = i + 1; n > 0; n = Math.floor(n / syllables.length)) word += syllables[n % syllables.length];
+    return word;
+});
+const stopWords = ['the', 'and', 'of', 'to', 'in'];
+
+function sentence(): string {
+    const words: string[] = [];
+    for (let i = 0; i < WORDS_PER_BLOCK; i++) {
+        words.push(random() < 0.2
+            ? stopWords[Math.floor(random() * stopWords.length)]
+            : vocabulary[Math.floor(VOCABULARY_SIZE * random() ** 3)]);
+    }
+    return words.join(' ');
+}
+
+function percentile(sorted: number[], p: number): number {
+    return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+const index = new ClientSearchIndex();
+
+let start = performance.now();
+for (let i = 0; i < BLOCK_COUNT; i++) {
+    index.indexText(`block-${i}`, `page-${Math.floor(i / PAGE_SIZE)}`, sentence());
+}
+console.log(`Indexed ${BLOCK_COUNT} blocks in ${(performance.now() - start).toFixed(0)} ms\n`);
+
+const common = vocabulary[1];
+const rare = vocabulary[VOCABULARY_SIZE - 10];
+const queries: [label: string, query: string][] = [
+    ['single common term', common],
+    ['single rare term', `${rare} `],
+    ['two terms', `${common} ${vocabulary[5]} `],
+    ['prefix (typing)', common.slice(0, 3)],
+    ['terms + prefix', `${vocabulary[3]} ${vocabulary[7].slice(0, 3)}`],
+    ['phrase', `"${common} ${vocabulary[2]}"`],
+];
+
+// A trailing stop word is not a prefix: the word before it stays a full term
+assert.deepEqual(index.search(`${common} the`), index.search(`${common} `));
+
+for (const [label, query] of queries) {
+    index.search(query); // warm up
+    const samples: number[] = [];
+    for (let i = 0; i < RUNS; i++) {
+        start = performance.now();
+        index.search(query);
+        samples.push(performance.now() - start);
+    }
+    samples.sort((a, b) => a - b);
+    console.log(
+        `${label.padEnd(20)} p50 ${percentile(samples, 0.5).toFixed(2).padStart(7)} ms` +
+        `   p95 ${percentile(samples, 0.95).toFixed(2).padStart(7)} ms`
+    );
+}
+
+// Nothing to persist to outside the browser
+process.exit(0);
@@ -0,0 +1,102 @@
+/**
+ * Yjs payload codec check and benchmark
+ * Runs a ~5 MB Yjs update through the provider's storage path (split into
+ * parts, wrapped as Firestore Bytes, read back, joined, applied) and times
+ * it against the base64 codec it replaced.
+ *
+ *   npm run bench:yjs-bytes
+ */
+
+import assert from 'node:assert/strict';
+import * as Y from 'yjs';
+import { Bytes } from 'firebase/firestore';
+import { MAX_PART_BYTES, fromStoredBytes, splitBytes, joinBytes } from '../src/lib/yjs-bytes';
+
+const TARGET_BYTES = 5 * 1024 * 1024;
+const RUNS = 10;
+
+// The base64 codec used before payloads were stored as Bytes
+const BASE64_CHUNK = 0x8000;
+
+function encodeBase64(bytes: Uint8Array): string {
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += BASE64_CHUNK) {
+        binary += String.fromCharCode.apply(null, bytes.subarray(i, i + BASE64_CHUNK) as unknown as number[]);
+    }
+    return btoa(binary);
+}
+
+function decodeBase64(encoded: string): Uint8Array {
+    return Uint8Array.from(atob(encoded), (c) => c.charCodeAt(0));
+}
+
+/**
+ * A document built from many small edits, like a long editing session
+ */
+function buildUpdate(): { update: Uint8Array; text: string } {
+    const ydoc = new Y.Doc();
+    const ytext = ydoc.getText('content');
+    let seed = 1;
+    const random = () => (seed = (seed * 16807) % 2147483647) / 2147483647;
+    const alphabet = 'abcdefghijklmnopqrstuvwxyz      .,\n';
+
+    while (ytext.length < TARGET_BYTES) {
+        let chunk = '';
+        for (let i = 0; i < 1024; i++) chunk += alphabet[Math.floor(random() * alphabet.length)];
+        ytext.insert(Math.floor(random() * ytext.length), chunk);
+    }
+
+    return { update: Y.encodeStateAsUpdate(ydoc), text: ytext.toString() };
+}
+
+/**
+ * Provider write path followed by its read path
+ */
+function roundTripBytes(update: Uint8Array): Uint8Array {
+    const stored = splitBytes(update).map(part => Bytes.fromUint8Array(part));
+    return joinBytes(stored.map(part => fromStoredBytes(part)));
+}
+
+function roundTripBase64(update: Uint8Array): Uint8Array {
+    return decodeBase64(encodeBase64(update));
+}
+
+function median(samples: number[]): number {
+    const sorted = [...samples].sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+}
+
+function time(label: string, run: () => void) {
+    run(); // warm up
+    const samples: number[] = [];
+    for (let i = 0; i < RUNS; i++) {
+        const start = performance.now();
+        run();
+        samples.push(performance.now() - start);
+    }
+    console.log(`${label.padEnd(36)} ${median(samples).toFixed(1).padStart(8)} ms`);
+}
+
+const { update, text } = buildUpdate();
+console.log(`Update: ${(update.byteLength / 1024 / 1024).toFixed(2)} MB`);
+
+// Correctness: parts fit in a document and reassemble into a valid update
+const parts = splitBytes(update);
+assert.ok(parts.length > 1, 'a 5 MB update is split');
+parts.forEach(part => assert.ok(part.byteLength <= MAX_PART_BYTES));
+
+const restored = roundTripBytes(update);
+assert.deepEqual(restored, update);
+const replica = new Y.Doc();
+Y.applyUpdate(replica, restored);
+assert.equal(replica.getText('content').toString(), text);
+
+// Documents written before the switch still decode
+const legacy = encodeBase64(update);
+assert.deepEqual(fromStoredBytes(legacy), update);
+console.log(`Round trip OK (${parts.length} parts)\n`);
+
+time('Bytes: split, store, read, join', () => roundTripBytes(update));
+time('base64: encode, decode', () => roundTripBase64(update));
+time('base64 legacy read (fromStoredBytes)', () => fromStoredBytes(legacy));
+time('Y.applyUpdate', () => Y.applyUpdate(new Y.Doc(), restored));
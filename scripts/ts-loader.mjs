@@ -0,0 +1,60 @@
+/**
+ * TypeScript loader for the benchmark scripts
+ * Transpiles .ts files with the project's typescript devDependency (types
+ * stripped per file, no type checking) and resolves the extensionless and
+ * `@/` imports used in src/, so scripts run on plain Node without a runner:
+ *
+ *   node --import ./scripts/ts-loader.mjs scripts/bench-filter-engine.ts
+ */
+
+import { register } from 'node:module';
+import { isMainThread } from 'node:worker_threads';
+import { existsSync } from 'node:fs';
+import { readFile } from 'node:fs/promises';
+import { fileURLToPath } from 'node:url';
+import ts from 'typescript';
+
+// Hooks run on their own thread; only the main thread registers them
+if (isMainThread) register(import.meta.url);
+
+const SRC_URL = new URL('../src/', import.meta.url);
+const TS_FILE = /\.tsx?$/;
+
+/**
+ * File URL for a relative or `@/` import written without an extension
+ */
+function resolveSource(specifier, parentURL) {
+    let base;
+    if (specifier.startsWith('@/')) base = new URL(specifier.slice(2), SRC_URL);
+    else if (specifier.startsWith('./') || specifier.startsWith('../')) base = new URL(specifier, parentURL);
+    else return null;
+
+    if (existsSync(fileURLToPath(base)) && TS_FILE.test(base.pathname)) return base.href;
+    for (const suffix of ['.ts', '.tsx', '/index.ts', '/index.tsx']) {
+        const url = new URL(base.href + suffix);
+        if (existsSync(fileURLToPath(url))) return url.href;
+    }
+    return null;
+}
+
+export async function resolve(specifier, context, nextResolve) {
+    const url = context.parentURL ? resolveSource(specifier, context.parentURL) : null;
+    if (url) return { url, shortCircuit: true };
+    return nextResolve(specifier, context);
+}
+
+export async function load(url, context, nextLoad) {
+    if (!url.startsWith('file:') || !TS_FILE.test(new URL(url).pathname)) return nextLoad(url, context);
+
+    const fileName = fileURLToPath(url);
+    const { outputText } = ts.transpileModule(await readFile(fileName, 'utf8'), {
+        fileName,
+        compilerOptions: {
+            module: ts.ModuleKind.ESNext,
+            target: ts.ScriptTarget.ES2022,
+            jsx: ts.JsxEmit.ReactJSX,
+            inlineSourceMap: true,
+        },
+    });
+    return { format: 'module', source: outputText, shortCircuit: true };
+}
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { db } from '@/lib/firebase';
-import { collection, addDoc, serverTimestamp, query, where, getDocs, doc, setDoc } from 'firebase/firestore';
+import { collection, addDoc, serverTimestamp, query, where, getDocs, doc, setDoc, writeBatch, QueryConstraint } from 'firebase/firestore';
+import { Page, toPageMeta, pageBodyRef, adjustChildCount } from '@/lib/workspace';
 
 export async function GET(req: Request) {
     try {
@@ -11,13 +12,23 @@ export async function GET(req: Request) {
             return NextResponse.json({ error: 'Workspace ID required' }, { status: 400 });
         }
 
-        const q = query(collection(db, 'pages'), where('workspaceId', '==', workspaceId));
+        // ?parentId=<id> lists one level of the tree ('root' for top-level pages)
+        const parentId = searchParams.get('parentId');
+        // ?fields=meta drops page bodies and database fields from the response
+        const metaOnly = searchParams.get('fields') === 'meta';
+
+        const constraints: QueryConstraint[] = [where('workspaceId', '==', workspaceId)];
+        if (parentId) {
+            constraints.push(where('parentId', '==', parentId === 'root' ? null : parentId));
+        }
+
+        const q = query(collection(db, 'pages'), ...constraints);
         const snapshot = await getDocs(q);
 
-        const pages = snapshot.docs.map(doc => ({
-            id: doc.id,
-            ...doc.data()
-        }));
+        const pages = snapshot.docs.map(doc => {
+            const page = { id: doc.id, ...doc.data() } as Page;
+            return metaOnly ? toPageMeta(page) : page;
+        });
 
         return NextResponse.json({ pages });
     } catch (error: any) {
@@ -45,7 +56,6 @@ export async function POST(req: Request) {
             workspaceId,
             parentId: parentId || null,
             title: title || "Untitled",
-            content: "",
             type: type || 'page',
             section: 'workspace',
             createdBy: userId || 'api',
@@ -65,10 +75,14 @@ export async function POST(req: Request) {
         // Wait, workspace.ts: `const pageRef = doc(collection(db, "pages"));` -> generates ID.
         // Then `await setDoc(pageRef, newPage);`.
 
-        // We will do the same:
-        await setDoc(pageRef, newPage);
+        // We will do the same, with the empty body in its own document:
+        const batch = writeBatch(db);
+        batch.set(pageRef, newPage);
+        batch.set(pageBodyRef(pageRef.id), { workspaceId, content: "", updatedAt: serverTimestamp() });
+        await batch.commit();
+        await adjustChildCount(parentId, 1);
 
-        return NextResponse.json(newPage);
+        return NextResponse.json({ ...newPage, content: "" });
     } catch (error: any) {
         console.error('Create Page Error:', error);
         return NextResponse.json(
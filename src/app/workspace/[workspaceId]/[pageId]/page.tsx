@@ -2,7 +2,7 @@
 
 import { useState, useEffect, useRef, useCallback, Suspense, lazy } from "react";
 import { useParams } from "next/navigation";
-import { getPage, updatePage, Page, subscribeToPage, subscribeToChildPages, trackPageView, trackPageUpdate } from "@/lib/workspace";
+import { getPage, updatePage, Page, subscribeToPage, subscribeToPageBody, subscribeToChildPages, trackPageView, trackPageUpdate } from "@/lib/workspace";
 import { localStore } from "@/lib/local-store";
 import Editor, { EditorHandle } from "@/components/Editor";
 import UnifiedEditor from "@/components/UnifiedEditor";
@@ -37,6 +37,8 @@ export default function PageEditor() {
     const [content, setContent] = useState("");
     const [cover, setCover] = useState("");
     const [icon, setIcon] = useState("");
+    // Latest body, kept alongside metadata in the local cache
+    const contentRef = useRef("");
 
     const [loading, setLoading] = useState(true);
     const [saving, setSaving] = useState(false);
@@ -107,6 +109,7 @@ export default function PageEditor() {
     };
 
     const handleContentChange = (newContent: string) => {
+        contentRef.current = newContent;
         setContent(newContent); // Immediate UI update
         setSaving(true);
 
@@ -148,7 +151,8 @@ export default function PageEditor() {
                 if (cachedPage) {
                     setPage(cachedPage);
                     setTitle(cachedPage.title);
-                    setContent(cachedPage.content || "");
+                    contentRef.current = cachedPage.content || "";
+                    setContent(contentRef.current);
                     setCover(cachedPage.cover || "");
                     setIcon(cachedPage.icon || "");
                     setLoading(false);
@@ -158,23 +162,32 @@ export default function PageEditor() {
             // 2. Track View
             trackPageView(pageId, user.uid);
 
-            // 3. Subscribe to real-time updates
+            // 3. Subscribe to real-time metadata updates
             const unsubscribe = subscribeToPage(pageId, (fetchedPage) => {
                 if (fetchedPage) {
                     setPage(fetchedPage);
                     if (!saving) {
                         setTitle(fetchedPage.title);
-                        setContent(fetchedPage.content || "");
                         setCover(fetchedPage.cover || "");
                         setIcon(fetchedPage.icon || "");
                     }
                     // Update local cache
-                    localStore.savePage(fetchedPage);
+                    localStore.savePage({ ...fetchedPage, content: contentRef.current });
                 }
                 setLoading(false);
             });
 
-            return () => unsubscribe();
+            // 4. The body lives in its own document and is loaded on demand
+            const unsubscribeBody = subscribeToPageBody(pageId, (body) => {
+                if (saving) return;
+                contentRef.current = body;
+                setContent(body);
+            });
+
+            return () => {
+                unsubscribe();
+                unsubscribeBody();
+            };
         }
     }, [pageId, user?.uid]);
 
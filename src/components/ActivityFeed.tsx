@@ -29,6 +29,7 @@ import {
     Share2
 } from 'lucide-react';
 import { formatDistanceToNow } from 'date-fns';
+import { useUserProfile } from '@/hooks/useUserProfiles';
 
 export interface Activity {
     id: string;
@@ -192,20 +193,24 @@ interface ActivityItemProps {
 
 function ActivityItem({ activity }: ActivityItemProps) {
     const { icon: Icon, color, text } = getActivityDetails(activity);
+    // Current profile; the name stored on the activity may be outdated
+    const profile = useUserProfile(activity.userId);
+    const userName = profile?.displayName || activity.userName;
+    const userPhoto = profile?.photoURL || activity.userPhoto;
 
     return (
         <div className="p-4 hover:bg-gray-50 dark:hover:bg-gray-800/50 transition">
             <div className="flex items-start gap-3">
                 {/* User Avatar */}
-                {activity.userPhoto ? (
+                {userPhoto ? (
                     <img
-                        src={activity.userPhoto}
-                        alt={activity.userName}
+                        src={userPhoto}
+                        alt={userName}
                         className="w-8 h-8 rounded-full"
                     />
                 ) : (
                     <div className="w-8 h-8 rounded-full bg-blue-500 flex items-center justify-center text-white text-sm">
-                        {activity.userName[0].toUpperCase()}
+                        {userName[0].toUpperCase()}
                     </div>
                 )}
 
@@ -215,7 +220,7 @@ function ActivityItem({ activity }: ActivityItemProps) {
                         <Icon size={16} className={`mt-0.5 flex-shrink-0 ${color}`} />
                         <div className="flex-1">
                             <p className="text-sm">
-                                <span className="font-medium">{activity.userName}</span>{' '}
+                                <span className="font-medium">{userName}</span>{' '}
                                 <span className="text-gray-600 dark:text-gray-400">{text}</span>{' '}
                                 <span className="font-medium">{activity.pageTitle}</span>
                             </p>
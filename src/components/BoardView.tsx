@@ -1,10 +1,11 @@
 "use client";
 
-import { useState, useEffect } from 'react';
+import { useMemo } from 'react';
 import { Page, updatePage } from '@/lib/workspace';
 import { Plus, MoreVertical, FileText } from 'lucide-react';
 import { DragDropContext, Droppable, Draggable, DropResult } from '@hello-pangea/dnd';
 import { useRouter } from 'next/navigation';
+import { getGroupIndex, NO_GROUP } from '@/lib/group-index';
 
 interface BoardViewProps {
     workspaceId: string;
@@ -21,34 +22,25 @@ export default function BoardView({ workspaceId, parentPage, childPages, onUpdat
     const groupByProperty = columns.find(c => c.type === 'select' || c.type === 'multi-select');
     const groupOptions = groupByProperty?.options || [];
 
-    // Group pages by status
-    const [boardData, setBoardData] = useState<Record<string, Page[]>>({});
-
-    useEffect(() => {
-        if (!groupByProperty) return;
+    // Group pages by status (shared with other views of this database)
+    const boardData = useMemo<Record<string, Page[]>>(() => {
+        if (!groupByProperty) return {};
 
+        const index = getGroupIndex(parentPage.id, { propertyId: groupByProperty.id });
+        const groups = index.sync(childPages);
         const grouped: Record<string, Page[]> = {};
 
-        // Initialize all columns
         groupOptions.forEach(opt => {
-            grouped[opt.id] = [];
+            grouped[opt.id] = groups[opt.id] || [];
         });
 
-        // Add "No status" column
-        grouped['__none__'] = [];
-
-        // Group pages
-        childPages.forEach(page => {
-            const value = page.propertyValues?.[groupByProperty.id];
-            if (value && grouped[value]) {
-                grouped[value].push(page);
-            } else {
-                grouped['__none__'].push(page);
-            }
-        });
+        // Pages without a value matching any option go to "No status"
+        grouped[NO_GROUP] = childPages.filter(page =>
+            index.keysOf(page.id).every(key => !grouped[key])
+        );
 
-        setBoardData(grouped);
-    }, [childPages, groupByProperty, groupOptions]);
+        return grouped;
+    }, [childPages, parentPage.id, groupByProperty, groupOptions]);
 
     const handleDragEnd = async (result: DropResult) => {
         const { source, destination, draggableId } = result;
@@ -56,16 +48,26 @@ export default function BoardView({ workspaceId, parentPage, childPages, onUpdat
         if (!destination || !groupByProperty) return;
         if (source.droppableId === destination.droppableId && source.index === destination.index) return;
 
-        // Find the dragged page
-        const page = childPages.find(p => p.id === draggableId);
+        // Find the dragged page (multi-select cards appear once per option)
+        const pageId = draggableId.slice(draggableId.indexOf('/') + 1);
+        const page = childPages.find(p => p.id === pageId);
         if (!page) return;
 
         // Update the page's status
-        const newStatus = destination.droppableId === '__none__' ? null : destination.droppableId;
+        const newStatus = destination.droppableId === NO_GROUP ? null : destination.droppableId;
+        let newValue: any = newStatus;
+        if (groupByProperty.type === 'multi-select') {
+            const current: string[] = Array.isArray(page.propertyValues?.[groupByProperty.id])
+                ? page.propertyValues![groupByProperty.id]
+                : [];
+            const kept = current.filter(id => id !== source.droppableId);
+            newValue = newStatus && !kept.includes(newStatus) ? [...kept, newStatus] : kept;
+        }
+
         await updatePage(page.id, {
             propertyValues: {
                 ...page.propertyValues,
-                [groupByProperty.id]: newStatus,
+                [groupByProperty.id]: newValue,
             }
         });
     };
@@ -126,7 +128,7 @@ export default function BoardView({ workspaceId, parentPage, childPages, onUpdat
                                     >
                                         {/* Cards */}
                                         {(boardData[option.id] || []).map((page, index) => (
-                                            <Draggable key={page.id} draggableId={page.id} index={index}>
+                                            <Draggable key={page.id} draggableId={`${option.id}/${page.id}`} index={index}>
                                                 {(provided, snapshot) => (
                                                     <div
                                                         ref={provided.innerRef}
@@ -182,12 +184,12 @@ export default function BoardView({ workspaceId, parentPage, childPages, onUpdat
                                     No Status
                                 </span>
                                 <span className="text-sm text-gray-500 dark:text-gray-400">
-                                    {boardData['__none__']?.length || 0}
+                                    {boardData[NO_GROUP]?.length || 0}
                                 </span>
                             </div>
                         </div>
 
-                        <Droppable droppableId="__none__">
+                        <Droppable droppableId={NO_GROUP}>
                             {(provided, snapshot) => (
                                 <div
                                     ref={provided.innerRef}
@@ -197,8 +199,8 @@ export default function BoardView({ workspaceId, parentPage, childPages, onUpdat
                                             : 'bg-gray-50 dark:bg-[#1C1C1C]'
                                         }`}
                                 >
-                                    {(boardData['__none__'] || []).map((page, index) => (
-                                        <Draggable key={page.id} draggableId={page.id} index={index}>
+                                    {(boardData[NO_GROUP] || []).map((page, index) => (
+                                        <Draggable key={page.id} draggableId={`${NO_GROUP}/${page.id}`} index={index}>
                                             {(provided, snapshot) => (
                                                 <div
                                                     ref={provided.innerRef}
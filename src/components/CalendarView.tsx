@@ -1,6 +1,7 @@
 "use client";
 
 import { Page } from '@/lib/workspace';
+import { getGroupIndex } from '@/lib/group-index';
 import { format, startOfMonth, endOfMonth, eachDayOfInterval, isSameMonth, isSameDay } from 'date-fns';
 import { ChevronLeft, ChevronRight } from 'lucide-react';
 import { useState } from 'react';
@@ -25,16 +26,8 @@ export default function CalendarView({ workspaceId, parentPage, childPages }: Ca
   const monthStart = startOfMonth(currentDate);
   const monthEnd = endOfMonth(currentDate);
   const days = eachDayOfInterval({ start: monthStart, end: monthEnd });
-  const pagesByDate: Record<string, Page[]> = {};
-  
-  childPages.forEach(page => {
-    const dateValue = page.propertyValues?.[dateProperty.id];
-    if (dateValue) {
-      const dateKey = format(new Date(dateValue), 'yyyy-MM-dd');
-      if (!pagesByDate[dateKey]) pagesByDate[dateKey] = [];
-      pagesByDate[dateKey].push(page);
-    }
-  });
+  // Day buckets from the shared group index (keys are 'yyyy-MM-dd')
+  const pagesByDate = getGroupIndex(parentPage.id, { propertyId: dateProperty.id, dateBucket: 'day' }).sync(childPages);
 
   const weekDays = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
 
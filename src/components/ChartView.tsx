@@ -2,6 +2,8 @@
 
 import { useMemo, useState } from 'react';
 import { Page } from '@/lib/workspace';
+import { getGroupIndex, NO_GROUP } from '@/lib/group-index';
+import { aggregate } from '@/lib/aggregation';
 import { BarChart, Bar, LineChart, Line, PieChart, Pie, AreaChart, Area, ScatterChart, Scatter, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, Cell } from 'recharts';
 import { BarChart3, LineChart as LineChartIcon, PieChart as PieChartIcon, Activity, TrendingUp } from 'lucide-react';
 
@@ -25,18 +27,26 @@ export default function ChartView({ parentPage, childPages }: ChartViewProps) {
     const chartData = useMemo(() => {
         if (!xAxis || !yAxis) return [];
 
+        // Series grouping comes from the shared group index for the property
+        const groupProp = groupBy ? columns.find(c => c.id === groupBy) : null;
+        const groupIndex = groupProp ? getGroupIndex(parentPage.id, { propertyId: groupProp.id }) : null;
+        groupIndex?.sync(childPages);
+
         return childPages.map(page => {
-            const xProp = columns.find(c => c.id === xAxis);
-            const yProp = columns.find(c => c.id === yAxis);
-            const groupProp = groupBy ? columns.find(c => c.id === groupBy) : null;
+            const groupKeys = groupIndex ? groupIndex.keysOf(page.id).filter(key => key !== NO_GROUP) : [];
 
             return {
                 name: page.propertyValues?.[xAxis] || page.title || 'Untitled',
                 value: Number(page.propertyValues?.[yAxis]) || 0,
-                group: groupProp && groupBy ? page.propertyValues?.[groupBy] : null,
+                group: groupKeys.length > 0
+                    ? groupKeys.map(key => groupProp?.options?.find(opt => opt.id === key)?.name || key).join(', ')
+                    : null,
             };
         });
-    }, [childPages, xAxis, yAxis, groupBy, columns]);
+    }, [childPages, parentPage.id, xAxis, yAxis, groupBy, columns]);
+
+    // Summary statistics, computed in one pass without spreading into Math.max
+    const stats = useMemo(() => aggregate(chartData.map(d => d.value)), [chartData]);
 
     const numberColumns = columns.filter(c => c.type === 'number' || c.type === 'formula');
     const textColumns = columns.filter(c => c.type === 'text' || c.type === 'select');
@@ -219,19 +229,19 @@ export default function ChartView({ parentPage, childPages }: ChartViewProps) {
                     <div className="bg-white dark:bg-[#1C1C1C] p-4 rounded-lg border border-gray-200 dark:border-gray-800">
                         <p className="text-xs text-gray-500 dark:text-gray-400 mb-1">Sum</p>
                         <p className="text-2xl font-bold text-gray-900 dark:text-gray-100">
-                            {chartData.reduce((sum, d) => sum + d.value, 0).toFixed(2)}
+                            {stats.sum.toFixed(2)}
                         </p>
                     </div>
                     <div className="bg-white dark:bg-[#1C1C1C] p-4 rounded-lg border border-gray-200 dark:border-gray-800">
                         <p className="text-xs text-gray-500 dark:text-gray-400 mb-1">Average</p>
                         <p className="text-2xl font-bold text-gray-900 dark:text-gray-100">
-                            {(chartData.reduce((sum, d) => sum + d.value, 0) / chartData.length).toFixed(2)}
+                            {(stats.avg ?? 0).toFixed(2)}
                         </p>
                     </div>
                     <div className="bg-white dark:bg-[#1C1C1C] p-4 rounded-lg border border-gray-200 dark:border-gray-800">
                         <p className="text-xs text-gray-500 dark:text-gray-400 mb-1">Max</p>
                         <p className="text-2xl font-bold text-gray-900 dark:text-gray-100">
-                            {Math.max(...chartData.map(d => d.value)).toFixed(2)}
+                            {(stats.max ?? 0).toFixed(2)}
                         </p>
                     </div>
                 </div>
@@ -5,10 +5,9 @@
 
 "use client";
 
-import { useState, useEffect, useCallback, useMemo } from 'react';
+import { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import { useRouter } from 'next/navigation';
-import { db } from '@/lib/firebase';
-import { collection, query as firestoreQuery, getDocs, where, orderBy, limit } from 'firebase/firestore';
+import { workspaceSearch } from '@/lib/workspace-search';
 import { Search, FileText, Database, Calendar, User, Clock, ArrowRight, Loader2 } from 'lucide-react';
 import { useAuth } from '@/context/AuthContext';
 
@@ -38,6 +37,24 @@ export default function CommandPalette({ isOpen, onClose, workspaceId }: Command
     const [loading, setLoading] = useState(false);
     const [recentSearches, setRecentSearches] = useState<SearchResult[]>([]);
 
+    const [indexVersion, setIndexVersion] = useState(0);
+
+    // Keep the local workspace index current only while the palette is open;
+    // the query re-runs when titles or freshly indexed page bodies land
+    useEffect(() => {
+        if (!isOpen) return;
+
+        const stopIndex = workspaceSearch.subscribe(workspaceId);
+        const stopChanges = workspaceSearch.onChange(() => setIndexVersion(v => v + 1));
+        return () => {
+            stopChanges();
+            stopIndex();
+        };
+    }, [isOpen, workspaceId]);
+
+    // Responses can arrive out of order; only the latest query's results are shown
+    const searchSeqRef = useRef(0);
+
     // Load recent searches from localStorage
     useEffect(() => {
         if (typeof window !== 'undefined') {
@@ -48,8 +65,10 @@ export default function CommandPalette({ isOpen, onClose, workspaceId }: Command
         }
     }, []);
 
-    // Search function
+    // Search function - titles and page text from the local workspace index, no network reads
     const performSearch = useCallback(async (searchQuery: string) => {
+        const seq = ++searchSeqRef.current;
+
         if (!searchQuery.trim()) {
             setResults(recentSearches);
             return;
@@ -57,60 +76,30 @@ export default function CommandPalette({ isOpen, onClose, workspaceId }: Command
 
         setLoading(true);
         try {
-            const searchResults: SearchResult[] = [];
-
-            // Search pages
-            const pagesRef = collection(db, 'pages');
-            const pagesQ = firestoreQuery(
-                pagesRef,
-                where('workspaceId', '==', workspaceId),
-                orderBy('title'),
-                limit(20)
-            );
-            const pagesSnapshot = await getDocs(pagesQ);
-
-            pagesSnapshot.forEach(doc => {
-                const data = doc.data();
-                const title = data.title || 'Untitled';
-
-                // Fuzzy search
-                if (fuzzyMatch(searchQuery, title)) {
-                    searchResults.push({
-                        id: doc.id,
-                        title,
-                        type: data.type === 'database' ? 'database' : 'page',
-                        icon: data.icon,
-                        path: `/workspace/${workspaceId}/${doc.id}`,
-                        workspaceId,
-                        lastModified: data.updatedAt?.toDate(),
-                        preview: data.content?.substring(0, 100),
-                    });
-                }
-            });
-
-            // Sort by relevance
-            searchResults.sort((a, b) => {
-                const scoreA = calculateRelevance(searchQuery, a.title);
-                const scoreB = calculateRelevance(searchQuery, b.title);
-                return scoreB - scoreA;
-            });
-
-            setResults(searchResults.slice(0, 10));
+            const matches = await workspaceSearch.search(searchQuery, 10);
+            if (seq !== searchSeqRef.current) return;
+
+            setResults(matches.map(match => ({
+                id: match.pageId,
+                title: match.title,
+                type: match.type === 'database' ? 'database' : 'page',
+                icon: match.icon,
+                path: `/workspace/${workspaceId}/${match.pageId}`,
+                workspaceId,
+                lastModified: match.lastModified,
+                preview: match.preview,
+            })));
         } catch (error) {
             console.error('Search failed:', error);
         } finally {
-            setLoading(false);
+            if (seq === searchSeqRef.current) setLoading(false);
         }
     }, [workspaceId, recentSearches]);
 
-    // Debounced search
+    // Search on every keystroke; the local index is fast enough not to debounce
     useEffect(() => {
-        const timer = setTimeout(() => {
-            performSearch(query);
-        }, 200);
-
-        return () => clearTimeout(timer);
-    }, [query, performSearch]);
+        performSearch(query);
+    }, [query, performSearch, indexVersion]);
 
     // Handle keyboard navigation
     useEffect(() => {
@@ -289,50 +278,3 @@ function ResultItem({ result, isSelected, onClick }: ResultItemProps) {
         </div>
     );
 }
-
-/**
- * Fuzzy match algorithm
- */
-function fuzzyMatch(query: string, text: string): boolean {
-    const q = query.toLowerCase();
-    const t = text.toLowerCase();
-
-    let qIndex = 0;
-    for (let i = 0; i < t.length && qIndex < q.length; i++) {
-        if (t[i] === q[qIndex]) {
-            qIndex++;
-        }
-    }
-
-    return qIndex === q.length;
-}
-
-/**
- * Calculate relevance score
- */
-function calculateRelevance(query: string, text: string): number {
-    const q = query.toLowerCase();
-    const t = text.toLowerCase();
-
-    // Exact match
-    if (t === q) return 100;
-
-    // Starts with
-    if (t.startsWith(q)) return 90;
-
-    // Contains
-    if (t.includes(q)) return 80;
-
-    // Fuzzy match score
-    let score = 0;
-    let lastIndex = -1;
-    for (const char of q) {
-        const index = t.indexOf(char, lastIndex + 1);
-        if (index > lastIndex) {
-            score += 10;
-            lastIndex = index;
-        }
-    }
-
-    return score;
-}
@@ -24,6 +24,7 @@ import { X, Send, Trash2, CheckCircle, Circle, MessageSquare, CornerDownRight, C
 import { formatDistanceToNow } from 'date-fns';
 import { createNotification } from '@/components/NotificationCenter';
 import { logActivity } from '@/components/ActivityFeed';
+import { useUserProfile } from '@/hooks/useUserProfiles';
 
 interface Comment {
     id: string;
@@ -315,6 +316,10 @@ function CommentThread({
     depth = 0,
 }: CommentThreadProps) {
     const isOwner = currentUserId === comment.userId;
+    // Current profile; the name stored on the comment may be outdated
+    const profile = useUserProfile(comment.userId);
+    const userName = profile?.displayName || comment.userName;
+    const userPhoto = profile?.photoURL || comment.userPhoto;
     const hasReplies = comment.replies && comment.replies.length > 0;
     const isReplying = replyingTo === comment.id;
 
@@ -324,19 +329,19 @@ function CommentThread({
                 {/* Comment Header */}
                 <div className="flex items-start justify-between mb-2">
                     <div className="flex items-center gap-2">
-                        {comment.userPhoto ? (
+                        {userPhoto ? (
                             <img
-                                src={comment.userPhoto}
-                                alt={comment.userName}
+                                src={userPhoto}
+                                alt={userName}
                                 className="w-6 h-6 rounded-full"
                             />
                         ) : (
                             <div className="w-6 h-6 rounded-full bg-blue-500 flex items-center justify-center text-white text-xs">
-                                {comment.userName[0].toUpperCase()}
+                                {userName[0].toUpperCase()}
                             </div>
                         )}
                         <div>
-                            <div className="text-sm font-medium">{comment.userName}</div>
+                            <div className="text-sm font-medium">{userName}</div>
                             <div className="text-xs text-gray-500 dark:text-gray-400">
                                 {comment.createdAt?.toDate ? formatDistanceToNow(comment.createdAt.toDate(), { addSuffix: true }) : 'Just now'}
                             </div>
@@ -22,11 +22,15 @@ const TimelineView = dynamic(() => import("./TimelineView"), {
     loading: () => <div className="p-4 text-center text-gray-500">Loading timeline...</div>
 });
 import DatabaseControls from "./DatabaseControls";
-import { FilterGroup, applyFilters } from "@/lib/filter-engine";
-import { Sort, applySorts } from "@/lib/sort-engine";
+import { FilterGroup, compileFilterGroup } from "@/lib/filter-engine";
+import { Sort } from "@/lib/sort-engine";
+import { LiveQuery } from "@/lib/live-query";
+import { releaseGroupIndexes } from "@/lib/group-index";
+import { AggregateFunction, PageAggregates, formatAggregate } from "@/lib/aggregation";
 import PropertyMenu from "./database/PropertyMenu";
 import AddColumnModal from "./database/AddColumnModal";
-import { PropertyValue } from "@/lib/formula-engine";
+import { PropertyValue, FormulaEvaluator } from "@/lib/formula-engine";
+import { RollupMaterializer } from "@/lib/rollup-calculator";
 
 type Property = NonNullable<Page['properties']>[number];
 
@@ -46,6 +50,29 @@ interface DatabaseViewProps {
     onUpdateParent: (data: Partial<Page>) => void;
 }
 
+// Shared fallback so a database without properties keeps a stable schema
+const NO_PROPERTIES: Property[] = [];
+
+// Source page -> computed values it was merged with and the merged page
+type MergeCache = WeakMap<Page, { values?: Record<string, unknown>; page: Page }>;
+
+/**
+ * Overlay computed values onto pages, reusing the merged page while neither
+ * the source page nor its computed values changed, so downstream diffing
+ * only sees rows that actually changed
+ */
+function mergePropertyValues(pages: Page[], computed: Map<string, Record<string, unknown>>, cache: MergeCache): Page[] {
+    return pages.map(page => {
+        const values = computed.get(page.id);
+        const cached = cache.get(page);
+        if (cached && cached.values === values) return cached.page;
+
+        const merged = { ...page, propertyValues: { ...page.propertyValues, ...values } };
+        cache.set(page, { values, page: merged });
+        return merged;
+    });
+}
+
 export default function DatabaseView({ workspaceId, parentPage, childPages, onUpdateParent }: DatabaseViewProps) {
     const router = useRouter();
     const [currentView, setCurrentView] = useState<'table' | 'list' | 'calendar' | 'timeline'>('table');
@@ -60,8 +87,14 @@ export default function DatabaseView({ workspaceId, parentPage, childPages, onUp
     const [viewName, setViewName] = useState('');
     const [showViewsDropdown, setShowViewsDropdown] = useState(false);
 
-    // Ensure properties is defined
-    const columns = parentPage.properties || [];
+    // The schema keeps its identity until its content changes: every
+    // snapshot of the parent page (title edits, saved views) brings a new
+    // properties array, which would otherwise rebuild the rollup, formula,
+    // filter and aggregate state below
+    const properties = parentPage.properties || NO_PROPERTIES;
+    const columnsKey = JSON.stringify(properties);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    const columns = useMemo(() => properties, [columnsKey]);
 
     // Property Menu state
     const [activePropertyMenu, setActivePropertyMenu] = useState<string | null>(null);
@@ -72,10 +105,58 @@ export default function DatabaseView({ workspaceId, parentPage, childPages, onUp
 
     // Removed Board view auto-create logic
 
-    // Memoize expensive calculations
+    // Rollups are materialized per row and only recomputed when a row's
+    // relations or an aggregated property of a related page change
+    const rollupMaterializer = useMemo(() => new RollupMaterializer(columns), [columns]);
+    const [rollupVersion, setRollupVersion] = useState(0);
+
+    useEffect(
+        () => rollupMaterializer.connect(() => setRollupVersion(version => version + 1)),
+        [rollupMaterializer]
+    );
+
+    const mergedRollupsRef = useRef<MergeCache>(new WeakMap());
+
+    const pagesWithRollups = useMemo(() => {
+        if (!rollupMaterializer.hasRollups) return childPages;
+        return mergePropertyValues(childPages, rollupMaterializer.update(childPages), mergedRollupsRef.current);
+    }, [childPages, rollupMaterializer, rollupVersion]);
+
+    // Formula results are kept per schema; on each data change only the cells
+    // whose inputs changed are recomputed. They are exposed as regular property
+    // values so filters, sorts and every view share them.
+    const formulaEvaluator = useMemo(() => new FormulaEvaluator(columns), [columns]);
+    const mergedFormulasRef = useRef<MergeCache>(new WeakMap());
+
+    const pagesWithFormulas = useMemo(() => {
+        if (formulaEvaluator.graph.dependencies.size === 0) return pagesWithRollups;
+        return mergePropertyValues(pagesWithRollups, formulaEvaluator.evaluate(pagesWithRollups), mergedFormulasRef.current);
+    }, [pagesWithRollups, formulaEvaluator]);
+
+    // Views share group indexes per database; drop them when it closes
+    useEffect(() => () => releaseGroupIndexes(parentPage.id), [parentPage.id]);
+
+    // Compile the filters once per filter/schema change, not on every data update
+    const filterPredicate = useMemo(
+        () => compileFilterGroup(filterGroup, columns),
+        [filterGroup, columns]
+    );
+
+    // Column footer aggregates, updated per changed row rather than per render
+    const [footerFunctions, setFooterFunctions] = useState<Record<string, AggregateFunction>>({});
+    const pageAggregates = useMemo(() => new PageAggregates(columns.map(col => col.id)), [columns]);
+    const columnAggregates = useMemo(
+        () => pageAggregates.sync(pagesWithFormulas),
+        [pageAggregates, pagesWithFormulas]
+    );
+
+    // Filtered, sorted rows maintained incrementally: a single-row edit is
+    // re-tested and moved by binary search instead of re-filtering and re-sorting
+    const liveQuery = useMemo(() => new LiveQuery(filterPredicate, sorts), [filterPredicate, sorts]);
+
     const filteredAndSortedPages = useMemo(
-        () => applySorts(applyFilters(childPages, filterGroup), sorts),
-        [childPages, filterGroup, sorts]
+        () => liveQuery.sync(pagesWithFormulas),
+        [liveQuery, pagesWithFormulas]
     );
 
     // Save current view
@@ -382,7 +463,7 @@ export default function DatabaseView({ workspaceId, parentPage, childPages, onUp
                         </tr>
                     </thead>
                     <tbody>
-                        {childPages.map(page => (
+                        {pagesWithFormulas.map(page => (
                             <tr key={page.id} className="border-b border-gray-100 dark:border-gray-800 hover:bg-gray-50 dark:hover:bg-[#202020] group h-[34px]">
                                 {/* Name Cell */}
                                 <td className="p-0 border-r border-gray-100 dark:border-gray-800/50 relative">
@@ -434,6 +515,41 @@ export default function DatabaseView({ workspaceId, parentPage, childPages, onUp
                             <td colSpan={columns.length + 1} />
                         </tr>
                     </tbody>
+                    <tfoot>
+                        <tr className="text-xs text-gray-400">
+                            <td className="py-1 px-3 border-r border-gray-100 dark:border-gray-800/50" />
+                            {columns.map(col => {
+                                const fn = footerFunctions[col.id];
+                                const aggregator = columnAggregates.get(col.id);
+                                return (
+                                    <td key={col.id} className="py-1 px-3 border-r border-gray-100 dark:border-gray-800/50 text-right">
+                                        {fn && aggregator && (
+                                            <span className="mr-1 text-gray-600 dark:text-gray-300">
+                                                {formatAggregate(aggregator.get(fn), fn)}
+                                            </span>
+                                        )}
+                                        <select
+                                            value={fn || ''}
+                                            onChange={(e) => setFooterFunctions(prev => ({ ...prev, [col.id]: e.target.value as AggregateFunction }))}
+                                            className="bg-transparent outline-none cursor-pointer hover:text-gray-600 dark:hover:text-gray-300"
+                                        >
+                                            <option value="">Calculate</option>
+                                            <option value="count">Count all</option>
+                                            <option value="count_values">Count values</option>
+                                            <option value="distinct">Count unique</option>
+                                            <option value="sum">Sum</option>
+                                            <option value="avg">Average</option>
+                                            <option value="median">Median</option>
+                                            <option value="p90">90th percentile</option>
+                                            <option value="min">Min</option>
+                                            <option value="max">Max</option>
+                                        </select>
+                                    </td>
+                                );
+                            })}
+                            <td />
+                        </tr>
+                    </tfoot>
                 </table>
             )}
 
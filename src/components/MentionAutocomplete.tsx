@@ -5,9 +5,8 @@
 
 "use client";
 
-import { useState, useEffect, useCallback } from 'react';
-import { collection, query, getDocs } from 'firebase/firestore';
-import { db } from '@/lib/firebase';
+import { useState, useEffect, useMemo } from 'react';
+import { getWorkspaceMembers } from '@/lib/workspace';
 
 interface User {
     uid: string;
@@ -17,44 +16,50 @@ interface User {
 }
 
 interface MentionAutocompleteProps {
+    workspaceId: string;
     searchQuery: string;
     onSelect: (user: User) => void;
     position: { top: number; left: number };
 }
 
-export function MentionAutocomplete({ searchQuery, onSelect, position }: MentionAutocompleteProps) {
-    const [users, setUsers] = useState<User[]>([]);
+export function MentionAutocomplete({ workspaceId, searchQuery, onSelect, position }: MentionAutocompleteProps) {
+    const [members, setMembers] = useState<User[]>([]);
     const [selectedIndex, setSelectedIndex] = useState(0);
     const [loading, setLoading] = useState(true);
 
-    // Fetch workspace users
+    // Fetch workspace members once; profiles come from the shared batched loader
     useEffect(() => {
-        const fetchUsers = async () => {
-            try {
-                // In production, fetch from workspace members collection
-                // For now, mock data
-                const mockUsers: User[] = [
-                    { uid: '1', displayName: 'John Doe', email: 'john@example.com' },
-                    { uid: '2', displayName: 'Jane Smith', email: 'jane@example.com' },
-                    { uid: '3', displayName: 'Bob Johnson', email: 'bob@example.com' },
-                ];
-
-                // Filter based on search query
-                const filtered = mockUsers.filter(u =>
-                    u.displayName.toLowerCase().includes(searchQuery.toLowerCase()) ||
-                    u.email.toLowerCase().includes(searchQuery.toLowerCase())
-                );
-
-                setUsers(filtered);
-                setLoading(false);
-            } catch (error) {
-                console.error('Failed to fetch users:', error);
-                setLoading(false);
-            }
+        let active = true;
+        setLoading(true);
+
+        getWorkspaceMembers(workspaceId)
+            .then(profiles => {
+                if (!active) return;
+                setMembers(profiles.map(profile => ({
+                    uid: profile.uid,
+                    displayName: profile.displayName || profile.email || 'Anonymous',
+                    email: profile.email || '',
+                    photoURL: profile.photoURL || undefined,
+                })));
+            })
+            .catch(error => console.error('Failed to fetch users:', error))
+            .finally(() => {
+                if (active) setLoading(false);
+            });
+
+        return () => {
+            active = false;
         };
-
-        fetchUsers();
-    }, [searchQuery]);
+    }, [workspaceId]);
+
+    // Filter based on search query
+    const users = useMemo(() => {
+        const q = searchQuery.toLowerCase();
+        return members.filter(u =>
+            u.displayName.toLowerCase().includes(q) ||
+            u.email.toLowerCase().includes(q)
+        );
+    }, [members, searchQuery]);
 
     // Keyboard navigation
     useEffect(() => {
@@ -2,6 +2,7 @@
 
 import { Users } from 'lucide-react';
 import { usePresence, PresenceUser } from '@/hooks/usePresence';
+import { useUserProfiles } from '@/hooks/useUserProfiles';
 
 interface PresenceAvatarsProps {
     pageId: string;
@@ -12,6 +13,7 @@ interface PresenceAvatarsProps {
 
 export default function PresenceAvatars({ pageId, userId, userName, userAvatar }: PresenceAvatarsProps) {
     const { activeUsers } = usePresence(pageId, userId, userName, userAvatar);
+    const profiles = useUserProfiles(activeUsers.map(user => user.userId));
 
     if (activeUsers.length === 0) return null;
 
@@ -19,16 +21,27 @@ export default function PresenceAvatars({ pageId, userId, userName, userAvatar }
         <div className="flex items-center gap-2">
             {/* User avatars */}
             <div className="flex -space-x-2">
-                {activeUsers.slice(0, 3).map((user) => (
-                    <div
-                        key={user.userId}
-                        className="w-8 h-8 rounded-full flex items-center justify-center text-xs font-semibold text-white ring-2 ring-white dark:ring-[#191919] transition-transform hover:scale-110 hover:z-10"
-                        style={{ backgroundColor: user.color }}
-                        title={user.userName}
-                    >
-                        {user.userName.charAt(0).toUpperCase()}
-                    </div>
-                ))}
+                {activeUsers.slice(0, 3).map((user) => {
+                    const profile = profiles.get(user.userId);
+                    const name = profile?.displayName || user.userName;
+                    const photo = profile?.photoURL || user.userAvatar;
+
+                    return (
+                        <div
+                            key={user.userId}
+                            className="w-8 h-8 rounded-full flex items-center justify-center text-xs font-semibold text-white ring-2 ring-white dark:ring-[#191919] transition-transform hover:scale-110 hover:z-10 overflow-hidden"
+                            style={{ backgroundColor: user.color }}
+                            title={name}
+                        >
+                            {photo ? (
+                                // eslint-disable-next-line @next/next/no-img-element
+                                <img src={photo} alt={name} className="w-full h-full object-cover" />
+                            ) : (
+                                name.charAt(0).toUpperCase()
+                            )}
+                        </div>
+                    );
+                })}
 
                 {activeUsers.length > 3 && (
                     <div className="w-8 h-8 rounded-full bg-gray-200 dark:bg-gray-700 flex items-center justify-center text-xs font-semibold text-gray-600 dark:text-gray-300 ring-2 ring-white dark:ring-[#191919]">
@@ -261,14 +261,18 @@ function PropertyRenderer({
 
     // Formula (read-only, calculated)
     if (property.type === 'formula') {
-        const formula = property.formula || '';
-        // Build property map from propertyValues
-        const propMap: Record<string, any> = {};
-        allProperties.forEach(prop => {
-            propMap[prop.name] = propertyValues[prop.id];
-        });
-
-        const result = evaluateFormula(formula, propMap);
+        let result = value;
+        // Evaluate here only when the caller didn't pass a precomputed column value
+        if (result === undefined) {
+            const formula = property.formula || '';
+            // Build property map from propertyValues
+            const propMap: Record<string, any> = {};
+            allProperties.forEach(prop => {
+                propMap[prop.name] = propertyValues[prop.id];
+            });
+
+            result = evaluateFormula(formula, propMap);
+        }
         const displayValue = formatFormulaResult(result);
 
         return (
@@ -1,7 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Page } from '@/lib/workspace';
-import { db } from '@/lib/firebase';
-import { collection, query, where, onSnapshot } from 'firebase/firestore';
+import { subscribeToSharedChildPages } from '@/lib/listener-registry';
 import { X, Plus, Search } from 'lucide-react';
 
 interface RelationRendererProps {
@@ -19,24 +18,13 @@ export function RelationRenderer({ property, value, onChange }: RelationRenderer
     const selectedIds = value || [];
     const selectedPages = relatedPages.filter(p => selectedIds.includes(p.id));
 
-    // Subscribe to related database pages
+    // Subscribe to related database pages (one listener shared by every cell)
     useEffect(() => {
         if (!property.relationTo) return;
 
-        const q = query(
-            collection(db, 'pages'),
-            where('parentId', '==', property.relationTo)
-        );
-
-        const unsubscribe = onSnapshot(q, (snapshot) => {
-            const pages: Page[] = [];
-            snapshot.forEach(doc => {
-                pages.push({ id: doc.id, ...doc.data() } as Page);
-            });
+        return subscribeToSharedChildPages(property.relationTo, ({ pages }) => {
             setRelatedPages(pages);
         });
-
-        return () => unsubscribe();
     }, [property.relationTo]);
 
     // Close dropdown when clicking outside
@@ -1,19 +1,19 @@
 "use client";
 
-import { useState, useEffect, useRef } from "react";
+import { useState, useEffect, useRef, useMemo } from "react";
 import { X, Search, FileText, Database, ArrowRight } from "lucide-react";
-import { Page } from "@/lib/workspace";
+import { workspaceSearch } from "@/lib/workspace-search";
 import { useRouter } from "next/navigation";
 
 interface SearchModalProps {
     isOpen: boolean;
     onClose: () => void;
-    pages: Page[];
     workspaceId: string;
 }
 
-export default function SearchModal({ isOpen, onClose, pages, workspaceId }: SearchModalProps) {
+export default function SearchModal({ isOpen, onClose, workspaceId }: SearchModalProps) {
     const [query, setQuery] = useState("");
+    const [indexVersion, setIndexVersion] = useState(0);
     const inputRef = useRef<HTMLInputElement>(null);
     const router = useRouter();
 
@@ -36,10 +36,23 @@ export default function SearchModal({ isOpen, onClose, pages, workspaceId }: Sea
         return () => window.removeEventListener('keydown', handleKeyDown);
     }, [onClose]);
 
+    // The sidebar loads pages lazily, so titles come from the shared search index
+    useEffect(() => {
+        if (!isOpen || !workspaceId) return;
+
+        const stopIndex = workspaceSearch.subscribe(workspaceId);
+        const stopChanges = workspaceSearch.onChange(() => setIndexVersion(v => v + 1));
+        setIndexVersion(v => v + 1);
+        return () => {
+            stopChanges();
+            stopIndex();
+        };
+    }, [isOpen, workspaceId]);
+
     // Filter pages
-    const filteredPages = pages.filter(p =>
-        !p.inTrash &&
-        p.title.toLowerCase().includes(query.toLowerCase())
+    const filteredPages = useMemo(
+        () => isOpen ? workspaceSearch.searchTitles(query) : [],
+        [isOpen, query, indexVersion]
     );
 
     if (!isOpen) return null;
@@ -91,9 +104,9 @@ export default function SearchModal({ isOpen, onClose, pages, workspaceId }: Sea
                             </div>
                             {filteredPages.map(page => (
                                 <button
-                                    key={page.id}
+                                    key={page.pageId}
                                     onClick={() => {
-                                        router.push(`/workspace/${workspaceId}/${page.id}`);
+                                        router.push(`/workspace/${workspaceId}/${page.pageId}`);
                                         onClose();
                                     }}
                                     className="flex items-center gap-3 px-3 py-2.5 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] rounded-lg transition group text-left"
@@ -1,14 +1,17 @@
 "use client";
 
-import { useState, useEffect, useMemo, useCallback } from "react";
-import { Page, createPage, subscribeToWorkspacePages, updatePage, deletePage, movePage } from "@/lib/workspace";
+import { useState, useEffect, useMemo, useCallback, useRef } from "react";
+import { PageMeta, createPage, getPageBody, getChildPages, subscribeToRootPages, subscribeToFavoritePages, subscribeToTrashedPages, toPageMeta, updatePage, deletePage, movePage } from "@/lib/workspace";
+import { subscribeToSharedChildPages } from "@/lib/listener-registry";
 import { ChevronRight, ChevronDown, FileText, Plus, Settings, Trash, MoreHorizontal, Star, Copy, Edit, ExternalLink, AppWindow, FolderInput, Home, Sun, Moon, Sparkles, Search, Layout, X, Calendar, Bell } from "lucide-react";
 import { useTheme } from "next-themes";
 import Link from "next/link";
 import { useParams, useRouter } from "next/navigation";
 import { useAuth } from "@/context/AuthContext";
 import { db } from "@/lib/firebase";
-import { collection, query, where, onSnapshot, getDocs } from "firebase/firestore";
+import { collection, query, where, onSnapshot } from "firebase/firestore";
+import { useVirtualizer } from "@tanstack/react-virtual";
+import { PageTree, TreeRow } from "@/lib/page-tree";
 import SettingsModal from "./SettingsModal";
 import SearchModal from "./SearchModal";
 import TemplatePicker from "./TemplatePicker";
@@ -23,23 +26,39 @@ import { DndContext, closestCenter, KeyboardSensor, PointerSensor, useSensor, us
 import { arrayMove, SortableContext, sortableKeyboardCoordinates, verticalListSortingStrategy, useSortable } from '@dnd-kit/sortable';
 import { CSS } from '@dnd-kit/utilities';
 
+type SidebarSection = 'workspace' | 'private';
+
+type SidebarRow =
+    | { kind: 'heading'; key: string; label: string; section?: SidebarSection }
+    | { kind: 'favorite'; key: string; page: PageMeta }
+    | { kind: 'page'; key: string; row: TreeRow }
+    | { kind: 'empty'; key: string; label: string }
+    | { kind: 'spacer'; key: string };
+
+const SIDEBAR_SECTIONS: { section: SidebarSection; label: string; empty: string }[] = [
+    { section: 'workspace', label: 'Teamspaces', empty: 'No workspace pages' },
+    { section: 'private', label: 'Private', empty: 'No private pages' },
+];
+
 function SortablePageItem({
     page,
     level = 0,
     hasChildren,
-    isCollapsed,
+    isExpanded,
     isActive,
-    onToggleCollapse,
+    onToggleExpand,
+    onHover,
     onCreatePage,
     onContextMenu,
     onClick
 }: {
-    page: Page,
+    page: PageMeta,
     level: number,
     hasChildren: boolean,
-    isCollapsed: boolean,
+    isExpanded: boolean,
     isActive: boolean,
-    onToggleCollapse: (id: string) => void,
+    onToggleExpand: (id: string) => void,
+    onHover: (id: string) => void,
     onCreatePage: (parentId: string | null, section: any) => void,
     onContextMenu: (e: React.MouseEvent, id: string) => void,
     onClick: (id: string) => void
@@ -77,13 +96,14 @@ function SortablePageItem({
             `}
             onClick={() => onClick(page.id)}
             onContextMenu={(e) => onContextMenu(e, page.id)}
+            onMouseEnter={() => onHover(page.id)}
         >
             <button
-                onClick={(e) => { e.stopPropagation(); onToggleCollapse(page.id); }}
+                onClick={(e) => { e.stopPropagation(); onToggleExpand(page.id); }}
                 className={`p-0.5 rounded-sm hover:bg-gray-300 dark:hover:bg-gray-600 transition ${!hasChildren ? "opacity-0" : "opacity-100"}`}
                 onPointerDown={(e) => e.stopPropagation()} // Prevent drag start
             >
-                <ChevronRight size={12} className={`transition-transform duration-200 ${!isCollapsed ? "rotate-90" : ""}`} />
+                <ChevronRight size={12} className={`transition-transform duration-200 ${isExpanded ? "rotate-90" : ""}`} />
             </button>
 
             <div className="flex items-center justify-center text-lg w-5 h-5 mr-1">
@@ -114,14 +134,22 @@ function SortablePageItem({
 }
 
 export default function Sidebar({ workspaceId }: { workspaceId: string }) {
-    const [pages, setPages] = useState<Page[]>([]);
+    // Normalized page tree of metadata, loaded one level at a time
+    const tree = useMemo(() => new PageTree(), [workspaceId]);
+    const [treeVersion, setTreeVersion] = useState(0);
+    // Live child listeners of visible expanded pages, by parent ID
+    const childListeners = useRef(new Map<string, () => void>());
+    // Parents whose children are being prefetched
+    const prefetching = useRef(new Set<string>());
+    const [favorites, setFavorites] = useState<PageMeta[]>([]);
+    const [trashPages, setTrashPages] = useState<PageMeta[]>([]);
     const params = useParams();
     const router = useRouter();
     const activePageId = params.pageId as string | null;
     const { user } = useAuth();
     const { theme, setTheme } = useTheme();
 
-    const [collapsed, setCollapsed] = useState<Record<string, boolean>>({});
+    const [expanded, setExpanded] = useState<Record<string, boolean>>({});
     const [contextMenu, setContextMenu] = useState<{ x: number, y: number, pageId: string } | null>(null);
     const [isSettingsOpen, setIsSettingsOpen] = useState(false);
     const [isSearchOpen, setIsSearchOpen] = useState(false);
@@ -134,55 +162,96 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
     const [activeDragId, setActiveDragId] = useState<string | null>(null);
     const [invitationCount, setInvitationCount] = useState(0);
 
-    // Memoize sortPages function to avoid recreating on every render
-    const sortPages = useMemo(() => {
-        return (rawPages: Page[]) => {
-            return [...rawPages].sort((a, b) => {
-                const orderA = a.order ?? (a.createdAt?.toMillis ? a.createdAt.toMillis() : 0);
-                const orderB = b.order ?? (b.createdAt?.toMillis ? b.createdAt.toMillis() : 0);
-                return orderA - orderB;
-            });
+    // Load the top level of the tree; deeper levels load on expand
+    useEffect(() => {
+        if (!workspaceId) return;
+
+        let loaded = false;
+        const unsubscribe = subscribeToRootPages(workspaceId, (pages, changes) => {
+            if (loaded) tree.applyChanges(changes, null);
+            else tree.setChildren(null, pages);
+            loaded = true;
+            setTreeVersion(tree.version);
+        });
+
+        const listeners = childListeners.current;
+        return () => {
+            unsubscribe();
+            listeners.forEach(stop => stop());
+            listeners.clear();
+            setExpanded({});
         };
-    }, []);
+    }, [workspaceId, tree]);
 
-    // Fetch pages for the current workspace
+    // Favorites are listed flat, so they come from their own query
     useEffect(() => {
         if (!workspaceId) return;
 
-        // Only subscribe when document is visible (optimization)
-        if (typeof document !== 'undefined' && document.hidden) {
-            // If not visible, just fetch once without subscription
-            const fetchPages = async () => {
-                const q = query(
-                    collection(db, "pages"),
-                    where("workspaceId", "==", workspaceId)
-                );
-                const snapshot = await getDocs(q);
-                const fetchedPages: Page[] = [];
-                snapshot.forEach(doc => {
-                    fetchedPages.push({ id: doc.id, ...doc.data() } as Page);
-                });
-                setPages(sortPages(fetchedPages));
-            };
-            fetchPages();
-            return;
-        }
+        return subscribeToFavoritePages(workspaceId, (pages) => {
+            setFavorites(pages.filter(p => !p.inTrash).map(toPageMeta));
+        });
+    }, [workspaceId]);
 
-        const q = query(
-            collection(db, "pages"),
-            where("workspaceId", "==", workspaceId)
-        );
+    // Trashed pages are only needed while the trash is open
+    useEffect(() => {
+        if (!workspaceId || !isTrashOpen) return;
 
-        const unsubscribe = onSnapshot(q, (snapshot) => {
-            const fetchedPages: Page[] = [];
-            snapshot.forEach(doc => {
-                fetchedPages.push({ id: doc.id, ...doc.data() } as Page);
+        return subscribeToTrashedPages(workspaceId, (pages) => {
+            setTrashPages(pages.map(toPageMeta));
+        });
+    }, [workspaceId, isTrashOpen]);
+
+    // Keep the children of an expanded page live
+    const loadChildren = useCallback((parentId: string) => {
+        if (childListeners.current.has(parentId)) return;
+
+        let loaded = false;
+        childListeners.current.set(parentId, subscribeToSharedChildPages(parentId, ({ pages, changes }) => {
+            if (loaded) tree.applyChanges(changes, parentId);
+            else tree.setChildren(parentId, pages);
+            loaded = true;
+            setTreeVersion(tree.version);
+        }));
+    }, [tree]);
+
+    // Listen only under pages that are expanded and on screen: collapsing a
+    // page releases its listener and those of expanded pages below it
+    useEffect(() => {
+        const visible = new Set<string>();
+        SIDEBAR_SECTIONS.forEach(({ section }) => {
+            tree.getVisibleRows(section, expanded).forEach(row => {
+                if (row.isExpanded) visible.add(row.page.id);
             });
-            setPages(sortPages(fetchedPages));
         });
 
-        return () => unsubscribe();
-    }, [workspaceId, sortPages]);
+        const listeners = childListeners.current;
+        let released = false;
+        listeners.forEach((stop, parentId) => {
+            if (visible.has(parentId)) return;
+            stop();
+            listeners.delete(parentId);
+            tree.markUnloaded(parentId);
+            released = true;
+        });
+        visible.forEach(loadChildren);
+
+        if (released) setTreeVersion(tree.version);
+    }, [tree, treeVersion, expanded, loadChildren]);
+
+    // Fetch children once on hover so expanding feels instant
+    const prefetchChildren = useCallback((parentId: string) => {
+        if (tree.isLoaded(parentId) || childListeners.current.has(parentId) || prefetching.current.has(parentId)) return;
+
+        prefetching.current.add(parentId);
+        getChildPages(parentId)
+            .then(children => {
+                if (childListeners.current.has(parentId)) return;
+                tree.setChildren(parentId, children);
+                setTreeVersion(tree.version);
+            })
+            .catch(error => console.error('Failed to prefetch child pages:', error))
+            .finally(() => prefetching.current.delete(parentId));
+    }, [tree]);
 
     // Listen to invitations count
     useEffect(() => {
@@ -204,10 +273,13 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
         return () => unsubscribe();
     }, [user?.email]);
 
-    const toggleCollapse = (pageId: string) => {
-        setCollapsed(prev => ({ ...prev, [pageId]: !prev[pageId] }));
+    const toggleExpand = (pageId: string) => {
+        setExpanded(prev => ({ ...prev, [pageId]: !prev[pageId] }));
     };
 
+    const findPage = (pageId: string): PageMeta | undefined =>
+        tree.get(pageId) || favorites.find(p => p.id === pageId) || trashPages.find(p => p.id === pageId);
+
     // --- DnD Logic ---
     const sensors = useSensors(
         useSensor(PointerSensor, {
@@ -236,120 +308,119 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
         if (activeId === overId) return;
 
         // Find current relationship
-        const activePage = pages.find(p => p.id === activeId);
-        const overPage = pages.find(p => p.id === overId);
+        const activePage = tree.get(activeId);
+        const overPage = tree.get(overId);
 
         if (!activePage || !overPage) return;
 
-        // We are moving 'active' relative to 'over'
-        // Strategy: We will treat this as a reorder within the same parent IF they share a parent.
-        // OR if dropping onto a different parent, we reparent.
-
-        // But standard Sortable behavior is "insert after/before".
-        // To handle "drop INTO folder", we usually need a separate drop zone or precise logic.
-        // For simplicity, we will stick to REORDERING within the visible list.
-        // If sorting across levels is needed, we normally flatten the tree or use a Tree specific lib.
-        // Here, we can achieve moving items by logic:
-        // "If I drop A over B, I want A to take B's place in B's parent list."
-
-        // Wait, if we want to support nesting via DnD, it's complex with just flat List Sortable.
-        // Let's implement: Reorder SIBLINGS. Reparenting is harder without a specific "Drop on top" intent.
-        // Let's stick to simple reordering for now as requested, maybe Reparenting if simple.
-
-        // Reorder Logic:
-        // Update local state first to be snappy
-        const oldIndex = pages.findIndex(p => p.id === activeId);
-        const newIndex = pages.findIndex(p => p.id === overId);
-
-        // Check if we are checking different parents or same parent
-        // If same parent, simple reorder.
+        // Reorder siblings only; reparenting needs an explicit "drop into" target
         if (activePage.parentId === overPage.parentId) {
-            const newPages = arrayMove(pages, oldIndex, newIndex);
-            // Re-sort only the siblings to assign new order keys
-            const siblings = newPages.filter(p => p.parentId === activePage.parentId);
-            // Assign order based on index
-            // We can just update the Order of the active item to be between neighbors?
-            // Or update ALL siblings order? Updating all is safer for consistency but more writes.
-            // Let's update all siblings for robustness in this small app.
-            setPages(newPages); // Optimistic
-
-            const parentId = activePage.parentId;
-            const siblingItems = newPages.filter(p => p.parentId === parentId);
-
-            // Update all affected siblings order in DB
-            // Batch ideally, but loop for now
-            await Promise.all(siblingItems.map((page, index) => {
-                return updatePage(page.id, { order: index });
+            const siblings = tree.getChildren(activePage.parentId);
+            const oldIndex = siblings.indexOf(activePage);
+            const newIndex = siblings.indexOf(overPage);
+            const reordered = arrayMove(siblings, oldIndex, newIndex);
+
+            // Only write siblings whose position changed; the listener applies them
+            await Promise.all(reordered.map((page, index) => {
+                return page.order === index ? null : updatePage(page.id, { order: index });
             }));
-        } else {
-            // Different parent? 
-            // If we drop a specialized item list, it might be tricky.
-            // Allow moving between root and folder?
-            // If we visualize flat list, it works. But our UI is recursive.
         }
     };
 
-    // Recursive render helper to collect items for SortableContext
-    // Actually, each level should probably be its own SortableContext?
-    // Using multiple SortableContexts is fine.
-
-    const PageList = ({
-        parentId,
-        items,
-        level = 0
-    }: {
-        parentId: string | null,
-        items: Page[],
-        level?: number
-    }) => {
-        // Filter items for this level
-        // We need to sort them by order
-        const siblingItems = items.filter(p => p.parentId === parentId && !p.inTrash);
-        // They are already sorted by the main state 'pages' if we keep 'pages' sorted.
-        // But 'pages' is flat.
-
-        // Let's rely on the order in the filtered list.
-        const sortedSiblings = siblingItems; // already sorted by effect?
-
-        return (
-            <SortableContext
-                items={sortedSiblings.map(p => p.id)}
-                strategy={verticalListSortingStrategy}
-            >
-                <div>
-                    {sortedSiblings.map(page => {
-                        const hasChildren = items.some(p => p.parentId === page.id && !p.inTrash);
-                        const isCollapsed = collapsed[page.id];
-
-                        return (
-                            <div key={page.id}>
-                                <SortablePageItem
-                                    page={page}
-                                    level={level}
-                                    hasChildren={hasChildren}
-                                    isCollapsed={!!isCollapsed}
-                                    isActive={activePageId === page.id}
-                                    onToggleCollapse={toggleCollapse}
-                                    onCreatePage={handleCreatePage}
-                                    onContextMenu={handleContextMenu}
-                                    onClick={(id) => router.push(`/workspace/${workspaceId}/${id}`)}
-                                />
-                                {!isCollapsed && hasChildren && (
-                                    <PageList parentId={page.id} items={items} level={level + 1} />
-                                )}
-                            </div>
-                        );
-                    })}
-                </div>
-            </SortableContext>
-        );
+    // Flattened sidebar rows (favorites, section headings, visible tree rows)
+    const scrollRef = useRef<HTMLDivElement>(null);
+
+    const sidebarRows = useMemo<SidebarRow[]>(() => {
+        const rows: SidebarRow[] = [];
+
+        if (favorites.length > 0) {
+            rows.push({ kind: 'heading', key: 'favorites', label: 'Favorites' });
+            favorites.forEach(page => rows.push({ kind: 'favorite', key: `favorite-${page.id}`, page }));
+            rows.push({ kind: 'spacer', key: 'favorites-end' });
+        }
+
+        SIDEBAR_SECTIONS.forEach(({ section, label, empty }) => {
+            rows.push({ kind: 'heading', key: section, label, section });
+            const visible = tree.getVisibleRows(section, expanded);
+            visible.forEach(row => rows.push({ kind: 'page', key: row.page.id, row }));
+            if (visible.length === 0) rows.push({ kind: 'empty', key: `${section}-empty`, label: empty });
+            rows.push({ kind: 'spacer', key: `${section}-end` });
+        });
+
+        return rows;
+    }, [favorites, tree, treeVersion, expanded]);
+
+    const sortableIds = useMemo(
+        () => sidebarRows.flatMap(row => row.kind === 'page' ? [row.row.page.id] : []),
+        [sidebarRows]
+    );
+
+    const virtualizer = useVirtualizer({
+        count: sidebarRows.length,
+        getScrollElement: () => scrollRef.current,
+        estimateSize: () => 28,
+        getItemKey: index => sidebarRows[index].key,
+        overscan: 10,
+    });
+
+    const renderSidebarRow = (row: SidebarRow) => {
+        switch (row.kind) {
+            case 'heading':
+                if (!row.section) {
+                    return (
+                        <div className="px-4 py-1 text-xs font-semibold text-gray-500 dark:text-gray-500 mb-1">
+                            {row.label}
+                        </div>
+                    );
+                }
+                return (
+                    <div className="px-4 py-1 text-xs font-semibold text-gray-500 dark:text-gray-500 mb-1 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] cursor-pointer flex items-center justify-between group">
+                        <span>{row.label}</span>
+                        <button onClick={(e) => { e.stopPropagation(); handleCreatePage(null, row.section); }} className="opacity-0 group-hover:opacity-100 hover:bg-gray-300 dark:hover:bg-gray-600 rounded p-0.5">
+                            <Plus size={12} />
+                        </button>
+                    </div>
+                );
+            case 'favorite':
+                return (
+                    <div
+                        className="group flex items-center gap-1 min-h-[28px] py-1 px-3 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] text-sm text-gray-600 dark:text-gray-400 select-none cursor-pointer"
+                        onClick={() => router.push(`/workspace/${workspaceId}/${row.page.id}`)}
+                        onContextMenu={(e) => handleContextMenu(e, row.page.id)}
+                    >
+                        <div className="ml-5 flex items-center justify-center text-lg w-5 h-5 mr-1">
+                            {row.page.icon || <FileText size={14} />}
+                        </div>
+                        <span className="truncate flex-1">{row.page.title}</span>
+                    </div>
+                );
+            case 'page':
+                return (
+                    <SortablePageItem
+                        page={row.row.page}
+                        level={row.row.depth}
+                        hasChildren={row.row.hasChildren}
+                        isExpanded={row.row.isExpanded}
+                        isActive={activePageId === row.row.page.id}
+                        onToggleExpand={toggleExpand}
+                        onHover={prefetchChildren}
+                        onCreatePage={handleCreatePage}
+                        onContextMenu={handleContextMenu}
+                        onClick={(id) => router.push(`/workspace/${workspaceId}/${id}`)}
+                    />
+                );
+            case 'empty':
+                return <div className="px-7 text-xs text-gray-400 italic">{row.label}</div>;
+            case 'spacer':
+                return <div className="h-6" />;
+        }
     };
 
     const handleCreatePage = async (parentId: string | null = null, section: 'private' | 'workspace' = 'workspace') => {
         const newPage = await createPage(workspaceId, parentId, "Untitled", 'page', section, user?.uid);
         router.push(`/workspace/${workspaceId}/${newPage.id}`);
         if (parentId) {
-            setCollapsed(prev => ({ ...prev, [parentId]: false }));
+            setExpanded(prev => ({ ...prev, [parentId]: true }));
         }
     };
 
@@ -445,7 +516,6 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
     };
 
     const handleSelectAllTrash = () => {
-        const trashPages = pages.filter(p => p.inTrash);
         if (selectedTrash.size === trashPages.length) {
             setSelectedTrash(new Set());
         } else {
@@ -476,7 +546,7 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
 
     const handleAction = async (action: string, pageId: string) => {
         setContextMenu(null);
-        const page = pages.find(p => p.id === pageId);
+        const page = findPage(pageId);
         if (!page) return;
 
         switch (action) {
@@ -484,10 +554,12 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
                 await updatePage(pageId, { isFavorite: !page.isFavorite });
                 break;
             case 'duplicate':
+                // The sidebar only holds metadata; load the body to copy it
+                const content = await getPageBody(pageId);
                 const newPage = await createPage(workspaceId, page.parentId, `${page.title} (Copy)`, page.type, page.section || 'workspace', user?.uid);
-                if (page.content || page.icon || page.cover) {
+                if (content || page.icon || page.cover) {
                     await updatePage(newPage.id, {
-                        content: page.content,
+                        content,
                         icon: page.icon,
                         cover: page.cover
                     });
@@ -568,78 +640,43 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
                 </button>
             </div>
 
-            <div className="flex-1 overflow-y-auto overflow-x-hidden pb-4 scrollbar-thin scrollbar-thumb-gray-300 dark:scrollbar-thumb-gray-600">
-
-                {/* Favorites */}
-                {pages.some(p => p.isFavorite && !p.inTrash) && (
-                    <div className="mb-6">
-                        <div className="px-4 py-1 text-xs font-semibold text-gray-500 dark:text-gray-500 mb-1">
-                            Favorites
-                        </div>
-                        {pages.filter(p => p.isFavorite && !p.inTrash).map(page => (
-                            <div
-                                key={page.id}
-                                className="group flex items-center gap-1 min-h-[28px] py-1 px-3 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] text-sm text-gray-600 dark:text-gray-400 select-none cursor-pointer"
-                                onClick={() => router.push(`/workspace/${workspaceId}/${page.id}`)}
-                                onContextMenu={(e) => handleContextMenu(e, page.id)}
-                            >
-                                <div className="ml-5 flex items-center justify-center text-lg w-5 h-5 mr-1">
-                                    {page.icon || <FileText size={14} />}
-                                </div>
-                                <span className="truncate flex-1">{page.title}</span>
-                            </div>
-                        ))}
-                    </div>
-                )}
-
+            <div ref={scrollRef} className="flex-1 overflow-y-auto overflow-x-hidden pb-4 scrollbar-thin scrollbar-thumb-gray-300 dark:scrollbar-thumb-gray-600">
                 <DndContext
                     sensors={sensors}
                     collisionDetection={closestCenter}
                     onDragStart={handleDragStart}
                     onDragEnd={handleDragEnd}
                 >
-                    {/* Teamspaces */}
-                    <div className="mb-6">
-                        <div className="px-4 py-1 text-xs font-semibold text-gray-500 dark:text-gray-500 mb-1 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] cursor-pointer flex items-center justify-between group">
-                            <span>Teamspaces</span>
-                            <button onClick={(e) => { e.stopPropagation(); handleCreatePage(null, 'workspace'); }} className="opacity-0 group-hover:opacity-100 hover:bg-gray-300 dark:hover:bg-gray-600 rounded p-0.5">
-                                <Plus size={12} />
-                            </button>
-                        </div>
-                        {/* We filter pages for root workspace here */}
-                        <div className="flex flex-col">
-                            <PageList parentId={null} items={pages.filter(p => p.section === 'workspace')} />
-                            {pages.filter(p => p.section === 'workspace' && !p.parentId && !p.inTrash).length === 0 && (
-                                <div className="px-7 text-xs text-gray-400 italic">No workspace pages</div>
-                            )}
-                        </div>
-                    </div>
-
-                    {/* Private */}
-                    <div className="mb-6">
-                        <div className="px-4 py-1 text-xs font-semibold text-gray-500 dark:text-gray-500 mb-1 hover:bg-gray-100 dark:hover:bg-[#2C2C2C] cursor-pointer flex items-center justify-between group">
-                            <span>Private</span>
-                            <button onClick={(e) => { e.stopPropagation(); handleCreatePage(null, 'private'); }} className="opacity-0 group-hover:opacity-100 hover:bg-gray-300 dark:hover:bg-gray-600 rounded p-0.5">
-                                <Plus size={12} />
-                            </button>
-                        </div>
-                        <div className="flex flex-col">
-                            <PageList parentId={null} items={pages.filter(p => p.section === 'private')} />
-                            {pages.filter(p => p.section === 'private' && !p.parentId && !p.inTrash).length === 0 && (
-                                <div className="px-7 text-xs text-gray-400 italic">No private pages</div>
-                            )}
+                    <SortableContext items={sortableIds} strategy={verticalListSortingStrategy}>
+                        {/* Only the rows in view are rendered */}
+                        <div style={{ height: `${virtualizer.getTotalSize()}px`, position: 'relative' }}>
+                            {virtualizer.getVirtualItems().map(item => (
+                                <div
+                                    key={item.key}
+                                    data-index={item.index}
+                                    ref={virtualizer.measureElement}
+                                    style={{
+                                        position: 'absolute',
+                                        top: 0,
+                                        left: 0,
+                                        width: '100%',
+                                        transform: `translateY(${item.start}px)`,
+                                    }}
+                                >
+                                    {renderSidebarRow(sidebarRows[item.index])}
+                                </div>
+                            ))}
                         </div>
-                    </div>
+                    </SortableContext>
 
                     <DragOverlay>
                         {activeDragId ? (
                             <div className="opacity-80 bg-white dark:bg-[#333] shadow-lg p-2 rounded flex items-center gap-2 border border-gray-200 dark:border-gray-700">
                                 <FileText size={14} />
-                                <span className="text-sm">{pages.find(p => p.id === activeDragId)?.title || "Untitled"}</span>
+                                <span className="text-sm">{tree.get(activeDragId)?.title || "Untitled"}</span>
                             </div>
                         ) : null}
                     </DragOverlay>
-
                 </DndContext>
             </div>
 
@@ -691,14 +728,14 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
                             <div className="flex items-center px-4 py-2 border-b border-gray-100 dark:border-gray-800 mb-2">
                                 <input
                                     type="checkbox"
-                                    checked={selectedTrash.size === pages.filter(p => p.inTrash).length && pages.filter(p => p.inTrash).length > 0}
+                                    checked={selectedTrash.size === trashPages.length && trashPages.length > 0}
                                     onChange={handleSelectAllTrash}
                                     className="mr-3"
                                 />
                                 <span className="text-xs font-bold text-gray-500">Select All</span>
                             </div>
 
-                            {pages.filter(p => p.inTrash).map(page => (
+                            {trashPages.map(page => (
                                 <div key={page.id} className="flex items-center justify-between p-3 hover:bg-gray-50 dark:hover:bg-[#252525] rounded group">
                                     <div className="flex items-center gap-3 overflow-hidden">
                                         <input
@@ -719,7 +756,7 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
                                     </div>
                                 </div>
                             ))}
-                            {pages.filter(p => p.inTrash).length === 0 && <div className="p-8 text-center text-gray-400">Trash is empty</div>}
+                            {trashPages.length === 0 && <div className="p-8 text-center text-gray-400">Trash is empty</div>}
                         </div>
                     </div>
                 </div>
@@ -735,7 +772,7 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
                     <div className="px-3 py-1.5 text-xs text-gray-500 font-semibold border-b border-gray-700 mb-1">Page</div>
 
                     <button onClick={() => handleAction('favorite', contextMenu.pageId)} className="flex items-center gap-2 px-3 py-1.5 hover:bg-blue-600 hover:text-white transition text-left">
-                        <Star size={14} /> {pages.find(p => p.id === contextMenu.pageId)?.isFavorite ? "Remove from Favorites" : "Add to Favorites"}
+                        <Star size={14} /> {findPage(contextMenu.pageId)?.isFavorite ? "Remove from Favorites" : "Add to Favorites"}
                     </button>
                     <button onClick={() => handleAction('copy_link', contextMenu.pageId)} className="flex items-center gap-2 px-3 py-1.5 hover:bg-blue-600 hover:text-white transition text-left">
                         <Copy size={14} /> Copy link
@@ -762,7 +799,6 @@ export default function Sidebar({ workspaceId }: { workspaceId: string }) {
             <SearchModal
                 isOpen={isSearchOpen}
                 onClose={() => setIsSearchOpen(false)}
-                pages={pages}
                 workspaceId={workspaceId}
             />
             <TemplatePicker
@@ -5,7 +5,7 @@
 
 "use client";
 
-import { useState, useEffect, useRef } from 'react';
+import { useState, useEffect, useRef, useMemo, useCallback, memo } from 'react';
 import { Block, BlockType } from '@/lib/block-model';
 import {
     subscribeToPageBlocks,
@@ -13,10 +13,13 @@ import {
     updateBlockInFirestore,
     deleteBlock,
 } from '@/lib/block-operations';
+import { searchIndex } from '@/lib/search-index';
 import { useAuth } from '@/context/AuthContext';
 import { Plus, GripVertical, Trash2, Zap } from 'lucide-react';
 import { BlockErrorBoundary } from './BlockErrorBoundary';
 import { VirtualBlockList } from './VirtualBlockList';
+import { DeltaStore } from '@/lib/delta-store';
+import { useDeltaIds, useDeltaItem } from '@/hooks/useDeltaStore';
 
 interface SimpleBlockEditorProps {
     pageId: string;
@@ -27,19 +30,26 @@ export default function SimpleBlockEditor({
     pageId,
     useVirtualScrolling = false
 }: SimpleBlockEditorProps) {
-    const [blocks, setBlocks] = useState<Block[]>([]);
+    // Blocks live in a delta store: the list re-renders when blocks are added,
+    // removed or reordered, and each row only when its own block changes
+    const store = useMemo(() => new DeltaStore<Block>(), [pageId]);
+    const blockIds = useDeltaIds(store);
     const [loading, setLoading] = useState(true);
     const { user } = useAuth();
 
     // Subscribe to blocks
     useEffect(() => {
-        const unsubscribe = subscribeToPageBlocks(pageId, (fetchedBlocks) => {
-            setBlocks(fetchedBlocks);
+        const unsubscribe = subscribeToPageBlocks(pageId, (fetchedBlocks, changes) => {
+            store.apply(changes.map(({ type, block }) => ({ type, item: block })), fetchedBlocks);
             setLoading(false);
+            // Keep the search index current without reindexing the page
+            searchIndex.applyChanges(changes).catch(error => {
+                console.error('Failed to update search index:', error);
+            });
         });
 
         return () => unsubscribe();
-    }, [pageId]);
+    }, [pageId, store]);
 
     const handleAddBlock = async (type: BlockType = 'paragraph') => {
         if (!user) return;
@@ -53,7 +63,7 @@ export default function SimpleBlockEditor({
         );
     };
 
-    const handleUpdateBlock = async (blockId: string, newContent: string) => {
+    const handleUpdateBlock = useCallback(async (blockId: string, newContent: string) => {
         if (!user) return;
 
         await updateBlockInFirestore(
@@ -64,11 +74,11 @@ export default function SimpleBlockEditor({
             },
             user.uid
         );
-    };
+    }, [user]);
 
-    const handleDeleteBlock = async (blockId: string) => {
+    const handleDeleteBlock = useCallback(async (blockId: string) => {
         await deleteBlock(blockId);
-    };
+    }, []);
 
     if (loading) {
         return (
@@ -79,7 +89,7 @@ export default function SimpleBlockEditor({
     }
 
     // Use virtual scrolling for large documents (>100 blocks)
-    const shouldUseVirtual = useVirtualScrolling || blocks.length > 100;
+    const shouldUseVirtual = useVirtualScrolling || blockIds.length > 100;
 
     if (shouldUseVirtual) {
         return (
@@ -87,19 +97,19 @@ export default function SimpleBlockEditor({
                 <div className="max-w-4xl mx-auto">
                     <div className="flex items-center gap-2 px-4 py-2 bg-blue-50 dark:bg-blue-900/20 text-blue-700 dark:text-blue-300 text-sm">
                         <Zap size={14} />
-                        Virtual scrolling enabled ({blocks.length} blocks)
+                        Virtual scrolling enabled ({blockIds.length} blocks)
                     </div>
                     <VirtualBlockList
-                        blocks={blocks}
-                        renderBlock={(block, index) => (
-                            <BlockErrorBoundary key={block.id} blockId={block.id}>
-                                <EditableBlock
-                                    block={block}
-                                    pageId={pageId}
-                                    onDelete={() => handleDeleteBlock(block.id)}
-                                    onUpdate={(content) => handleUpdateBlock(block.id, content)}
-                                />
-                            </BlockErrorBoundary>
+                        blocks={store.getItems()}
+                        renderBlock={(block) => (
+                            <BlockRow
+                                key={block.id}
+                                store={store}
+                                blockId={block.id}
+                                pageId={pageId}
+                                onDelete={handleDeleteBlock}
+                                onUpdate={handleUpdateBlock}
+                            />
                         )}
                         estimateSize={60}
                         overscan={10}
@@ -113,19 +123,19 @@ export default function SimpleBlockEditor({
     return (
         <div className="w-full max-w-4xl mx-auto py-8 px-4">
             <div className="space-y-1">
-                {blocks.map((block) => (
-                    <BlockErrorBoundary key={block.id} blockId={block.id}>
-                        <EditableBlock
-                            block={block}
-                            pageId={pageId}
-                            onDelete={() => handleDeleteBlock(block.id)}
-                            onUpdate={(content) => handleUpdateBlock(block.id, content)}
-                        />
-                    </BlockErrorBoundary>
+                {blockIds.map((blockId) => (
+                    <BlockRow
+                        key={blockId}
+                        store={store}
+                        blockId={blockId}
+                        pageId={pageId}
+                        onDelete={handleDeleteBlock}
+                        onUpdate={handleUpdateBlock}
+                    />
                 ))}
             </div>
 
-            {blocks.length === 0 && (
+            {blockIds.length === 0 && (
                 <div className="text-center py-12">
                     <p className="text-gray-500 dark:text-gray-400 mb-4">
                         No blocks yet. Start writing!
@@ -144,6 +154,33 @@ export default function SimpleBlockEditor({
     );
 }
 
+/**
+ * Block row bound to its block in the store; re-renders only when that block changes
+ */
+interface BlockRowProps {
+    store: DeltaStore<Block>;
+    blockId: string;
+    pageId: string;
+    onDelete: (blockId: string) => void;
+    onUpdate: (blockId: string, content: string) => void;
+}
+
+const BlockRow = memo(function BlockRow({ store, blockId, pageId, onDelete, onUpdate }: BlockRowProps) {
+    const block = useDeltaItem(store, blockId);
+    if (!block) return null;
+
+    return (
+        <BlockErrorBoundary blockId={blockId}>
+            <EditableBlock
+                block={block}
+                pageId={pageId}
+                onDelete={() => onDelete(blockId)}
+                onUpdate={(content) => onUpdate(blockId, content)}
+            />
+        </BlockErrorBoundary>
+    );
+});
+
 /**
  * Individual Editable Block
  */
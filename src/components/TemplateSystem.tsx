@@ -10,6 +10,7 @@ import { db } from '@/lib/firebase';
 import { collection, addDoc, serverTimestamp } from 'firebase/firestore';
 import { FileText, CheckSquare, Calendar, ListTodo, Briefcase, BookOpen, Target, X } from 'lucide-react';
 import { Block, createBlock } from '@/lib/block-model';
+import { adjustChildCount } from '@/lib/workspace';
 
 export interface Template {
     id: string;
@@ -274,6 +275,7 @@ export async function createPageFromTemplate(
         });
 
         const pageId = pageRef.id;
+        await adjustChildCount(parentId, 1);
 
         // Create blocks from template
         for (let i = 0; i < template.blocks.length; i++) {
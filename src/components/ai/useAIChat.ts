@@ -1,6 +1,6 @@
 import { useState, useRef, useEffect, useCallback } from 'react';
 import { generateAIContent } from '@/lib/ai';
-import { updatePage, Page } from '@/lib/workspace';
+import { updatePage, getPageBody, Page } from '@/lib/workspace';
 import { toast } from 'sonner';
 import { Message, AIAction } from '@/types/ai';
 
@@ -58,8 +58,10 @@ export function useAIChat({
             let contextStr = "";
             if (selectedContext.length > 0) {
                 contextStr += "Context from referenced pages:\n";
-                const formattedContext = selectedContext.map(p => {
-                    return "- Page: " + p.title + " (ID: " + p.id + ") \n  Content: " + (p.content || "Empty");
+                // Page listeners only carry metadata; load the bodies being referenced
+                const bodies = await Promise.all(selectedContext.map(p => p.content ?? getPageBody(p.id)));
+                const formattedContext = selectedContext.map((p, i) => {
+                    return "- Page: " + p.title + " (ID: " + p.id + ") \n  Content: " + (bodies[i] || "Empty");
                 });
                 contextStr += formattedContext.join("\n\n") + "\n\n";
             }
@@ -4,6 +4,7 @@ import { createContext, useContext, useEffect, useState, ReactNode } from "react
 import { onAuthStateChanged, User, signInWithPopup, signOut as firebaseSignOut, signInWithEmailAndPassword, createUserWithEmailAndPassword } from "firebase/auth";
 import { auth, googleProvider, db } from "@/lib/firebase";
 import { doc, setDoc, getDoc, serverTimestamp } from "firebase/firestore";
+import { userProfiles } from "@/lib/user-profiles";
 
 interface AuthContextType {
     user: User | null;
@@ -49,6 +50,8 @@ export function AuthProvider({ children }: { children: ReactNode }) {
                             createdAt: serverTimestamp(),
                         })
                     }, { merge: true });
+                    // The name or photo may have changed since it was cached
+                    userProfiles.invalidate(user.uid);
 
                     // Set session cookie (handled by server in production)
                     // For now, we use Firebase Auth tokens
@@ -5,7 +5,7 @@
 
 import { useCallback, useRef, useEffect } from 'react';
 
-interface AdaptiveDebounceOptions {
+export interface AdaptiveDebounceOptions {
     baseDelay: number;
     collaborativeDelay?: number;
     idleDelay?: number;
@@ -13,12 +13,10 @@ interface AdaptiveDebounceOptions {
 }
 
 /**
- * Hook that provides adaptive debouncing based on activity and collaboration
+ * Delay for the next flush given collaboration and time since the last activity
+ * (shared with non-React callers such as the Yjs provider)
  */
-export function useAdaptiveDebounce<T extends (...args: any[]) => any>(
-    callback: T,
-    options: AdaptiveDebounceOptions
-): T {
+export function getAdaptiveDelay(options: AdaptiveDebounceOptions, timeSinceLastActivity: number): number {
     const {
         baseDelay,
         collaborativeDelay = Math.floor(baseDelay * 0.6), // 40% faster when collaborating
@@ -26,6 +24,27 @@ export function useAdaptiveDebounce<T extends (...args: any[]) => any>(
         hasCollaborators = false,
     } = options;
 
+    if (hasCollaborators) {
+        // Fast sync when others are editing
+        return collaborativeDelay;
+    }
+    if (timeSinceLastActivity > 5000) {
+        // User has been idle - slower sync to reduce server load
+        return idleDelay;
+    }
+    // User is actively typing
+    return baseDelay;
+}
+
+/**
+ * Hook that provides adaptive debouncing based on activity and collaboration
+ */
+export function useAdaptiveDebounce<T extends (...args: any[]) => any>(
+    callback: T,
+    options: AdaptiveDebounceOptions
+): T {
+    const { baseDelay, collaborativeDelay, idleDelay, hasCollaborators } = options;
+
     const timeoutRef = useRef<NodeJS.Timeout | undefined>(undefined);
     const lastActivityRef = useRef<number>(Date.now());
 
@@ -36,18 +55,10 @@ export function useAdaptiveDebounce<T extends (...args: any[]) => any>(
             lastActivityRef.current = now;
 
             // Determine appropriate delay
-            let delay = baseDelay;
-
-            if (hasCollaborators) {
-                // Fast sync when others are editing
-                delay = collaborativeDelay;
-            } else if (timeSinceLastActivity < 1000) {
-                // User is actively typing
-                delay = baseDelay;
-            } else if (timeSinceLastActivity > 5000) {
-                // User has been idle - slower sync to reduce server load
-                delay = idleDelay;
-            }
+            const delay = getAdaptiveDelay(
+                { baseDelay, collaborativeDelay, idleDelay, hasCollaborators },
+                timeSinceLastActivity
+            );
 
             // Clear existing timeout
             if (timeoutRef.current) {
@@ -85,12 +96,7 @@ export function useAdaptiveDebounceWithFlush<T extends (...args: any[]) => any>(
     const lastActivityRef = useRef<number>(Date.now());
     const pendingArgsRef = useRef<Parameters<T> | undefined>(undefined);
 
-    const {
-        baseDelay,
-        collaborativeDelay = Math.floor(baseDelay * 0.6),
-        idleDelay = Math.floor(baseDelay * 2),
-        hasCollaborators = false,
-    } = options;
+    const { baseDelay, collaborativeDelay, idleDelay, hasCollaborators } = options;
 
     const flush = useCallback(() => {
         if (timeoutRef.current) {
@@ -111,14 +117,10 @@ export function useAdaptiveDebounceWithFlush<T extends (...args: any[]) => any>(
 
             pendingArgsRef.current = args;
 
-            let delay = baseDelay;
-            if (hasCollaborators) {
-                delay = collaborativeDelay;
-            } else if (timeSinceLastActivity < 1000) {
-                delay = baseDelay;
-            } else if (timeSinceLastActivity > 5000) {
-                delay = idleDelay;
-            }
+            const delay = getAdaptiveDelay(
+                { baseDelay, collaborativeDelay, idleDelay, hasCollaborators },
+                timeSinceLastActivity
+            );
 
             if (timeoutRef.current) {
                 clearTimeout(timeoutRef.current);
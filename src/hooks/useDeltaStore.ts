@@ -0,0 +1,26 @@
+/**
+ * Delta store hooks
+ * Subscribe components to a DeltaStore so lists re-render on membership or
+ * order changes and rows re-render only when their own item changes
+ */
+
+import { useCallback, useSyncExternalStore } from 'react';
+import { DeltaStore } from '@/lib/delta-store';
+
+/**
+ * Ordered item IDs of a store
+ */
+export function useDeltaIds<T extends { id: string }>(store: DeltaStore<T>): string[] {
+    const subscribe = useCallback((listener: () => void) => store.subscribe(listener), [store]);
+    const getSnapshot = useCallback(() => store.getIds(), [store]);
+    return useSyncExternalStore(subscribe, getSnapshot, getSnapshot);
+}
+
+/**
+ * A single item of a store
+ */
+export function useDeltaItem<T extends { id: string }>(store: DeltaStore<T>, id: string): T | undefined {
+    const subscribe = useCallback((listener: () => void) => store.subscribeItem(id, listener), [store, id]);
+    const getSnapshot = useCallback(() => store.get(id), [store, id]);
+    return useSyncExternalStore(subscribe, getSnapshot, getSnapshot);
+}
@@ -1,17 +1,7 @@
 "use client";
 
 import { useEffect, useState } from 'react';
-import { db } from '@/lib/firebase';
-import {
-    collection,
-    doc,
-    setDoc,
-    onSnapshot,
-    deleteDoc,
-    serverTimestamp,
-    query,
-    where
-} from 'firebase/firestore';
+import { joinAwarenessRoom } from '@/lib/awareness-channel';
 
 export interface PresenceUser {
     userId: string;
@@ -23,7 +13,9 @@ export interface PresenceUser {
 
 /**
  * Real-time presence hook for collaborative editing
- * Shows who's currently viewing/editing the page
+ * Shows who's currently viewing/editing the page. Presence travels over the
+ * page's awareness channel (a relay, or throttled Firestore presence
+ * documents when no relay is configured).
  */
 export function usePresence(
     pageId: string | null,
@@ -36,63 +28,52 @@ export function usePresence(
     useEffect(() => {
         if (!pageId || !userId) return;
 
-        const presenceRef = doc(db, 'pages', pageId, 'presence', userId);
+        const { awareness, leave } = joinAwarenessRoom(pageId, userId);
 
         // Generate a consistent color per user
         const userColor = `hsl(${Math.abs(hashCode(userId)) % 360}, 70%, 60%)`;
 
-        // Set own presence
-        const setPresence = async () => {
-            try {
-                await setDoc(presenceRef, {
-                    userId,
-                    userName: userName || 'Anonymous',
-                    userAvatar: userAvatar || null,
-                    color: userColor,
-                    lastSeen: serverTimestamp()
-                }, { merge: true });
-            } catch (error) {
-                console.error('Failed to set presence:', error);
-            }
-        };
+        // Set own presence (keeping fields like the cursor set by others)
+        awareness.setLocalStateField('user', {
+            ...awareness.getLocalState()?.user,
+            userId,
+            userName: userName || 'Anonymous',
+            userAvatar: userAvatar || null,
+            color: userColor,
+        });
 
-        setPresence();
-
-        // Update presence every 30 seconds (heartbeat)
-        const heartbeat = setInterval(setPresence, 30000);
-
-        // Listen to all presence
-        const presenceCollectionRef = collection(db, 'pages', pageId, 'presence');
-        const unsubscribe = onSnapshot(presenceCollectionRef, (snapshot) => {
-            const users: PresenceUser[] = [];
-            const now = new Date();
-
-            snapshot.docs.forEach((doc) => {
-                const data = doc.data();
-
-                // Only show users active in last 2 minutes
-                const lastSeen = data.lastSeen?.toDate() || now;
-                const secondsAgo = (now.getTime() - lastSeen.getTime()) / 1000;
-
-                if (secondsAgo < 120 && doc.id !== userId) {
-                    users.push({
-                        userId: doc.id,
-                        userName: data.userName || 'Anonymous',
-                        userAvatar: data.userAvatar,
-                        color: data.color || '#888',
-                        lastSeen
-                    });
-                }
+        const updateUsers = () => {
+            // One entry per user, even with several tabs open
+            const users = new Map<string, PresenceUser>();
+
+            awareness.getStates().forEach((state, clientId) => {
+                const user = state.user;
+                if (!user?.userId || user.userId === userId) return;
+
+                const lastSeen = new Date(awareness.meta.get(clientId)?.lastUpdated ?? Date.now());
+                const existing = users.get(user.userId);
+                if (existing && existing.lastSeen >= lastSeen) return;
+
+                users.set(user.userId, {
+                    userId: user.userId,
+                    userName: user.userName || 'Anonymous',
+                    userAvatar: user.userAvatar || undefined,
+                    color: user.color || '#888',
+                    lastSeen,
+                });
             });
 
-            setActiveUsers(users);
-        });
+            setActiveUsers(Array.from(users.values()));
+        };
+
+        // Stale peers are removed by the awareness timeout, which emits 'change'
+        awareness.on('change', updateUsers);
+        updateUsers();
 
         // Cleanup on unmount
         return () => {
-            clearInterval(heartbeat);
-            unsubscribe();
-            deleteDoc(presenceRef).catch(console.error);
+            awareness.off('change', updateUsers);
+            leave();
         };
     }, [pageId, userId, userName, userAvatar]);
 
@@ -0,0 +1,57 @@
+/**
+ * User profile hooks
+ * Resolve user IDs to profiles through the shared batched loader, so every
+ * avatar, comment and activity row on screen is served by a few queries
+ */
+
+import { useEffect, useState } from 'react';
+import { userProfiles, UserProfile } from '@/lib/user-profiles';
+
+/**
+ * Profile of a single user (null until loaded or when missing)
+ */
+export function useUserProfile(uid: string | null | undefined): UserProfile | null {
+    const [profile, setProfile] = useState<UserProfile | null>(() => (uid && userProfiles.peek(uid)) || null);
+
+    useEffect(() => {
+        if (!uid) {
+            setProfile(null);
+            return;
+        }
+
+        let active = true;
+        userProfiles.load(uid).then(loaded => {
+            if (active) setProfile(loaded);
+        });
+        return () => {
+            active = false;
+        };
+    }, [uid]);
+
+    return profile;
+}
+
+/**
+ * Profiles of several users, keyed by user ID
+ */
+export function useUserProfiles(uids: string[]): Map<string, UserProfile> {
+    const key = Array.from(new Set(uids.filter(Boolean))).sort().join(',');
+    const [profiles, setProfiles] = useState<Map<string, UserProfile>>(() => new Map());
+
+    useEffect(() => {
+        if (!key) {
+            setProfiles(new Map());
+            return;
+        }
+
+        let active = true;
+        userProfiles.loadMany(key.split(',')).then(loaded => {
+            if (active) setProfiles(loaded);
+        });
+        return () => {
+            active = false;
+        };
+    }, [key]);
+
+    return profiles;
+}
@@ -0,0 +1,281 @@
+/**
+ * Aggregation - Streaming, mergeable aggregates for footers, charts and rollups
+ */
+
+import { Page } from './workspace';
+
+export type AggregateFunction =
+    | 'count' | 'count_values' | 'sum' | 'avg' | 'min' | 'max'
+    | 'distinct' | 'median' | 'p90';
+
+export interface HistogramBin {
+    start: number;
+    end: number;
+    count: number;
+}
+
+/**
+ * Running aggregate over a column of values.
+ * add/remove are O(1) for count, sum, avg and distinct; min/max are
+ * recomputed lazily only after the current extreme is removed, and the
+ * sorted view used by percentiles and histograms is rebuilt on demand.
+ */
+export class Aggregator {
+    // Rows seen, including empty values
+    count = 0;
+    // Non-empty values
+    countValues = 0;
+    sum = 0;
+
+    // Finite numeric value -> occurrences
+    private numbers = new Map<number, number>();
+    private numericCount = 0;
+    // String form of every non-empty value -> occurrences
+    private distinctValues = new Map<string, number>();
+
+    private minValue: number | null = null;
+    private maxValue: number | null = null;
+    private extremesDirty = false;
+    private sorted: Float64Array | null = null;
+
+    add(value: unknown) {
+        this.update(value, 1);
+    }
+
+    remove(value: unknown) {
+        this.update(value, -1);
+    }
+
+    /**
+     * Add a whole column at once
+     */
+    addAll(values: ArrayLike<unknown>) {
+        for (let i = 0; i < values.length; i++) {
+            this.update(values[i], 1);
+        }
+    }
+
+    /**
+     * Fold another aggregator into this one
+     */
+    merge(other: Aggregator) {
+        this.count += other.count;
+        this.countValues += other.countValues;
+        this.sum += other.sum;
+        this.numericCount += other.numericCount;
+        other.numbers.forEach((n, value) => {
+            this.numbers.set(value, (this.numbers.get(value) || 0) + n);
+        });
+        other.distinctValues.forEach((n, key) => {
+            this.distinctValues.set(key, (this.distinctValues.get(key) || 0) + n);
+        });
+        this.extremesDirty = true;
+        this.sorted = null;
+    }
+
+    get avg(): number | null {
+        return this.numericCount > 0 ? this.sum / this.numericCount : null;
+    }
+
+    get min(): number | null {
+        this.refreshExtremes();
+        return this.minValue;
+    }
+
+    get max(): number | null {
+        this.refreshExtremes();
+        return this.maxValue;
+    }
+
+    get distinct(): number {
+        return this.distinctValues.size;
+    }
+
+    /**
+     * Percentile of the numeric values (p in [0, 100]), linearly interpolated
+     */
+    percentile(p: number): number | null {
+        const sorted = this.getSorted();
+        if (sorted.length === 0) return null;
+
+        const rank = (Math.min(Math.max(p, 0), 100) / 100) * (sorted.length - 1);
+        const lower = Math.floor(rank);
+        const upper = Math.ceil(rank);
+        return sorted[lower] + (sorted[upper] - sorted[lower]) * (rank - lower);
+    }
+
+    /**
+     * Equal-width histogram of the numeric values
+     */
+    histogram(binCount: number): HistogramBin[] {
+        const min = this.min;
+        const max = this.max;
+        if (min === null || max === null || binCount < 1) return [];
+
+        const width = (max - min) / binCount || 1;
+        const bins: HistogramBin[] = [];
+        for (let i = 0; i < binCount; i++) {
+            bins.push({ start: min + i * width, end: min + (i + 1) * width, count: 0 });
+        }
+
+        this.numbers.forEach((n, value) => {
+            const bin = Math.min(Math.floor((value - min) / width), binCount - 1);
+            bins[bin].count += n;
+        });
+        return bins;
+    }
+
+    /**
+     * Value of a named aggregate
+     */
+    get(fn: AggregateFunction): number | null {
+        switch (fn) {
+            case 'count':
+                return this.count;
+            case 'count_values':
+                return this.countValues;
+            case 'sum':
+                return this.sum;
+            case 'avg':
+                return this.avg;
+            case 'min':
+                return this.min;
+            case 'max':
+                return this.max;
+            case 'distinct':
+                return this.distinct;
+            case 'median':
+                return this.percentile(50);
+            case 'p90':
+                return this.percentile(90);
+            default:
+                return null;
+        }
+    }
+
+    private update(value: unknown, delta: 1 | -1) {
+        this.count += delta;
+        if (value == null || value === '' || (Array.isArray(value) && value.length === 0)) return;
+
+        this.countValues += delta;
+        adjustCount(this.distinctValues, String(value), delta);
+
+        // Number('  ') is 0; whitespace is not a number
+        const num = typeof value === 'number' ? value
+            : typeof value === 'string' && value.trim() !== '' ? Number(value)
+            : NaN;
+        if (!isFinite(num)) return;
+
+        this.sum += delta * num;
+        this.numericCount += delta;
+        adjustCount(this.numbers, num, delta);
+        this.sorted = null;
+
+        if (delta > 0) {
+            if (!this.extremesDirty) {
+                if (this.minValue === null || num < this.minValue) this.minValue = num;
+                if (this.maxValue === null || num > this.maxValue) this.maxValue = num;
+            }
+        } else if (num === this.minValue || num === this.maxValue) {
+            this.extremesDirty = true;
+        }
+    }
+
+    private refreshExtremes() {
+        if (!this.extremesDirty) return;
+
+        this.minValue = null;
+        this.maxValue = null;
+        this.numbers.forEach((_, value) => {
+            if (this.minValue === null || value < this.minValue) this.minValue = value;
+            if (this.maxValue === null || value > this.maxValue) this.maxValue = value;
+        });
+        this.extremesDirty = false;
+    }
+
+    private getSorted(): Float64Array {
+        if (this.sorted) return this.sorted;
+
+        const sorted = new Float64Array(this.numericCount);
+        let i = 0;
+        this.numbers.forEach((n, value) => {
+            for (let k = 0; k < n; k++) sorted[i++] = value;
+        });
+        sorted.sort();
+        this.sorted = sorted;
+        return sorted;
+    }
+}
+
+function adjustCount<K>(counts: Map<K, number>, key: K, delta: number) {
+    const next = (counts.get(key) || 0) + delta;
+    if (next > 0) counts.set(key, next);
+    else counts.delete(key);
+}
+
+/**
+ * Aggregate a column in one pass
+ */
+export function aggregate(values: ArrayLike<unknown>): Aggregator {
+    const aggregator = new Aggregator();
+    aggregator.addAll(values);
+    return aggregator;
+}
+
+/**
+ * Per-property aggregators over a set of pages, kept up to date by diffing
+ * page references: each changed row costs one remove and one add.
+ */
+export class PageAggregates {
+    private aggregators = new Map<string, Aggregator>();
+    private pages = new Map<string, Page>();
+
+    constructor(private propertyIds: string[]) {
+        propertyIds.forEach(id => this.aggregators.set(id, new Aggregator()));
+    }
+
+    sync(pages: Page[]) {
+        const seen = new Set<string>();
+
+        for (const page of pages) {
+            seen.add(page.id);
+            const previous = this.pages.get(page.id);
+            if (previous === page) continue;
+
+            if (previous) this.update(previous, -1);
+            this.update(page, 1);
+            this.pages.set(page.id, page);
+        }
+
+        if (seen.size !== this.pages.size) {
+            this.pages.forEach((page, id) => {
+                if (seen.has(id)) return;
+                this.update(page, -1);
+                this.pages.delete(id);
+            });
+        }
+
+        return this;
+    }
+
+    get(propertyId: string): Aggregator | undefined {
+        return this.aggregators.get(propertyId);
+    }
+
+    private update(page: Page, delta: 1 | -1) {
+        for (const id of this.propertyIds) {
+            const value = page.propertyValues?.[id];
+            if (delta > 0) this.aggregators.get(id)!.add(value);
+            else this.aggregators.get(id)!.remove(value);
+        }
+    }
+}
+
+/**
+ * Format an aggregate for display
+ */
+export function formatAggregate(value: number | null, fn: AggregateFunction): string {
+    if (value === null) return '—';
+    if (fn === 'count' || fn === 'count_values' || fn === 'distinct') return String(value);
+    return Number.isInteger(value) ? String(value) : value.toFixed(2);
+}
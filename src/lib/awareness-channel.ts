@@ -0,0 +1,361 @@
+/**
+ * Awareness Channel
+ * Ephemeral presence, cursor and selection sync for Yjs awareness, outside
+ * Firestore. Local state changes are coalesced into one y-protocols binary
+ * awareness message per throttle window and sent over pluggable transports:
+ * BroadcastChannel for tabs on the same device, plus a WebSocket relay
+ * (backend/src/awareness-relay.ts) when one is configured or else throttled
+ * Firestore presence documents. Peers that stop sending are expired
+ * client-side by Awareness' own outdated-state check.
+ */
+
+import * as Y from 'yjs';
+import { db } from '@/lib/firebase';
+import {
+    collection,
+    doc,
+    setDoc,
+    deleteDoc,
+    onSnapshot,
+    serverTimestamp,
+    Bytes,
+} from 'firebase/firestore';
+import {
+    Awareness,
+    encodeAwarenessUpdate,
+    applyAwarenessUpdate,
+    removeAwarenessStates,
+} from 'y-protocols/awareness';
+
+export interface AwarenessTransport {
+    /**
+     * Start delivering messages; onOpen fires on every (re)connect so the
+     * local state can be announced again. Transports that can tell when a
+     * peer has gone report its client IDs through onPeersLeft.
+     */
+    connect(
+        onMessage: (message: Uint8Array) => void,
+        onOpen: () => void,
+        onPeersLeft?: (clientIds: number[]) => void
+    ): void;
+    send(message: Uint8Array): void;
+    close(): void;
+}
+
+/**
+ * Same-device transport between tabs
+ */
+export class BroadcastChannelTransport implements AwarenessTransport {
+    private channel: BroadcastChannel | null = null;
+
+    constructor(private name: string) {}
+
+    connect(onMessage: (message: Uint8Array) => void, onOpen: () => void) {
+        this.channel = new BroadcastChannel(this.name);
+        this.channel.onmessage = (event: MessageEvent) => onMessage(new Uint8Array(event.data));
+        onOpen();
+    }
+
+    send(message: Uint8Array) {
+        this.channel?.postMessage(message);
+    }
+
+    close() {
+        this.channel?.close();
+        this.channel = null;
+    }
+}
+
+const MAX_RECONNECT_DELAY = 30000;
+
+/**
+ * Transport through a WebSocket relay that forwards each message to the
+ * other sockets in the same room. Messages sent while disconnected are
+ * dropped; the full local state is re-sent on reconnect.
+ */
+export class WebSocketTransport implements AwarenessTransport {
+    private socket: WebSocket | null = null;
+    private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    private retries = 0;
+    private closed = false;
+
+    constructor(private url: string) {}
+
+    connect(onMessage: (message: Uint8Array) => void, onOpen: () => void) {
+        const socket = new WebSocket(this.url);
+        socket.binaryType = 'arraybuffer';
+
+        socket.onopen = () => {
+            this.retries = 0;
+            onOpen();
+        };
+        socket.onmessage = (event: MessageEvent) => onMessage(new Uint8Array(event.data));
+        socket.onclose = () => {
+            if (this.closed) return;
+            // Exponential backoff
+            const delay = Math.min(MAX_RECONNECT_DELAY, 1000 * 2 ** this.retries++);
+            this.reconnectTimer = setTimeout(() => this.connect(onMessage, onOpen), delay);
+        };
+
+        this.socket = socket;
+    }
+
+    send(message: Uint8Array) {
+        if (this.socket?.readyState === WebSocket.OPEN) this.socket.send(message);
+    }
+
+    close() {
+        this.closed = true;
+        if (this.reconnectTimer) clearTimeout(this.reconnectTimer);
+        this.socket?.close();
+        this.socket = null;
+    }
+}
+
+// Minimum interval between presence document writes
+const PRESENCE_WRITE_INTERVAL = 2000;
+// Presence documents not rewritten for this long belong to closed clients
+// (Awareness renews the local state every 15 seconds)
+const PRESENCE_STALE_AFTER = 30000;
+
+/**
+ * Transport through Firestore for deployments without a relay: each client
+ * keeps its latest awareness message in pages/{pageId}/presence/{userId}-{clientID}
+ * and listens to the page's presence collection. Writes are throttled, so
+ * cursors move in steps rather than smoothly.
+ */
+export class FirestorePresenceTransport implements AwarenessTransport {
+    private unsubscribe: (() => void) | null = null;
+    private pending: Uint8Array | null = null;
+    private writeTimer: ReturnType<typeof setTimeout> | null = null;
+    private lastWrite = 0;
+    private presenceId: string;
+
+    constructor(private pageId: string, private userId: string, private clientID: number) {
+        this.presenceId = `${userId}-${clientID}`;
+    }
+
+    connect(
+        onMessage: (message: Uint8Array) => void,
+        onOpen: () => void,
+        onPeersLeft?: (clientIds: number[]) => void
+    ) {
+        this.unsubscribe = onSnapshot(collection(db, 'pages', this.pageId, 'presence'), (snapshot) => {
+            const now = Date.now();
+            snapshot.docChanges().forEach((change) => {
+                const data = change.doc.data();
+                // Documents from before the awareness channel carry no update
+                if (change.doc.id === this.presenceId || !(data.update instanceof Bytes)) return;
+
+                if (change.type === 'removed') {
+                    if (typeof data.clientId === 'number') onPeersLeft?.([data.clientId]);
+                    return;
+                }
+
+                const updatedAt = data.updatedAt?.toMillis?.() ?? now;
+                if (now - updatedAt > PRESENCE_STALE_AFTER) return;
+                onMessage(data.update.toUint8Array());
+            });
+        }, (error) => {
+            console.error('Failed to listen to presence:', error);
+        });
+        onOpen();
+    }
+
+    send(message: Uint8Array) {
+        this.pending = message;
+        if (this.writeTimer) return;
+        const wait = Math.max(0, this.lastWrite + PRESENCE_WRITE_INTERVAL - Date.now());
+        this.writeTimer = setTimeout(this.write, wait);
+    }
+
+    private write = () => {
+        this.writeTimer = null;
+        if (!this.pending) return;
+        const update = this.pending;
+        this.pending = null;
+        this.lastWrite = Date.now();
+
+        setDoc(doc(db, 'pages', this.pageId, 'presence', this.presenceId), {
+            userId: this.userId,
+            clientId: this.clientID,
+            update: Bytes.fromUint8Array(update),
+            updatedAt: serverTimestamp(),
+        }).catch((error) => {
+            console.error('Failed to write presence:', error);
+        });
+    };
+
+    close() {
+        if (this.writeTimer) clearTimeout(this.writeTimer);
+        this.writeTimer = null;
+        this.pending = null;
+        this.unsubscribe?.();
+        this.unsubscribe = null;
+        // Peers see the document go and drop us right away
+        deleteDoc(doc(db, 'pages', this.pageId, 'presence', this.presenceId)).catch(console.error);
+    }
+}
+
+/**
+ * Default transports for a room: BroadcastChannel where available, plus
+ * the relay when NEXT_PUBLIC_AWARENESS_RELAY_URL is set and Firestore
+ * presence documents otherwise
+ */
+export function createAwarenessTransports(room: string, userId: string, clientID: number): AwarenessTransport[] {
+    const transports: AwarenessTransport[] = [];
+
+    if (typeof BroadcastChannel !== 'undefined') {
+        transports.push(new BroadcastChannelTransport(`awareness:${room}`));
+    }
+
+    const relayUrl = process.env.NEXT_PUBLIC_AWARENESS_RELAY_URL;
+    if (relayUrl && typeof WebSocket !== 'undefined') {
+        transports.push(new WebSocketTransport(`${relayUrl.replace(/\/$/, '')}/${encodeURIComponent(room)}`));
+    } else {
+        transports.push(new FirestorePresenceTransport(room, userId, clientID));
+    }
+
+    return transports;
+}
+
+export interface AwarenessChannelOptions {
+    // Minimum interval between outgoing messages; changes in between are coalesced
+    throttleMs: number;
+}
+
+const DEFAULT_CHANNEL_OPTIONS: AwarenessChannelOptions = {
+    throttleMs: 100,
+};
+
+/**
+ * Broadcasts the local awareness state and applies remote ones
+ */
+export class AwarenessChannel {
+    private options: AwarenessChannelOptions;
+    private flushTimer: ReturnType<typeof setTimeout> | null = null;
+    private lastFlush = 0;
+
+    constructor(
+        private awareness: Awareness,
+        private transports: AwarenessTransport[],
+        options?: Partial<AwarenessChannelOptions>
+    ) {
+        this.options = { ...DEFAULT_CHANNEL_OPTIONS, ...options };
+
+        this.awareness.on('update', this.handleUpdate);
+        this.transports.forEach(transport => {
+            transport.connect(this.handleMessage, () => this.schedule(), this.handlePeersLeft);
+        });
+    }
+
+    private handleUpdate = (
+        { added, updated, removed }: { added: number[]; updated: number[]; removed: number[] },
+        origin: unknown
+    ) => {
+        if (origin === this) {
+            // Announce ourselves to peers we haven't heard from before
+            if (added.length > 0) this.schedule();
+            return;
+        }
+
+        // Only the local state is ours to broadcast (remote states expiring
+        // locally are not)
+        const clientID = this.awareness.clientID;
+        if (added.includes(clientID) || updated.includes(clientID) || removed.includes(clientID)) {
+            this.schedule();
+        }
+    };
+
+    private handleMessage = (message: Uint8Array) => {
+        try {
+            applyAwarenessUpdate(this.awareness, message, this);
+        } catch (error) {
+            console.error('Failed to apply awareness update:', error);
+        }
+    };
+
+    private handlePeersLeft = (clientIds: number[]) => {
+        removeAwarenessStates(this.awareness, clientIds, this);
+    };
+
+    /**
+     * Throttle, not debounce: a continuously moving cursor still goes out
+     * once per window, carrying only its latest position
+     */
+    private schedule() {
+        if (this.flushTimer) return;
+        const wait = Math.max(0, this.lastFlush + this.options.throttleMs - Date.now());
+        this.flushTimer = setTimeout(this.flush, wait);
+    }
+
+    /**
+     * Send the local state now
+     */
+    flush = () => {
+        if (this.flushTimer) {
+            clearTimeout(this.flushTimer);
+            this.flushTimer = null;
+        }
+        this.lastFlush = Date.now();
+
+        const message = encodeAwarenessUpdate(this.awareness, [this.awareness.clientID]);
+        this.transports.forEach(transport => transport.send(message));
+    };
+
+    destroy() {
+        // Deliver a pending update (e.g. our removal) before closing
+        if (this.flushTimer) this.flush();
+        this.awareness.off('update', this.handleUpdate);
+        this.transports.forEach(transport => transport.close());
+    }
+}
+
+interface AwarenessRoom {
+    awareness: Awareness;
+    channel: AwarenessChannel;
+    refs: number;
+    handlePageHide: () => void;
+}
+
+const rooms = new Map<string, AwarenessRoom>();
+
+/**
+ * Shared awareness for a page. Every component on the page (presence,
+ * cursors, the Yjs provider) joins the same room, so a tab is one peer.
+ */
+export function joinAwarenessRoom(pageId: string, userId: string): { awareness: Awareness; leave: () => void } {
+    let room = rooms.get(pageId);
+    if (!room) {
+        const awareness = new Awareness(new Y.Doc());
+        const channel = new AwarenessChannel(awareness, createAwarenessTransports(pageId, userId, awareness.clientID));
+
+        // Tell peers right away instead of letting them time us out
+        const handlePageHide = () => {
+            removeAwarenessStates(awareness, [awareness.clientID], 'window unload');
+            channel.flush();
+        };
+        if (typeof window !== 'undefined') window.addEventListener('pagehide', handlePageHide);
+
+        room = { awareness, channel, refs: 0, handlePageHide };
+        rooms.set(pageId, room);
+    }
+    room.refs++;
+
+    const joined = room;
+    let left = false;
+    return {
+        awareness: joined.awareness,
+        leave: () => {
+            if (left) return;
+            left = true;
+            if (--joined.refs > 0) return;
+
+            rooms.delete(pageId);
+            if (typeof window !== 'undefined') window.removeEventListener('pagehide', joined.handlePageHide);
+            // Destroying the awareness clears the local state; the channel sends that last
+            joined.awareness.destroy();
+            joined.channel.destroy();
+        },
+    };
+}
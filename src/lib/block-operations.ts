@@ -14,13 +14,21 @@ import {
     query,
     where,
     orderBy,
-    onSnapshot,
     serverTimestamp,
     writeBatch,
     Timestamp,
 } from 'firebase/firestore';
 import { Block, BlockType, JSONContent, createBlock, updateBlockContent } from './block-model';
 import { generatePositionBetween } from './fractional-index';
+import { subscribeToQueryDeltas } from './delta-store';
+
+/**
+ * A single block change from a realtime snapshot
+ */
+export interface BlockChange {
+    type: 'added' | 'modified' | 'removed';
+    block: Block;
+}
 
 /**
  * Create a new block
@@ -193,11 +201,13 @@ export async function moveBlock(
 }
 
 /**
- * Subscribe to blocks for real-time updates
+ * Subscribe to blocks for real-time updates.
+ * The callback also receives the changes since the previous snapshot
+ * (every block arrives as 'added' on the first one).
  */
 export function subscribeToPageBlocks(
     pageId: string,
-    callback: (blocks: Block[]) => void
+    callback: (blocks: Block[], changes: BlockChange[]) => void
 ): () => void {
     const q = query(
         collection(db, 'blocks'),
@@ -205,13 +215,12 @@ export function subscribeToPageBlocks(
         orderBy('position', 'asc')
     );
 
-    return onSnapshot(q, (snapshot) => {
-        const blocks: Block[] = [];
-        snapshot.forEach(doc => {
-            blocks.push({ id: doc.id, ...doc.data() } as Block);
-        });
-        callback(blocks);
-    });
+    // Untouched blocks keep their object identity across snapshots
+    return subscribeToQueryDeltas(
+        q,
+        doc => ({ id: doc.id, ...doc.data() } as Block),
+        (blocks, deltas) => callback(blocks, deltas.map(({ type, item }) => ({ type, block: item })))
+    );
 }
 
 /**
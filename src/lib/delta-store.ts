@@ -0,0 +1,146 @@
+/**
+ * Delta Store
+ * Realtime query subscriptions as added/modified/removed deltas, with
+ * stable object identity for untouched documents, plus a small store that
+ * applies them and notifies per item.
+ */
+
+import { onSnapshot, Query, QueryDocumentSnapshot } from 'firebase/firestore';
+
+export type DeltaType = 'added' | 'modified' | 'removed';
+
+export interface Delta<T> {
+    type: DeltaType;
+    item: T;
+}
+
+/**
+ * Subscribe to a query as deltas. `items` is in query order and reuses the
+ * previous object for every document that did not change.
+ */
+export function subscribeToQueryDeltas<T extends { id: string }>(
+    q: Query,
+    decode: (doc: QueryDocumentSnapshot) => T,
+    callback: (items: T[], deltas: Delta<T>[]) => void
+): () => void {
+    const current = new Map<string, T>();
+
+    return onSnapshot(q, (snapshot) => {
+        const deltas: Delta<T>[] = snapshot.docChanges().map(change => {
+            const item = decode(change.doc);
+            if (change.type === 'removed') {
+                current.delete(item.id);
+            } else {
+                current.set(item.id, item);
+            }
+            return { type: change.type, item };
+        });
+
+        callback(snapshot.docs.map(doc => current.get(doc.id)!), deltas);
+    });
+}
+
+/**
+ * Items kept current from deltas. Whole-list subscribers are only notified
+ * when membership or order changes; item subscribers only when their item
+ * changes.
+ */
+export class DeltaStore<T extends { id: string }> {
+    private items = new Map<string, T>();
+    private ordered: T[] = [];
+    private ids: string[] = [];
+
+    private listListeners = new Set<() => void>();
+    private itemListeners = new Map<string, Set<() => void>>();
+
+    /**
+     * Apply deltas. `ordered` is the full list in display order when the
+     * source provides one (as subscribeToQueryDeltas does); otherwise
+     * added items are appended.
+     */
+    apply(deltas: Delta<T>[], ordered?: T[]) {
+        if (deltas.length === 0 && !ordered) return;
+
+        const touched = new Set<string>();
+        let membershipChanged = false;
+
+        for (const { type, item } of deltas) {
+            if (type === 'removed') {
+                membershipChanged = this.items.delete(item.id) || membershipChanged;
+            } else {
+                if (!this.items.has(item.id)) membershipChanged = true;
+                this.items.set(item.id, item);
+            }
+            touched.add(item.id);
+        }
+
+        let ids: string[];
+        if (ordered) {
+            ids = ordered.map(item => item.id);
+        } else {
+            ids = this.ids.filter(id => this.items.has(id));
+            const known = new Set(ids);
+            deltas.forEach(({ type, item }) => {
+                if (type !== 'removed' && !known.has(item.id)) {
+                    ids.push(item.id);
+                    known.add(item.id);
+                }
+            });
+        }
+        this.ordered = ids.map(id => this.items.get(id)!);
+
+        if (membershipChanged || !sameIds(ids, this.ids)) {
+            this.ids = ids;
+            this.listListeners.forEach(listener => listener());
+        }
+
+        touched.forEach(id => this.itemListeners.get(id)?.forEach(listener => listener()));
+    }
+
+    get(id: string): T | undefined {
+        return this.items.get(id);
+    }
+
+    /**
+     * Items in order (a new array after every applied batch)
+     */
+    getItems(): T[] {
+        return this.ordered;
+    }
+
+    /**
+     * IDs in order; the same array until membership or order changes
+     */
+    getIds(): string[] {
+        return this.ids;
+    }
+
+    subscribe(listener: () => void): () => void {
+        this.listListeners.add(listener);
+        return () => {
+            this.listListeners.delete(listener);
+        };
+    }
+
+    subscribeItem(id: string, listener: () => void): () => void {
+        let listeners = this.itemListeners.get(id);
+        if (!listeners) {
+            listeners = new Set();
+            this.itemListeners.set(id, listeners);
+        }
+        listeners.add(listener);
+
+        return () => {
+            listeners!.delete(listener);
+            if (listeners!.size === 0) this.itemListeners.delete(id);
+        };
+    }
+}
+
+function sameIds(a: string[], b: string[]): boolean {
+    if (a.length !== b.length) return false;
+    for (let i = 0; i < a.length; i++) {
+        if (a[i] !== b[i]) return false;
+    }
+    return true;
+}
@@ -26,71 +26,165 @@ export interface Filter {
 export interface FilterGroup {
   condition: FilterCondition;
   filters: Filter[];
+  // Nested groups, combined with `filters` under this group's condition
+  groups?: FilterGroup[];
 }
 
+export type PagePredicate = (page: Page) => boolean;
+
+type Property = NonNullable<Page['properties']>[number];
+type ValuePredicate = (value: any) => boolean;
+
 /**
  * Apply filters to pages
+ * @param schema - Database properties; lets each filter use a predicate specialized for its property type
+ */
+export function applyFilters(pages: Page[], filterGroup: FilterGroup, schema: Property[] = []): Page[] {
+  if (isEmptyGroup(filterGroup)) return pages;
+
+  return pages.filter(compileFilterGroup(filterGroup, schema));
+}
+
+/**
+ * Compile a filter group into a single predicate.
+ * Filter values are normalized once here (compiled into case-insensitive
+ * matchers, parsed as numbers or dates) instead of per row, and groups
+ * short-circuit on the first deciding filter.
  */
-export function applyFilters(pages: Page[], filterGroup: FilterGroup): Page[] {
-  if (!filterGroup.filters.length) return pages;
-
-  return pages.filter(page => {
-    const results = filterGroup.filters.map(filter => {
-      const value = page.propertyValues?.[filter.propertyId];
-      return evaluateFilter(value, filter.operator, filter.value);
-    });
-
-    return filterGroup.condition === 'AND' 
-      ? results.every(Boolean) 
-      : results.some(Boolean);
+export function compileFilterGroup(filterGroup: FilterGroup, schema: Property[] = []): PagePredicate {
+  const types = new Map<string, string>();
+  schema.forEach(prop => types.set(prop.id, prop.type));
+
+  return compileGroup(filterGroup, types);
+}
+
+function isEmptyGroup(group: FilterGroup): boolean {
+  return group.filters.length === 0 && (group.groups || []).every(isEmptyGroup);
+}
+
+function compileGroup(group: FilterGroup, types: Map<string, string>): PagePredicate {
+  const predicates: PagePredicate[] = group.filters.map(filter => {
+    const test = compileFilter(filter, types.get(filter.propertyId));
+    const propertyId = filter.propertyId;
+    return (page: Page) => test(page.propertyValues?.[propertyId]);
   });
+
+  for (const child of group.groups || []) {
+    if (!isEmptyGroup(child)) predicates.push(compileGroup(child, types));
+  }
+
+  if (predicates.length === 0) return () => true;
+  if (predicates.length === 1) return predicates[0];
+
+  if (group.condition === 'AND') {
+    return (page: Page) => {
+      for (const predicate of predicates) {
+        if (!predicate(page)) return false;
+      }
+      return true;
+    };
+  }
+
+  return (page: Page) => {
+    for (const predicate of predicates) {
+      if (predicate(page)) return true;
+    }
+    return false;
+  };
 }
 
 /**
- * Evaluate a single filter
+ * Build a type-specialized predicate for a single filter
  */
-function evaluateFilter(value: any, operator: FilterOperator, filterValue: any): boolean {
-  const strValue = String(value || '').toLowerCase();
-  const strFilterValue = String(filterValue || '').toLowerCase();
+function compileFilter(filter: Filter, propertyType: string | undefined): ValuePredicate {
+  const filterValue = filter.value;
 
-  switch (operator) {
+  switch (filter.operator) {
     case 'equals':
-      return value == filterValue;
-    case 'not_equals':
-      return value != filterValue;
-    case 'contains':
-      return strValue.includes(strFilterValue);
-    case 'not_contains':
-      return !strValue.includes(strFilterValue);
-    case 'starts_with':
-      return strValue.startsWith(strFilterValue);
-    case 'ends_with':
-      return strValue.endsWith(strFilterValue);
+    case 'not_equals': {
+      let equals: ValuePredicate = value => value == filterValue;
+
+      if (isNumericType(propertyType) && filterValue !== '' && filterValue != null) {
+        const target = Number(filterValue);
+        if (!isNaN(target)) {
+          equals = value => value != null && value !== '' && Number(value) === target;
+        }
+      } else if (propertyType === 'date' && filterValue) {
+        // Date objects and date strings compare by time
+        const target = new Date(filterValue).getTime();
+        if (!isNaN(target)) {
+          equals = value => value == filterValue || (!!value && new Date(value).getTime() === target);
+        }
+      }
+
+      return filter.operator === 'equals' ? equals : value => !equals(value);
+    }
+    case 'contains': {
+      const matches = textMatcher(filterValue, '', '');
+      return value => matches.test(String(value || ''));
+    }
+    case 'not_contains': {
+      const matches = textMatcher(filterValue, '', '');
+      return value => !matches.test(String(value || ''));
+    }
+    case 'starts_with': {
+      const matches = textMatcher(filterValue, '^', '');
+      return value => matches.test(String(value || ''));
+    }
+    case 'ends_with': {
+      const matches = textMatcher(filterValue, '', '$');
+      return value => matches.test(String(value || ''));
+    }
     case 'is_empty':
-      return !value || value === '' || (Array.isArray(value) && value.length === 0);
+      return value => !value || value === '' || (Array.isArray(value) && value.length === 0);
     case 'is_not_empty':
-      return !!value && value !== '' && (!Array.isArray(value) || value.length > 0);
-    case 'greater_than':
-      return Number(value) > Number(filterValue);
-    case 'less_than':
-      return Number(value) < Number(filterValue);
-    case 'greater_than_or_equal':
-      return Number(value) >= Number(filterValue);
-    case 'less_than_or_equal':
-      return Number(value) <= Number(filterValue);
+      return value => !!value && value !== '' && (!Array.isArray(value) || value.length > 0);
+    case 'greater_than': {
+      const target = Number(filterValue);
+      return value => Number(value) > target;
+    }
+    case 'less_than': {
+      const target = Number(filterValue);
+      return value => Number(value) < target;
+    }
+    case 'greater_than_or_equal': {
+      const target = Number(filterValue);
+      return value => Number(value) >= target;
+    }
+    case 'less_than_or_equal': {
+      const target = Number(filterValue);
+      return value => Number(value) <= target;
+    }
     case 'is_checked':
-      return value === true;
+      return value => value === true;
     case 'is_not_checked':
-      return value !== true;
-    case 'is_before':
-      return new Date(value) < new Date(filterValue);
-    case 'is_after':
-      return new Date(value) > new Date(filterValue);
+      return value => value !== true;
+    case 'is_before': {
+      const target = new Date(filterValue).getTime();
+      return value => new Date(value).getTime() < target;
+    }
+    case 'is_after': {
+      const target = new Date(filterValue).getTime();
+      return value => new Date(value).getTime() > target;
+    }
     default:
-      return true;
+      return () => true;
   }
 }
 
+/**
+ * Case-insensitive matcher for the filter text, built once per filter.
+ * Cells are matched as they are, with no lowercased copy of each one.
+ */
+function textMatcher(filterValue: any, prefix: string, suffix: string): RegExp {
+  const needle = String(filterValue || '').replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  return new RegExp(prefix + needle + suffix, 'iu');
+}
+
+function isNumericType(type: string | undefined): boolean {
+  return type === 'number' || type === 'formula' || type === 'progress';
+}
+
 /**
  * Get available operators for a property type
  */
@@ -4,6 +4,7 @@
  */
 
 import * as math from 'mathjs';
+import { LRUCache } from 'lru-cache';
 import {
   addDays,
   differenceInDays,
@@ -16,10 +17,49 @@ import {
   parseISO,
   isValid
 } from 'date-fns';
+import { Page } from './workspace';
 
 export type PropertyValue = string | number | boolean | Date | null | undefined;
 export type PropertyMap = Record<string, PropertyValue>;
 
+type Property = NonNullable<Page['properties']>[number];
+type PropertyLookup = (name: string) => PropertyValue;
+
+const FORMULA_CACHE_SIZE = 500;
+
+/**
+ * A formula parsed once by mathjs and ready to evaluate against any row
+ */
+export interface CompiledFormula {
+  source: string;
+  // Property names read through prop('...') with a literal argument
+  references: string[];
+  // True when prop() is called with a computed name, so any property may be read
+  hasDynamicReferences: boolean;
+  evaluate: (properties: PropertyMap) => PropertyValue;
+}
+
+/**
+ * Formula results for a whole database column, in the order of the input pages
+ */
+export interface FormulaColumn {
+  values: PropertyValue[];
+  // Numeric view of the results for sorting and charts
+  // (dates as epoch ms, booleans as 0/1, NaN for anything else)
+  numbers: Float64Array;
+  // Page ID -> row index into values/numbers
+  rowIndex: Map<string, number>;
+}
+
+// Parse failures are cached as well so a broken formula is not re-parsed
+// (and re-logged) by every cell that renders it
+type CompileResult = { compiled: ExecutableFormula } | { error: string };
+type ExecutableFormula = CompiledFormula & { code: math.EvalFunction };
+
+const formulaCache = new LRUCache<string, CompileResult>({
+  max: FORMULA_CACHE_SIZE,
+});
+
 /**
  * Main formula evaluation function
  * @param formula - Formula string (e.g., "prop('Price') * 1.1")
@@ -32,147 +72,510 @@ export function evaluateFormula(formula: string, properties: PropertyMap): Prope
     return null;
   }
 
+  const compiled = compileFormula(formula);
+  if (!compiled) return null;
+
+  return compiled.evaluate(properties);
+}
+
+/**
+ * Parse a formula once and cache the compiled expression (LRU, keyed by source)
+ * @returns Compiled formula, or null if the formula is empty or fails to parse
+ */
+export function compileFormula(formula: string): CompiledFormula | null {
+  return getExecutableFormula(formula);
+}
+
+function getExecutableFormula(formula: string): ExecutableFormula | null {
   const trimmedFormula = formula.trim();
   if (!trimmedFormula) {
     return null;
   }
 
+  let entry = formulaCache.get(trimmedFormula);
+  if (!entry) {
+    entry = parseFormula(trimmedFormula);
+    formulaCache.set(trimmedFormula, entry);
+  }
+
+  return 'compiled' in entry ? entry.compiled : null;
+}
+
+/**
+ * Clear the compiled formula cache
+ */
+export function clearFormulaCache() {
+  formulaCache.clear();
+}
+
+/**
+ * Evaluate a formula for every page of a database in one pass
+ * @param formula - Formula string
+ * @param pages - Rows of the database
+ * @param properties - Database schema, used to resolve prop('Name') to property IDs
+ */
+export function evaluateFormulaColumn(formula: string, pages: Page[], properties: Property[]): FormulaColumn {
+  const compiled = formula ? getExecutableFormula(formula) : null;
+  return evaluateColumn(compiled, pages, properties, new Map());
+}
+
+/**
+ * Evaluate a compiled formula over all pages. Values of properties listed in
+ * `computed` (keyed by property ID) are read from there instead of the pages,
+ * which is how formulas see the results of other formulas.
+ */
+function evaluateColumn(
+  compiled: ExecutableFormula | null,
+  pages: Page[],
+  properties: Property[],
+  computed: Map<string, PropertyValue[]>
+): FormulaColumn {
+  const values: PropertyValue[] = new Array(pages.length).fill(null);
+  const numbers = new Float64Array(pages.length).fill(NaN);
+  const rowIndex = new Map<string, number>();
+  pages.forEach((page, i) => rowIndex.set(page.id, i));
+
+  if (!compiled) return { values, numbers, rowIndex };
+
+  // Pull only the referenced properties into columnar arrays
+  const propertyIds = new Map<string, string>();
+  properties.forEach(prop => propertyIds.set(prop.name, prop.id));
+
+  const names = compiled.hasDynamicReferences ? Array.from(propertyIds.keys()) : compiled.references;
+  const columns = new Map<string, PropertyValue[]>();
+  for (const name of names) {
+    const id = propertyIds.get(name);
+    if (!id) continue;
+    columns.set(name, computed.get(id) || pages.map(page => page.propertyValues?.[id]));
+  }
+
+  let row = 0;
+  const scope = new FormulaScope(name => columns.get(name)?.[row]);
+
+  for (; row < pages.length; row++) {
+    scope.clear();
+    const result = evaluateExpression(compiled.code, scope, compiled.source);
+    values[row] = result;
+    numbers[row] = toNumber(result);
+  }
+
+  return { values, numbers, rowIndex };
+}
+
+function toNumber(value: PropertyValue): number {
+  if (typeof value === 'number') return value;
+  if (typeof value === 'boolean') return value ? 1 : 0;
+  if (value instanceof Date) return value.getTime();
+  return NaN;
+}
+
+/**
+ * Dependencies between the formula properties of a database
+ */
+export interface FormulaGraph {
+  // Formula property IDs in evaluation order (dependencies first), cycles excluded
+  order: string[];
+  // Formula property ID -> property IDs it reads
+  dependencies: Map<string, Set<string>>;
+  // Property ID -> formula property IDs that read it directly
+  dependents: Map<string, Set<string>>;
+  // Formula property IDs on, or downstream of, a circular reference
+  circular: Set<string>;
+}
+
+/**
+ * Build the dependency graph of a database's formula properties.
+ * Circular references are detected here, before any row is evaluated;
+ * formulas caught in one always evaluate to null.
+ */
+export function buildFormulaGraph(properties: Property[]): FormulaGraph {
+  const propertyIds = new Map<string, string>();
+  properties.forEach(prop => propertyIds.set(prop.name, prop.id));
+
+  const formulaIds = properties.filter(prop => prop.type === 'formula').map(prop => prop.id);
+  const isFormula = new Set(formulaIds);
+
+  const dependencies = new Map<string, Set<string>>();
+  const dependents = new Map<string, Set<string>>();
+
+  for (const prop of properties) {
+    if (prop.type !== 'formula') continue;
+
+    const deps = new Set<string>();
+    const compiled = prop.formula ? getExecutableFormula(prop.formula) : null;
+    if (compiled?.hasDynamicReferences) {
+      // A computed prop() name may read anything; only plain properties are
+      // tracked so a dynamic formula never forms a cycle by itself
+      properties.forEach(other => {
+        if (!isFormula.has(other.id)) deps.add(other.id);
+      });
+    }
+    compiled?.references.forEach(name => {
+      const id = propertyIds.get(name);
+      if (id) deps.add(id);
+    });
+
+    dependencies.set(prop.id, deps);
+    deps.forEach(id => {
+      if (!dependents.has(id)) dependents.set(id, new Set());
+      dependents.get(id)!.add(prop.id);
+    });
+  }
+
+  // Kahn's algorithm over formula -> formula edges
+  const pending = new Map<string, number>();
+  for (const id of formulaIds) {
+    let count = 0;
+    dependencies.get(id)!.forEach(dep => {
+      if (isFormula.has(dep)) count++;
+    });
+    pending.set(id, count);
+  }
+
+  const order: string[] = [];
+  const ready = formulaIds.filter(id => pending.get(id) === 0);
+  while (ready.length > 0) {
+    const id = ready.shift()!;
+    order.push(id);
+    dependents.get(id)?.forEach(next => {
+      const remaining = pending.get(next)! - 1;
+      pending.set(next, remaining);
+      if (remaining === 0) ready.push(next);
+    });
+  }
+
+  const circular = new Set(formulaIds.filter(id => !order.includes(id)));
+  if (circular.size > 0) {
+    console.error('Formula evaluation error: Circular reference', {
+      properties: properties.filter(prop => circular.has(prop.id)).map(prop => prop.name)
+    });
+  }
+
+  return { order, dependencies, dependents, circular };
+}
+
+/**
+ * Formula property IDs that must be recomputed after the given properties
+ * change, in evaluation order (includes formulas reading other affected formulas)
+ */
+export function getAffectedFormulas(graph: FormulaGraph, changedPropertyIds: Iterable<string>): string[] {
+  const affected = new Set<string>();
+  const queue = Array.from(changedPropertyIds);
+
+  while (queue.length > 0) {
+    const id = queue.pop()!;
+    graph.dependents.get(id)?.forEach(formulaId => {
+      if (!affected.has(formulaId)) {
+        affected.add(formulaId);
+        queue.push(formulaId);
+      }
+    });
+  }
+
+  return graph.order.filter(id => affected.has(id));
+}
+
+/**
+ * Holds the formula results of one database and, on each new set of pages,
+ * recomputes only the formula cells whose inputs actually changed
+ */
+export class FormulaEvaluator {
+  readonly graph: FormulaGraph;
+
+  // Page ID -> property values the current results were computed from
+  private inputs = new Map<string, Record<string, any>>();
+
+  // Page ID -> formula property ID -> result
+  private results = new Map<string, PropertyMap>();
+
+  private properties: Property[];
+  private propertiesById = new Map<string, Property>();
+  private propertyIds = new Map<string, string>();
+
+  constructor(properties: Property[]) {
+    this.properties = properties;
+    properties.forEach(prop => {
+      this.propertiesById.set(prop.id, prop);
+      this.propertyIds.set(prop.name, prop.id);
+    });
+    this.graph = buildFormulaGraph(properties);
+  }
+
+  /**
+   * Formula results for every page, keyed by page ID then formula property ID
+   */
+  evaluate(pages: Page[]): Map<string, PropertyMap> {
+    if (this.graph.dependencies.size === 0) return this.results;
+
+    if (this.results.size === 0) {
+      this.evaluateAll(pages);
+      return this.results;
+    }
+
+    const seen = new Set<string>();
+    for (const page of pages) {
+      seen.add(page.id);
+      const previous = this.inputs.get(page.id);
+      const current = page.propertyValues || {};
+
+      if (!previous) {
+        this.evaluateRow(page, this.graph.order);
+      } else {
+        const changed: string[] = [];
+        this.graph.dependents.forEach((_, id) => {
+          if (!isSameValue(previous[id], current[id])) changed.push(id);
+        });
+        if (changed.length > 0) {
+          this.evaluateRow(page, getAffectedFormulas(this.graph, changed));
+        }
+      }
+      this.inputs.set(page.id, current);
+    }
+
+    for (const id of Array.from(this.results.keys())) {
+      if (!seen.has(id)) {
+        this.results.delete(id);
+        this.inputs.delete(id);
+      }
+    }
+
+    return this.results;
+  }
+
+  private evaluateAll(pages: Page[]) {
+    const computed = new Map<string, PropertyValue[]>();
+    for (const id of this.graph.order) {
+      const formula = this.propertiesById.get(id)?.formula;
+      const compiled = formula ? getExecutableFormula(formula) : null;
+      computed.set(id, evaluateColumn(compiled, pages, this.properties, computed).values);
+    }
+
+    pages.forEach((page, row) => {
+      const values: PropertyMap = {};
+      this.graph.circular.forEach(id => {
+        values[id] = null;
+      });
+      computed.forEach((column, id) => {
+        values[id] = column[row];
+      });
+      this.results.set(page.id, values);
+      this.inputs.set(page.id, page.propertyValues || {});
+    });
+  }
+
+  private evaluateRow(page: Page, formulaIds: string[]) {
+    const values: PropertyMap = { ...this.results.get(page.id) };
+    this.graph.circular.forEach(id => {
+      values[id] = null;
+    });
+
+    const lookup: PropertyLookup = name => {
+      const id = this.propertyIds.get(name);
+      if (!id) return undefined;
+      return id in values ? values[id] : page.propertyValues?.[id];
+    };
+
+    for (const id of formulaIds) {
+      const formula = this.propertiesById.get(id)?.formula;
+      const compiled = formula ? getExecutableFormula(formula) : null;
+      values[id] = compiled ? evaluateExpression(compiled.code, new FormulaScope(lookup), compiled.source) : null;
+    }
+
+    this.results.set(page.id, values);
+  }
+}
+
+function isSameValue(a: unknown, b: unknown): boolean {
+  if (a === b) return true;
+  if (Array.isArray(a) && Array.isArray(b)) {
+    return a.length === b.length && a.every((item, i) => item === b[i]);
+  }
+  return false;
+}
+
+function parseFormula(expression: string): CompileResult {
   try {
-    const context = createFormulaContext(properties);
-    const result = evaluateExpression(trimmedFormula, context);
-    return result;
+    const node = math.parse(expression);
+    const code = node.compile();
+
+    const references = new Set<string>();
+    let hasDynamicReferences = false;
+    node.traverse(child => {
+      if (!math.isFunctionNode(child) || !math.isSymbolNode(child.fn) || child.fn.name !== 'prop') return;
+      const arg = child.args[0];
+      if (arg && math.isConstantNode(arg) && typeof arg.value === 'string') {
+        references.add(arg.value);
+      } else {
+        hasDynamicReferences = true;
+      }
+    });
+
+    return {
+      compiled: {
+        source: expression,
+        code,
+        references: Array.from(references),
+        hasDynamicReferences,
+        evaluate: (properties: PropertyMap) =>
+          evaluateExpression(code, new FormulaScope(name => properties[name]), expression),
+      },
+    };
   } catch (error) {
+    const errorMessage = error instanceof Error ? error.message : 'Unknown error';
     console.error('Formula evaluation error:', {
-      formula: trimmedFormula,
-      error: error instanceof Error ? error.message : 'Unknown error',
-      properties: Object.keys(properties)
+      formula: expression,
+      error: errorMessage,
     });
-    return null;
+    return { error: errorMessage };
   }
 }
 
 /**
- * Create evaluation context with all available functions
- */
-function createFormulaContext(properties: PropertyMap) {
-  const getProp = (name: string) => {
-    const value = properties[name];
-    if (value === null || value === undefined) return 0;
-    return value;
-  };
-
-  return {
-    // Property accessor
-    prop: getProp,
-
-    // Math functions
-    sum: (...args: number[]) => args.reduce((a, b) => Number(a) + Number(b), 0),
-    avg: (...args: number[]) => {
-      if (args.length === 0) return 0;
-      return args.reduce((a, b) => Number(a) + Number(b), 0) / args.length;
-    },
-    min: (...args: number[]) => Math.min(...args.map(Number)),
-    max: (...args: number[]) => Math.max(...args.map(Number)),
-    round: (num: number, decimals: number = 0) => {
-      if (typeof num !== 'number') return 0;
-      const factor = Math.pow(10, decimals);
-      return Math.round(num * factor) / factor;
-    },
-    ceil: (num: number) => Math.ceil(Number(num)),
-    floor: (num: number) => Math.floor(Number(num)),
-    abs: (num: number) => Math.abs(Number(num)),
-    sqrt: (num: number) => Math.sqrt(Number(num)),
-    pow: (base: number, exp: number) => Math.pow(Number(base), Number(exp)),
-
-    // Text functions
-    concat: (...args: unknown[]) => args.map(String).join(''),
-    length: (str: unknown) => String(str || '').length,
-    upper: (str: string) => String(str || '').toUpperCase(),
-    lower: (str: string) => String(str || '').toLowerCase(),
-    replace: (str: string, search: string, replacement: string) =>
-      String(str || '').replace(new RegExp(search, 'g'), replacement),
-    contains: (str: string, search: string) =>
-      String(str || '').includes(search),
-    slice: (str: string, start: number, end?: number) =>
-      String(str || '').slice(start, end),
-
-    // Date functions
-    now: () => new Date(),
-    today: () => {
-      const d = new Date();
-      d.setHours(0, 0, 0, 0);
-      return d;
-    },
-    dateAdd: (date: Date | string, amount: number, unit: 'days' | 'months' | 'years' = 'days') => {
-      if (!date) return new Date();
-      const d = typeof date === 'string' ? parseISO(date) : date;
-      if (!isValid(d)) return new Date();
-
-      if (unit === 'days') return addDays(d, amount);
-      if (unit === 'months') return addDays(d, amount * 30);
-      if (unit === 'years') return addDays(d, amount * 365);
-      return d;
-    },
-    dateBetween: (start: Date | string, end: Date | string, unit: 'days' | 'months' | 'years' = 'days') => {
-      if (!start || !end) return 0;
-      const d1 = typeof start === 'string' ? parseISO(start) : start;
-      const d2 = typeof end === 'string' ? parseISO(end) : end;
-      if (!isValid(d1) || !isValid(d2)) return 0;
-
-      if (unit === 'days') return differenceInDays(d2, d1);
-      if (unit === 'months') return differenceInMonths(d2, d1);
-      if (unit === 'years') return differenceInYears(d2, d1);
-      return 0;
-    },
-    formatDate: (date: Date | string, formatStr: string = 'yyyy-MM-dd') => {
-      if (!date) return '';
-      const d = typeof date === 'string' ? parseISO(date) : date;
-      if (!isValid(d)) return '';
-      return format(d, formatStr);
-    },
-
-    // Logic
-    if: <T>(condition: unknown, trueValue: T, falseValue: T): T =>
-      condition ? trueValue : falseValue,
-    and: (...args: unknown[]) => args.every(Boolean),
-    or: (...args: unknown[]) => args.some(Boolean),
-    not: (value: unknown) => !value,
-    empty: (value: unknown) =>
-      value === null || value === undefined || value === '' ||
-      (Array.isArray(value) && value.length === 0),
-
-    // Comparison
-    equal: (a: unknown, b: unknown) => a == b,
-    unequal: (a: unknown, b: unknown) => a != b,
-    larger: (a: number, b: number) => Number(a) > Number(b),
-    largerEq: (a: number, b: number) => Number(a) >= Number(b),
-    smaller: (a: number, b: number) => Number(a) < Number(b),
-    smallerEq: (a: number, b: number) => Number(a) <= Number(b),
-
-    // Constants
-    pi: Math.PI,
-    e: Math.E,
-  };
-}
-
-/**
- * Safely evaluate an expression with given context using mathjs
- */
-function evaluateExpression(expression: string, context: any): PropertyValue {
-  try {
-    // Input validation
-    if (!expression || typeof expression !== 'string') {
-      throw new Error('Invalid expression: must be a non-empty string');
-    }
+ * Functions and constants available to every formula.
+ * Built once at module load and shared by all rows.
+ */
+const FORMULA_FUNCTIONS = new Map<string, unknown>(Object.entries({
+  // Math functions
+  sum: (...args: number[]) => args.reduce((a, b) => Number(a) + Number(b), 0),
+  avg: (...args: number[]) => {
+    if (args.length === 0) return 0;
+    return args.reduce((a, b) => Number(a) + Number(b), 0) / args.length;
+  },
+  min: (...args: number[]) => Math.min(...args.map(Number)),
+  max: (...args: number[]) => Math.max(...args.map(Number)),
+  round: (num: number, decimals: number = 0) => {
+    if (typeof num !== 'number') return 0;
+    const factor = Math.pow(10, decimals);
+    return Math.round(num * factor) / factor;
+  },
+  ceil: (num: number) => Math.ceil(Number(num)),
+  floor: (num: number) => Math.floor(Number(num)),
+  abs: (num: number) => Math.abs(Number(num)),
+  sqrt: (num: number) => Math.sqrt(Number(num)),
+  pow: (base: number, exp: number) => Math.pow(Number(base), Number(exp)),
+
+  // Text functions
+  concat: (...args: unknown[]) => args.map(String).join(''),
+  length: (str: unknown) => String(str || '').length,
+  upper: (str: string) => String(str || '').toUpperCase(),
+  lower: (str: string) => String(str || '').toLowerCase(),
+  replace: (str: string, search: string, replacement: string) =>
+    String(str || '').replace(new RegExp(search, 'g'), replacement),
+  contains: (str: string, search: string) =>
+    String(str || '').includes(search),
+  slice: (str: string, start: number, end?: number) =>
+    String(str || '').slice(start, end),
+
+  // Date functions
+  now: () => new Date(),
+  today: () => {
+    const d = new Date();
+    d.setHours(0, 0, 0, 0);
+    return d;
+  },
+  dateAdd: (date: Date | string, amount: number, unit: 'days' | 'months' | 'years' = 'days') => {
+    if (!date) return new Date();
+    const d = typeof date === 'string' ? parseISO(date) : date;
+    if (!isValid(d)) return new Date();
+
+    if (unit === 'days') return addDays(d, amount);
+    if (unit === 'months') return addDays(d, amount * 30);
+    if (unit === 'years') return addDays(d, amount * 365);
+    return d;
+  },
+  dateBetween: (start: Date | string, end: Date | string, unit: 'days' | 'months' | 'years' = 'days') => {
+    if (!start || !end) return 0;
+    const d1 = typeof start === 'string' ? parseISO(start) : start;
+    const d2 = typeof end === 'string' ? parseISO(end) : end;
+    if (!isValid(d1) || !isValid(d2)) return 0;
+
+    if (unit === 'days') return differenceInDays(d2, d1);
+    if (unit === 'months') return differenceInMonths(d2, d1);
+    if (unit === 'years') return differenceInYears(d2, d1);
+    return 0;
+  },
+  formatDate: (date: Date | string, formatStr: string = 'yyyy-MM-dd') => {
+    if (!date) return '';
+    const d = typeof date === 'string' ? parseISO(date) : date;
+    if (!isValid(d)) return '';
+    return format(d, formatStr);
+  },
+
+  // Logic
+  if: <T>(condition: unknown, trueValue: T, falseValue: T): T =>
+    condition ? trueValue : falseValue,
+  and: (...args: unknown[]) => args.every(Boolean),
+  or: (...args: unknown[]) => args.some(Boolean),
+  not: (value: unknown) => !value,
+  empty: (value: unknown) =>
+    value === null || value === undefined || value === '' ||
+    (Array.isArray(value) && value.length === 0),
+
+  // Comparison
+  equal: (a: unknown, b: unknown) => a == b,
+  unequal: (a: unknown, b: unknown) => a != b,
+  larger: (a: number, b: number) => Number(a) > Number(b),
+  largerEq: (a: number, b: number) => Number(a) >= Number(b),
+  smaller: (a: number, b: number) => Number(a) < Number(b),
+  smallerEq: (a: number, b: number) => Number(a) <= Number(b),
+
+  // Constants
+  pi: Math.PI,
+  e: Math.E,
+}));
+
+/**
+ * Per-row evaluation scope (implements the Map interface mathjs accepts).
+ * `prop` reads from the row, everything else from the shared function table;
+ * assignments inside a formula stay local to the row until clear().
+ */
+class FormulaScope {
+  private locals = new Map<string, unknown>();
+  private prop: PropertyLookup;
 
-    // Use mathjs for safe evaluation instead of Function constructor
-    const scope = {
-      ...context,
-      // Ensure all context values are available in scope
+  constructor(lookup: PropertyLookup) {
+    this.prop = (name: string) => {
+      const value = lookup(name);
+      if (value === null || value === undefined) return 0;
+      return value;
     };
+  }
+
+  has(key: string): boolean {
+    return key === 'prop' || this.locals.has(key) || FORMULA_FUNCTIONS.has(key);
+  }
 
-    // mathjs.evaluate is safe and doesn't use eval()
-    const result = math.evaluate(expression, scope);
+  get(key: string): unknown {
+    if (key === 'prop') return this.prop;
+    if (this.locals.has(key)) return this.locals.get(key);
+    return FORMULA_FUNCTIONS.get(key);
+  }
+
+  set(key: string, value: unknown) {
+    this.locals.set(key, value);
+    return this;
+  }
+
+  delete(key: string): boolean {
+    return this.locals.delete(key);
+  }
+
+  clear() {
+    this.locals.clear();
+  }
+
+  keys() {
+    return new Set(['prop', ...FORMULA_FUNCTIONS.keys(), ...this.locals.keys()]).values();
+  }
+}
+
+/**
+ * Safely evaluate a compiled expression against a row scope
+ */
+function evaluateExpression(code: math.EvalFunction, scope: FormulaScope, expression: string): PropertyValue {
+  try {
+    // mathjs compiled expressions are safe and don't use eval()
+    const result = code.evaluate(scope);
 
     // Validate result
     if (result === Infinity || result === -Infinity) {
@@ -190,7 +593,7 @@ function evaluateExpression(expression: string, context: any): PropertyValue {
     console.error('Formula evaluation error:', {
       expression,
       error: errorMessage,
-      availableFunctions: Object.keys(context).slice(0, 10) // Show first 10 for debugging
+      availableFunctions: Array.from(FORMULA_FUNCTIONS.keys()).slice(0, 10) // Show first 10 for debugging
     });
     return null;
   }
@@ -0,0 +1,140 @@
+/**
+ * Group Index - Shared bucketing of database rows by property value
+ */
+
+import { format, startOfWeek } from 'date-fns';
+import { Page } from './workspace';
+
+export const NO_GROUP = '__none__';
+
+export type DateBucket = 'day' | 'week' | 'month';
+
+export interface GroupSpec {
+  propertyId: string;
+  // Bucket date values by day, week or month
+  dateBucket?: DateBucket;
+  // Bucket numeric values into bins of this width
+  binSize?: number;
+}
+
+export interface GroupedPages {
+  [key: string]: Page[];
+}
+
+/**
+ * Keys a value is filed under. Arrays (multi-select) fan out to one key per
+ * option; empty values go to NO_GROUP.
+ */
+export function groupKeys(value: any, spec: GroupSpec): string[] {
+  if (Array.isArray(value)) {
+    const keys = value.filter(item => item != null && item !== '').map(item => bucketKey(item, spec));
+    return keys.length ? Array.from(new Set(keys)) : [NO_GROUP];
+  }
+  if (value == null || value === '') return [NO_GROUP];
+  return [bucketKey(value, spec)];
+}
+
+function bucketKey(value: any, spec: GroupSpec): string {
+  if (spec.dateBucket) {
+    const date = value instanceof Date ? value : new Date(value);
+    if (isNaN(date.getTime())) return NO_GROUP;
+
+    switch (spec.dateBucket) {
+      case 'day':
+        return format(date, 'yyyy-MM-dd');
+      case 'week':
+        return format(startOfWeek(date), 'yyyy-MM-dd');
+      case 'month':
+        return format(date, 'yyyy-MM');
+    }
+  }
+
+  if (spec.binSize) {
+    const num = Number(value);
+    if (isNaN(num)) return NO_GROUP;
+    return String(Math.floor(num / spec.binSize) * spec.binSize);
+  }
+
+  return String(value);
+}
+
+/**
+ * Buckets for one grouping spec, maintained incrementally.
+ * Keys are only recomputed for pages whose object changed since the last
+ * sync; buckets keep the input order of the pages.
+ */
+export class GroupIndex {
+  // Page ID -> page and the keys it was filed under
+  private entries = new Map<string, { page: Page; keys: string[] }>();
+  private lastPages: Page[] | null = null;
+  private groups: GroupedPages = {};
+
+  constructor(readonly spec: GroupSpec) {}
+
+  /**
+   * Bring the index up to date and return the buckets.
+   * Calling again with the same array returns the cached buckets.
+   */
+  sync(pages: Page[]): GroupedPages {
+    if (pages === this.lastPages) return this.groups;
+
+    const groups: GroupedPages = {};
+    const seen = new Set<string>();
+
+    for (const page of pages) {
+      seen.add(page.id);
+      let entry = this.entries.get(page.id);
+      if (!entry || entry.page !== page) {
+        entry = { page, keys: groupKeys(page.propertyValues?.[this.spec.propertyId], this.spec) };
+        this.entries.set(page.id, entry);
+      }
+
+      for (const key of entry.keys) {
+        (groups[key] || (groups[key] = [])).push(page);
+      }
+    }
+
+    if (seen.size !== this.entries.size) {
+      for (const id of Array.from(this.entries.keys())) {
+        if (!seen.has(id)) this.entries.delete(id);
+      }
+    }
+
+    this.lastPages = pages;
+    this.groups = groups;
+    return groups;
+  }
+
+  /**
+   * Keys a page is currently filed under
+   */
+  keysOf(pageId: string): string[] {
+    return this.entries.get(pageId)?.keys || [];
+  }
+}
+
+// "databaseId:propertyId:bucket" -> index, shared by every view of a database
+const indexes = new Map<string, GroupIndex>();
+
+/**
+ * Shared group index for a database property, so views grouping the same
+ * rows by the same property reuse one set of buckets
+ */
+export function getGroupIndex(databaseId: string, spec: GroupSpec): GroupIndex {
+  const key = `${databaseId}:${spec.propertyId}:${spec.dateBucket || ''}:${spec.binSize || ''}`;
+  let index = indexes.get(key);
+  if (!index) {
+    index = new GroupIndex(spec);
+    indexes.set(key, index);
+  }
+  return index;
+}
+
+/**
+ * Drop the shared indexes of a database
+ */
+export function releaseGroupIndexes(databaseId: string) {
+  for (const key of Array.from(indexes.keys())) {
+    if (key.startsWith(`${databaseId}:`)) indexes.delete(key);
+  }
+}
@@ -0,0 +1,125 @@
+/**
+ * Listener Registry
+ * Reference-counted realtime subscriptions keyed by query, so every
+ * component rendering the same query shares one onSnapshot listener and one
+ * decoded result.
+ */
+
+import { metrics } from './metrics';
+import { Page, PageChange, subscribeToChildPages } from './workspace';
+
+// Keep an unused listener this long so remounts (scrolling, view switches) reuse it
+const IDLE_TIMEOUT = 30_000;
+
+type Start<T> = (emit: (value: T) => void) => () => void;
+
+interface Entry<T> {
+    subscribers: Set<(value: T) => void>;
+    stop: () => void;
+    value?: T;
+    hasValue: boolean;
+    idleTimer: ReturnType<typeof setTimeout> | null;
+}
+
+export interface ListenerStats {
+    // Open realtime listeners
+    active: number;
+    // Listeners with no subscribers waiting for idle teardown
+    idle: number;
+    // Components subscribed across all listeners
+    subscribers: number;
+    // Snapshots fanned out to subscribers since startup
+    deliveries: number;
+}
+
+class ListenerRegistry {
+    private entries = new Map<string, Entry<any>>();
+    private deliveries = 0;
+
+    /**
+     * Subscribe to a shared listener. `start` opens the underlying listener
+     * the first time `key` is used; later subscribers get the latest value
+     * immediately.
+     */
+    subscribe<T>(key: string, start: Start<T>, callback: (value: T) => void): () => void {
+        let entry = this.entries.get(key) as Entry<T> | undefined;
+
+        if (!entry) {
+            const created: Entry<T> = {
+                subscribers: new Set(),
+                stop: () => {},
+                hasValue: false,
+                idleTimer: null,
+            };
+            this.entries.set(key, created);
+            created.stop = start(value => {
+                created.value = value;
+                created.hasValue = true;
+                this.deliveries += created.subscribers.size;
+                created.subscribers.forEach(subscriber => subscriber(value));
+            });
+            entry = created;
+            this.recordActive();
+        } else if (entry.idleTimer) {
+            clearTimeout(entry.idleTimer);
+            entry.idleTimer = null;
+        }
+
+        entry.subscribers.add(callback);
+        if (entry.hasValue) callback(entry.value as T);
+
+        const current = entry;
+        return () => {
+            if (!current.subscribers.delete(callback) || current.subscribers.size > 0) return;
+
+            current.idleTimer = setTimeout(() => {
+                current.stop();
+                if (this.entries.get(key) === current) this.entries.delete(key);
+                this.recordActive();
+            }, IDLE_TIMEOUT);
+        };
+    }
+
+    /**
+     * Current listener counts
+     */
+    getStats(): ListenerStats {
+        let idle = 0;
+        let subscribers = 0;
+        this.entries.forEach(entry => {
+            if (entry.subscribers.size === 0) idle++;
+            subscribers += entry.subscribers.size;
+        });
+        return { active: this.entries.size, idle, subscribers, deliveries: this.deliveries };
+    }
+
+    private recordActive() {
+        metrics.record('active-listeners', this.entries.size);
+    }
+}
+
+export const listenerRegistry = new ListenerRegistry();
+
+export interface ChildPagesSnapshot {
+    pages: Page[];
+    changes: PageChange[];
+}
+
+/**
+ * Shared subscription to the child pages of a database
+ */
+export function subscribeToSharedChildPages(
+    parentId: string,
+    callback: (snapshot: ChildPagesSnapshot) => void
+): () => void {
+    return listenerRegistry.subscribe<ChildPagesSnapshot>(
+        `child-pages:${parentId}`,
+        emit => subscribeToChildPages(parentId, (pages, changes) => emit({ pages, changes })),
+        callback
+    );
+}
+
+// Debug helper in development
+if (typeof window !== 'undefined' && process.env.NODE_ENV === 'development') {
+    (window as any).__listeners__ = listenerRegistry;
+}
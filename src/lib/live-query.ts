@@ -0,0 +1,152 @@
+/**
+ * Live Query - Incrementally maintained filter + sort results for database views
+ */
+
+import { Page, PageChange } from './workspace';
+import { PagePredicate } from './filter-engine';
+import { Sort, applySorts, comparePages } from './sort-engine';
+
+/**
+ * Holds the filtered, sorted rows of a database view and applies per-row
+ * changes: only the changed row is re-tested and it is moved with a binary
+ * search instead of re-sorting everything.
+ * Create a new instance whenever the filters or sorts change.
+ */
+export class LiveQuery {
+  // Every page seen, matching or not
+  private source = new Map<string, Page>();
+  private rows: Page[] = [];
+  private snapshot: Page[] = [];
+  private initialized = false;
+
+  // Position of the last removed row, so unsorted edits keep their place
+  private removedAt = -1;
+
+  constructor(private predicate: PagePredicate, private sorts: Sort[]) {}
+
+  /**
+   * Bring the results up to date with a full page list.
+   * Pages are diffed by reference, so unchanged rows must keep their identity
+   * (as subscribeToChildPages does); only rows whose object changed are
+   * re-evaluated.
+   */
+  sync(pages: Page[]): Page[] {
+    if (!this.initialized) return this.reset(pages);
+
+    const changes: PageChange[] = [];
+    const seen = new Set<string>();
+
+    for (const page of pages) {
+      seen.add(page.id);
+      const previous = this.source.get(page.id);
+      if (previous !== page) {
+        changes.push({ type: previous ? 'modified' : 'added', page });
+      }
+    }
+
+    this.source.forEach((page, id) => {
+      if (!seen.has(id)) changes.push({ type: 'removed', page });
+    });
+
+    // Large batches (e.g. the first page of a bulk import) are cheaper to rebuild
+    if (changes.length > pages.length / 4) return this.reset(pages);
+
+    return this.applyChanges(changes);
+  }
+
+  /**
+   * Apply snapshot deltas and return the current results
+   */
+  applyChanges(changes: PageChange[]): Page[] {
+    if (changes.length === 0) return this.snapshot;
+
+    for (const change of changes) {
+      const previous = this.source.get(change.page.id);
+      if (previous) this.removeRow(previous);
+
+      if (change.type === 'removed') {
+        this.source.delete(change.page.id);
+        continue;
+      }
+
+      this.source.set(change.page.id, change.page);
+      if (this.predicate(change.page)) this.insertRow(change.page, previous);
+    }
+
+    this.snapshot = this.rows.slice();
+    return this.snapshot;
+  }
+
+  /**
+   * Rebuild from scratch
+   */
+  reset(pages: Page[]): Page[] {
+    this.source = new Map(pages.map(page => [page.id, page]));
+    this.rows = applySorts(pages.filter(this.predicate), this.sorts).slice();
+    this.snapshot = this.rows.slice();
+    this.initialized = true;
+    return this.snapshot;
+  }
+
+  private removeRow(page: Page) {
+    let index: number;
+
+    if (this.sorts.length === 0) {
+      index = this.rows.indexOf(page);
+    } else {
+      // The row sits somewhere in the run of rows that compare equal to it
+      index = -1;
+      for (let i = this.lowerBound(page); i < this.rows.length; i++) {
+        if (this.rows[i] === page) {
+          index = i;
+          break;
+        }
+        if (comparePages(this.rows[i], page, this.sorts) !== 0) break;
+      }
+    }
+
+    if (index !== -1) this.rows.splice(index, 1);
+    this.removedAt = index;
+  }
+
+  private insertRow(page: Page, previous: Page | undefined) {
+    if (this.sorts.length === 0) {
+      if (previous && this.removedAt !== -1) {
+        this.rows.splice(this.removedAt, 0, page);
+      } else {
+        this.rows.push(page);
+      }
+      return;
+    }
+
+    this.rows.splice(this.upperBound(page), 0, page);
+  }
+
+  /**
+   * First index whose row does not sort before `page`
+   */
+  private lowerBound(page: Page): number {
+    let lo = 0;
+    let hi = this.rows.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (comparePages(this.rows[mid], page, this.sorts) < 0) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  /**
+   * First index whose row sorts after `page`
+   */
+  private upperBound(page: Page): number {
+    let lo = 0;
+    let hi = this.rows.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (comparePages(this.rows[mid], page, this.sorts) <= 0) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+}
@@ -11,6 +11,7 @@ interface Metric {
 
 class PerformanceMetrics {
     private metrics: Metric[] = [];
+    private counters: Map<string, number> = new Map();
     private observers: Map<string, PerformanceObserver> = new Map();
 
     constructor() {
@@ -61,6 +62,21 @@ class PerformanceMetrics {
         this.checkThreshold(metric);
     }
 
+    /**
+     * Increment a counter (cache hits, retries, ...); unlike record() this
+     * does not use a slot in the sample buffer
+     */
+    increment(name: string, by: number = 1) {
+        this.counters.set(name, (this.counters.get(name) || 0) + by);
+    }
+
+    /**
+     * Current value of a counter
+     */
+    getCounter(name: string): number {
+        return this.counters.get(name) || 0;
+    }
+
     /**
      * Measure time between two marks
      */
@@ -111,6 +127,13 @@ class PerformanceMetrics {
         return [...this.metrics];
     }
 
+    /**
+     * Get all counters for debugging
+     */
+    getCounters(): Record<string, number> {
+        return Object.fromEntries(this.counters);
+    }
+
     /**
      * Check if metric exceeds threshold and warn
      */
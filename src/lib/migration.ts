@@ -4,11 +4,12 @@
  */
 
 import { db } from './firebase';
-import { collection, doc, getDoc, getDocs, query, where, setDoc, updateDoc } from 'firebase/firestore';
+import { collection, doc, getDoc, getDocs, query, where, setDoc, updateDoc, writeBatch } from 'firebase/firestore';
 import { Editor } from '@tiptap/core';
 import StarterKit from '@tiptap/starter-kit';
 import { Block, createBlock, JSONContent } from './block-model';
 import { tiptapDocToBlocks } from './block-tiptap-bridge';
+import { getPageBody } from './workspace';
 
 /**
  * Check if a page has been migrated
@@ -161,8 +162,7 @@ export async function migratePage(pageId: string, userId: string): Promise<{
             };
         }
 
-        const pageData = pageDoc.data();
-        const htmlContent = pageData.content || '';
+        const htmlContent = await getPageBody(pageId);
 
         // Convert HTML to blocks
         const blocks = htmlToBlocks(htmlContent, pageId, userId);
@@ -303,3 +303,48 @@ export async function getWorkspaceMigrationStatus(workspaceId: string): Promise<
         percentComplete: totalCount > 0 ? Math.round((migratedCount / totalCount) * 100) : 100,
     };
 }
+
+// One write per page; Firestore batches are capped at 500
+const CHILD_COUNT_BATCH_SIZE = 400;
+
+/**
+ * Store each page's number of child pages (childCount) so the sidebar can
+ * tell which pages have children without loading them. Safe to re-run:
+ * every count is recomputed from the workspace's pages.
+ */
+export async function countChildPages(
+    workspaceId: string
+): Promise<{
+    success: boolean;
+    totalPages: number;
+    updatedPages: number;
+}> {
+    const results = { success: true, totalPages: 0, updatedPages: 0 };
+
+    try {
+        const snapshot = await getDocs(query(collection(db, 'pages'), where('workspaceId', '==', workspaceId)));
+        results.totalPages = snapshot.size;
+
+        const counts = new Map<string, number>();
+        snapshot.docs.forEach(pageDoc => {
+            const parentId = pageDoc.data().parentId;
+            if (parentId) counts.set(parentId, (counts.get(parentId) || 0) + 1);
+        });
+
+        const stale = snapshot.docs.filter(pageDoc => pageDoc.data().childCount !== (counts.get(pageDoc.id) || 0));
+
+        for (let i = 0; i < stale.length; i += CHILD_COUNT_BATCH_SIZE) {
+            const batch = writeBatch(db);
+            stale.slice(i, i + CHILD_COUNT_BATCH_SIZE).forEach(pageDoc => {
+                batch.update(pageDoc.ref, { childCount: counts.get(pageDoc.id) || 0 });
+            });
+            await batch.commit();
+            results.updatedPages += Math.min(CHILD_COUNT_BATCH_SIZE, stale.length - i);
+        }
+    } catch (error) {
+        console.error('Child page count failed:', error);
+        results.success = false;
+    }
+
+    return results;
+}
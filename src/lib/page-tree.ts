@@ -0,0 +1,197 @@
+/**
+ * Page Tree
+ * Normalized workspace page hierarchy for the sidebar: page metadata by ID,
+ * sorted child lists per parent and cached visible rows, updated from
+ * snapshot deltas instead of rebuilt from the flat page list.
+ * Levels are loaded lazily; until a parent's children are loaded, its
+ * childCount says whether it has any.
+ */
+
+import { Page, PageChange, PageMeta, toPageMeta } from './workspace';
+
+export interface TreeRow {
+    page: PageMeta;
+    depth: number;
+    // From the loaded children, or the page's childCount before they load
+    hasChildren: boolean;
+    isExpanded: boolean;
+}
+
+// Child-list key for top-level pages
+const ROOT = '__root__';
+
+function orderKey(page: PageMeta): number {
+    return page.order ?? (page.createdAt?.toMillis ? page.createdAt.toMillis() : 0);
+}
+
+export class PageTree {
+    private pages = new Map<string, PageMeta>();
+    // Parent ID -> child pages sorted by order (trashed pages excluded)
+    private children = new Map<string, PageMeta[]>();
+    // Parents whose children have been loaded (ROOT for the top level)
+    private loaded = new Set<string>();
+
+    // Bumped on every change; caches below are keyed on it
+    version = 0;
+    private sortedPages: PageMeta[] | null = null;
+    private rowCache = new Map<string, { version: number; expanded: Record<string, boolean>; rows: TreeRow[] }>();
+
+    /**
+     * Apply snapshot deltas; each change touches only its parent's child list.
+     * Several queries (one per loaded level) feed the same tree, so a removal
+     * from the query for `parentId` only applies while the page is still
+     * under that parent (a move may have been delivered by the other query).
+     */
+    applyChanges(changes: PageChange[], parentId?: string | null) {
+        if (changes.length === 0) return;
+
+        for (const change of changes) {
+            const previous = this.pages.get(change.page.id);
+            if (change.type === 'removed') {
+                if (previous && (parentId === undefined || (previous.parentId ?? null) === parentId)) {
+                    this.remove(previous);
+                }
+                continue;
+            }
+            if (previous) this.remove(previous);
+            this.insert(toPageMeta(change.page));
+        }
+        this.touch();
+    }
+
+    /**
+     * Replace the children of a parent with a freshly fetched list
+     */
+    setChildren(parentId: string | null, pages: Page[]) {
+        const parentKey = parentId ?? ROOT;
+        const fresh = new Set(pages.map(page => page.id));
+
+        this.pages.forEach(page => {
+            if ((page.parentId ?? ROOT) === parentKey && !fresh.has(page.id)) this.remove(page);
+        });
+        pages.forEach(page => {
+            const previous = this.pages.get(page.id);
+            if (previous) this.remove(previous);
+            this.insert(toPageMeta(page));
+        });
+
+        this.loaded.add(parentKey);
+        this.touch();
+    }
+
+    /**
+     * Mark a level as loaded (e.g. once its live query delivered a snapshot)
+     */
+    markLoaded(parentId: string | null) {
+        const parentKey = parentId ?? ROOT;
+        if (this.loaded.has(parentKey)) return;
+        this.loaded.add(parentKey);
+        this.touch();
+    }
+
+    /**
+     * Forget that a level is loaded (its listener was released). Its pages
+     * stay for an instant redisplay; hasChildren falls back to childCount.
+     */
+    markUnloaded(parentId: string) {
+        if (!this.loaded.delete(parentId)) return;
+        this.touch();
+    }
+
+    isLoaded(parentId: string | null): boolean {
+        return this.loaded.has(parentId ?? ROOT);
+    }
+
+    get(id: string): PageMeta | undefined {
+        return this.pages.get(id);
+    }
+
+    /**
+     * All loaded pages (including trashed), sorted by order
+     */
+    getPages(): PageMeta[] {
+        if (!this.sortedPages) {
+            this.sortedPages = Array.from(this.pages.values()).sort((a, b) => orderKey(a) - orderKey(b));
+        }
+        return this.sortedPages;
+    }
+
+    /**
+     * Non-trashed children of a page (or of the root for null), sorted by order
+     */
+    getChildren(parentId: string | null): PageMeta[] {
+        return this.children.get(parentId ?? ROOT) || [];
+    }
+
+    /**
+     * Rows currently visible for a sidebar section: a depth-first walk into
+     * expanded pages. Cached until the tree or `expanded` changes.
+     */
+    getVisibleRows(section: PageMeta['section'], expanded: Record<string, boolean>): TreeRow[] {
+        const key = section || '';
+        const cached = this.rowCache.get(key);
+        if (cached && cached.version === this.version && cached.expanded === expanded) {
+            return cached.rows;
+        }
+
+        const rows: TreeRow[] = [];
+        const visit = (parentId: string | null, depth: number) => {
+            for (const page of this.getChildren(parentId)) {
+                if (page.section !== section) continue;
+
+                const hasChildren = this.loaded.has(page.id)
+                    ? this.getChildren(page.id).some(child => child.section === section)
+                    // Pages from before childCount was kept may have children
+                    : page.childCount === undefined || page.childCount > 0;
+                const isExpanded = !!expanded[page.id];
+                rows.push({ page, depth, hasChildren, isExpanded });
+
+                if (hasChildren && isExpanded) visit(page.id, depth + 1);
+            }
+        };
+        visit(null, 0);
+
+        this.rowCache.set(key, { version: this.version, expanded, rows });
+        return rows;
+    }
+
+    private insert(page: PageMeta) {
+        this.pages.set(page.id, page);
+        if (page.inTrash) return;
+
+        const parentKey = page.parentId ?? ROOT;
+        let siblings = this.children.get(parentKey);
+        if (!siblings) {
+            siblings = [];
+            this.children.set(parentKey, siblings);
+        }
+
+        // Binary insert after siblings with the same order
+        const key = orderKey(page);
+        let lo = 0;
+        let hi = siblings.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (orderKey(siblings[mid]) <= key) lo = mid + 1;
+            else hi = mid;
+        }
+        siblings.splice(lo, 0, page);
+    }
+
+    private remove(page: PageMeta) {
+        this.pages.delete(page.id);
+
+        const parentKey = page.parentId ?? ROOT;
+        const siblings = this.children.get(parentKey);
+        if (!siblings) return;
+
+        const index = siblings.indexOf(page);
+        if (index !== -1) siblings.splice(index, 1);
+        if (siblings.length === 0) this.children.delete(parentKey);
+    }
+
+    private touch() {
+        this.version++;
+        this.sortedPages = null;
+    }
+}
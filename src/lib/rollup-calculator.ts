@@ -2,9 +2,12 @@
  * Rollup Calculator - Automatic aggregations from related pages
  */
 
-import { Page } from './workspace';
+import { Page, PageChange } from './workspace';
+import { subscribeToSharedChildPages } from './listener-registry';
 import { db } from './firebase';
-import { doc, getDoc } from 'firebase/firestore';
+import { aggregate } from './aggregation';
+
+type Property = NonNullable<Page['properties']>[number];
 
 export type RollupFunction = 'count' | 'sum' | 'avg' | 'min' | 'max' | 'show_original';
 
@@ -38,74 +41,323 @@ export async function calculateRollup(
             return rollupProperty.rollupFunction === 'count' ? 0 : 0;
         }
 
-        // 3. Fetch related pages - OPTIMIZED: Batch fetch instead of N+1
-        // Split into chunks of 30 (Firestore 'in' query limit)
-        const relatedPages: Page[] = [];
+        // 3. Fetch related pages, reusing any that a live rollup listener already holds
+        const relatedPages = await fetchRelatedPages(relatedPageIds);
 
-        for (let i = 0; i < relatedPageIds.length; i += 30) {
-            const chunk = relatedPageIds.slice(i, i + 30);
+        // 4-5. Aggregate the rollup property
+        return computeRollup(relatedPages, rollupProperty);
+    } catch (error) {
+        console.error('Rollup calculation error:', error);
+        return 0;
+    }
+}
 
-            try {
-                const { collection, query, where, getDocs, documentId } = await import('firebase/firestore');
-                const q = query(
-                    collection(db, 'pages'),
-                    where(documentId(), 'in', chunk)
-                );
+/**
+ * Aggregate a rollup over already-loaded related pages
+ */
+export function computeRollup(relatedPages: Page[], rollupProperty: RollupProperty): number | string {
+    if (relatedPages.length === 0) {
+        return 0;
+    }
 
-                const snapshot = await getDocs(q);
-                snapshot.docs.forEach(doc => {
-                    relatedPages.push({ id: doc.id, ...doc.data() } as Page);
-                });
-            } catch (e) {
-                console.error(`Failed to fetch page chunk:`, e);
-            }
+    // Extract values from the rollup property
+    const values = relatedPages
+        .map(p => p.propertyValues?.[rollupProperty.rollupProperty])
+        .filter(v => v != null && v !== '')
+        .map(v => {
+            // Convert to number for numeric operations
+            const num = Number(v);
+            return isNaN(num) ? 0 : num;
+        });
+
+    // Apply aggregation function
+    const stats = aggregate(values);
+
+    switch (rollupProperty.rollupFunction) {
+        case 'count':
+            return relatedPages.length;
+
+        case 'sum':
+            return stats.sum;
+
+        case 'avg':
+            return stats.avg !== null ? Math.round(stats.avg * 100) / 100 : 0;
+
+        case 'max':
+            return stats.max ?? 0;
+
+        case 'min':
+            return stats.min ?? 0;
+
+        case 'show_original':
+            // Show first value or count
+            return values[0] || relatedPages.length;
+
+        default:
+            return 0;
+    }
+}
+
+/**
+ * Fetch pages by ID, serving any already held by a related-database listener
+ */
+async function fetchRelatedPages(ids: string[]): Promise<Page[]> {
+    const found: Page[] = [];
+    const missing: string[] = [];
+
+    ids.forEach(id => {
+        const cached = findRelatedPage(id);
+        if (cached) found.push(cached);
+        else missing.push(id);
+    });
+
+    // Split into chunks of 30 (Firestore 'in' query limit)
+    for (let i = 0; i < missing.length; i += 30) {
+        const chunk = missing.slice(i, i + 30);
+
+        try {
+            const { collection, query, where, getDocs, documentId } = await import('firebase/firestore');
+            const q = query(
+                collection(db, 'pages'),
+                where(documentId(), 'in', chunk)
+            );
+
+            const snapshot = await getDocs(q);
+            snapshot.docs.forEach(doc => {
+                found.push({ id: doc.id, ...doc.data() } as Page);
+            });
+        } catch (e) {
+            console.error(`Failed to fetch page chunk:`, e);
         }
+    }
+
+    return found;
+}
 
-        const validPages = relatedPages.filter((p): p is Page => p !== null);
+// --- Shared related-page cache ---
 
-        if (validPages.length === 0) {
-            return rollupProperty.rollupFunction === 'count' ? 0 : 0;
+interface RelatedChange {
+    page: Page;
+    previous?: Page;
+    removed: boolean;
+}
+
+/**
+ * Live pages of one related database, shared by every rollup pointing at it
+ * through the shared child-pages listener
+ */
+class RelatedDatabase {
+    readonly pages = new Map<string, Page>();
+    loaded = false;
+
+    private listeners = new Set<(changes: RelatedChange[]) => void>();
+    private unsubscribe: (() => void) | null = null;
+
+    constructor(readonly databaseId: string) {}
+
+    subscribe(listener: (changes: RelatedChange[]) => void): () => void {
+        this.listeners.add(listener);
+
+        if (!this.unsubscribe) {
+            this.unsubscribe = subscribeToSharedChildPages(this.databaseId, ({ pages, changes }) => {
+                // A listener that was already open replays its latest snapshot
+                if (!this.loaded) {
+                    changes = pages.map((page): PageChange => ({ type: 'added', page }));
+                }
+
+                const related = changes.map(change => {
+                    const previous = this.pages.get(change.page.id);
+                    const removed = change.type === 'removed';
+                    if (removed) this.pages.delete(change.page.id);
+                    else this.pages.set(change.page.id, change.page);
+                    return { page: change.page, previous, removed };
+                });
+                this.loaded = true;
+                this.listeners.forEach(l => l(related));
+            });
         }
 
-        // 4. Extract values from the rollup property
-        const values = validPages
-            .map(p => p.propertyValues?.[rollupProperty.rollupProperty])
-            .filter(v => v != null && v !== '')
-            .map(v => {
-                // Convert to number for numeric operations
-                const num = Number(v);
-                return isNaN(num) ? 0 : num;
+        return () => {
+            this.listeners.delete(listener);
+            if (this.listeners.size === 0) {
+                this.unsubscribe?.();
+                relatedDatabases.delete(this.databaseId);
+            }
+        };
+    }
+}
+
+const relatedDatabases = new Map<string, RelatedDatabase>();
+
+function getRelatedDatabase(databaseId: string): RelatedDatabase {
+    let related = relatedDatabases.get(databaseId);
+    if (!related) {
+        related = new RelatedDatabase(databaseId);
+        relatedDatabases.set(databaseId, related);
+    }
+    return related;
+}
+
+function findRelatedPage(id: string): Page | undefined {
+    for (const related of Array.from(relatedDatabases.values())) {
+        const page = related.pages.get(id);
+        if (page) return page;
+    }
+    return undefined;
+}
+
+// --- Materialized rollups ---
+
+export type RollupValues = Record<string, number | string>;
+
+/**
+ * Materialized rollup values for the rows of one database.
+ * Keeps a reverse index from related page to the rows referencing it, so a
+ * related-page change only recomputes rows whose aggregated property
+ * actually changed.
+ */
+export class RollupMaterializer {
+    private rollups: (Property & RollupProperty)[];
+    // Relation property ID -> target database ID
+    private relationTargets = new Map<string, string>();
+    // Target database ID -> property IDs aggregated from it
+    private aggregatedProperties = new Map<string, Set<string>>();
+
+    private rows = new Map<string, Page>();
+    // Row ID -> relation property ID -> related page IDs
+    private forward = new Map<string, Map<string, string[]>>();
+    // Related page ID -> IDs of the rows referencing it
+    private reverse = new Map<string, Set<string>>();
+    private values = new Map<string, RollupValues>();
+    private dirty = new Set<string>();
+
+    constructor(properties: Property[]) {
+        const byId = new Map(properties.map(prop => [prop.id, prop]));
+
+        this.rollups = properties.filter((prop): prop is Property & RollupProperty => {
+            if (prop.type !== 'rollup' || !prop.rollupRelation || !prop.rollupProperty || !prop.rollupFunction) return false;
+            const target = byId.get(prop.rollupRelation)?.relationTo;
+            if (!target) return false;
+
+            this.relationTargets.set(prop.rollupRelation, target);
+            if (!this.aggregatedProperties.has(target)) this.aggregatedProperties.set(target, new Set());
+            this.aggregatedProperties.get(target)!.add(prop.rollupProperty);
+            return true;
+        });
+    }
+
+    get hasRollups(): boolean {
+        return this.rollups.length > 0;
+    }
+
+    /**
+     * Listen to every related database; `onChange` fires when some
+     * materialized value became stale
+     */
+    connect(onChange: () => void): () => void {
+        const unsubscribers = Array.from(this.aggregatedProperties.keys()).map(databaseId => {
+            const related = getRelatedDatabase(databaseId);
+            if (related.loaded) this.rows.forEach((_, id) => this.dirty.add(id));
+
+            return related.subscribe(changes => {
+                const aggregated = this.aggregatedProperties.get(databaseId)!;
+                let stale = false;
+
+                changes.forEach(({ page, previous, removed }) => {
+                    const referencing = this.reverse.get(page.id);
+                    if (!referencing) return;
+
+                    const changed = removed || !previous ||
+                        Array.from(aggregated).some(id => previous.propertyValues?.[id] !== page.propertyValues?.[id]);
+                    if (!changed) return;
+
+                    referencing.forEach(rowId => this.dirty.add(rowId));
+                    stale = true;
+                });
+
+                if (stale) onChange();
             });
+        });
+
+        return () => unsubscribers.forEach(unsubscribe => unsubscribe());
+    }
+
+    /**
+     * Sync with the current rows and return rollup values per row ID.
+     * Rows are diffed by reference; values are only recomputed for rows whose
+     * relations changed or whose related pages changed.
+     */
+    update(pages: Page[]): Map<string, RollupValues> {
+        const seen = new Set<string>();
 
-        // 5. Apply aggregation function
-        switch (rollupProperty.rollupFunction) {
-            case 'count':
-                return validPages.length;
+        for (const page of pages) {
+            seen.add(page.id);
+            if (this.rows.get(page.id) === page) continue;
 
-            case 'sum':
-                return values.reduce((a, b) => a + b, 0);
+            this.rows.set(page.id, page);
+            this.indexRelations(page);
+            this.dirty.add(page.id);
+        }
+
+        for (const id of Array.from(this.rows.keys())) {
+            if (seen.has(id)) continue;
+            this.rows.delete(id);
+            this.unindexRelations(id);
+            this.values.delete(id);
+            this.dirty.delete(id);
+        }
 
-            case 'avg':
-                return values.length > 0
-                    ? Math.round((values.reduce((a, b) => a + b, 0) / values.length) * 100) / 100
-                    : 0;
+        this.dirty.forEach(id => this.materialize(id));
+        this.dirty.clear();
 
-            case 'max':
-                return values.length > 0 ? Math.max(...values) : 0;
+        return this.values;
+    }
 
-            case 'min':
-                return values.length > 0 ? Math.min(...values) : 0;
+    private materialize(rowId: string) {
+        const relations = this.forward.get(rowId);
+        const values: RollupValues = {};
 
-            case 'show_original':
-                // Show first value or count
-                return values[0] || validPages.length;
+        for (const rollup of this.rollups) {
+            const related = relatedDatabases.get(this.relationTargets.get(rollup.rollupRelation)!);
+            if (!related?.loaded) continue;
 
-            default:
-                return 0;
+            const relatedPages: Page[] = [];
+            (relations?.get(rollup.rollupRelation) || []).forEach(id => {
+                const page = related.pages.get(id);
+                if (page) relatedPages.push(page);
+            });
+            values[rollup.id] = computeRollup(relatedPages, rollup);
         }
-    } catch (error) {
-        console.error('Rollup calculation error:', error);
-        return 0;
+
+        this.values.set(rowId, values);
+    }
+
+    private indexRelations(page: Page) {
+        this.unindexRelations(page.id);
+
+        const relations = new Map<string, string[]>();
+        this.relationTargets.forEach((_, relationId) => {
+            const ids = page.propertyValues?.[relationId];
+            if (!Array.isArray(ids)) return;
+
+            relations.set(relationId, ids);
+            ids.forEach(id => {
+                if (!this.reverse.has(id)) this.reverse.set(id, new Set());
+                this.reverse.get(id)!.add(page.id);
+            });
+        });
+        this.forward.set(page.id, relations);
+    }
+
+    private unindexRelations(rowId: string) {
+        this.forward.get(rowId)?.forEach(ids => {
+            ids.forEach(id => {
+                const referencing = this.reverse.get(id);
+                referencing?.delete(rowId);
+                if (referencing?.size === 0) this.reverse.delete(id);
+            });
+        });
+        this.forward.delete(rowId);
     }
 }
 
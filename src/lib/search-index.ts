@@ -1,24 +1,77 @@
 /**
  * Client-Side Search Index
- * Fast in-memory search for blocks using inverted index
+ * Fast in-memory search for blocks using a positional inverted index with
+ * BM25 ranking, prefix and phrase queries, persisted to IndexedDB as one
+ * segment per page. The index runs in a Web Worker (see search-worker.ts);
+ * the main thread talks to it through the async `searchIndex` client.
  */
 
 import { Block } from './block-model';
+import type { BlockChange } from './block-operations';
 
-interface SearchResult {
+const DB_NAME = 'note-web-search';
+const DB_VERSION = 2;
+const SEGMENTS_STORE = 'segments';
+const PERSIST_DELAY = 1000; // Batch segment writes while typing
+
+// BM25 parameters
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+
+// Prefix matches (the word still being typed) rank below exact matches
+const PREFIX_WEIGHT = 0.5;
+const MAX_PREFIX_EXPANSIONS = 50;
+
+/**
+ * Persisted index data for one page: each block's text and its token
+ * sequence, so loading a segment never has to re-tokenize
+ */
+interface IndexSegment {
+    pageId: string;
+    blocks: [blockId: string, plainText: string, tokens: string[]][];
+    savedAt: number;
+}
+
+export interface SearchResult {
     blockId: string;
     score: number;
     snippet: string;
     pageId: string;
 }
 
-class ClientSearchIndex {
-    // Inverted index: word -> Set of block IDs
-    private index: Map<string, Set<string>> = new Map();
+export interface SearchIndexStats {
+    totalTokens: number;
+    totalBlocks: number;
+    averageTokensPerBlock: number;
+}
+
+export class ClientSearchIndex {
+    // Positional inverted index: word -> block ID -> token positions (ascending)
+    private index: Map<string, Map<string, number[]>> = new Map();
+
+    // Forward index: block ID -> its token sequence (makes removal O(tokens in block);
+    // the length is the block's BM25 document length)
+    private blockTokens: Map<string, string[]> = new Map();
+    private totalTokens = 0;
+
+    // Sorted term dictionary for prefix lookups, rebuilt lazily when the vocabulary changes
+    private sortedTerms: string[] | null = null;
 
     // Block metadata for result rendering
     private blocks: Map<string, { plainText: string; pageId: string }> = new Map();
 
+    // Page ID -> block IDs, for writing per-page segments
+    private pageBlocks: Map<string, Set<string>> = new Map();
+
+    // Pages whose segment has been loaded or indexed live this session
+    private loadedPages: Set<string> = new Set();
+
+    // Pages with changes not yet written to IndexedDB
+    private dirtyPages: Set<string> = new Set();
+    private persistTimer: ReturnType<typeof setTimeout> | null = null;
+    private db: IDBDatabase | null = null;
+    private dbPromise: Promise<IDBDatabase | null> | null = null;
+
     // Stop words to ignore
     private stopWords = new Set([
         'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
@@ -40,75 +93,144 @@ class ClientSearchIndex {
      * Index a single block
      */
     indexBlock(block: Block) {
-        const text = block.plainText || '';
+        this.indexText(block.id, block.page_id, block.plainText || '');
+    }
+
+    /**
+     * Index (or re-index) a block from its plain text
+     */
+    indexText(blockId: string, pageId: string, text: string) {
+        this.removeBlock(blockId);
         if (!text.trim()) return;
 
-        // Store block metadata
-        this.blocks.set(block.id, {
-            plainText: text,
-            pageId: block.page_id,
-        });
+        this.addEntry(blockId, pageId, text, this.tokenize(text));
+        this.loadedPages.add(pageId);
+        this.markDirty(pageId);
+    }
 
-        // Tokenize and index
-        const tokens = this.tokenize(text);
+    private addEntry(blockId: string, pageId: string, plainText: string, tokens: string[]) {
+        // Store block metadata
+        this.blocks.set(blockId, { plainText, pageId });
+        this.blockTokens.set(blockId, tokens);
+        this.totalTokens += tokens.length;
 
-        for (const token of tokens) {
-            if (!this.index.has(token)) {
-                this.index.set(token, new Set());
-            }
-            this.index.get(token)!.add(block.id);
+        if (!this.pageBlocks.has(pageId)) {
+            this.pageBlocks.set(pageId, new Set());
         }
+        this.pageBlocks.get(pageId)!.add(blockId);
+
+        tokens.forEach((token, position) => {
+            let postings = this.index.get(token);
+            if (!postings) {
+                postings = new Map();
+                this.index.set(token, postings);
+                this.sortedTerms = null;
+            }
+            const positions = postings.get(blockId);
+            if (positions) {
+                positions.push(position);
+            } else {
+                postings.set(blockId, [position]);
+            }
+        });
     }
 
     /**
      * Remove block from index
      */
     removeBlock(blockId: string) {
+        const blockData = this.blocks.get(blockId);
+        if (!blockData) return;
+
         // Remove from metadata
         this.blocks.delete(blockId);
-
-        // Remove from inverted index
-        for (const [token, blockIds] of this.index.entries()) {
-            blockIds.delete(blockId);
-            if (blockIds.size === 0) {
+        this.pageBlocks.get(blockData.pageId)?.delete(blockId);
+
+        // Remove from inverted index, visiting only this block's tokens
+        const tokens = this.blockTokens.get(blockId) || [];
+        for (const token of new Set(tokens)) {
+            const postings = this.index.get(token);
+            if (!postings) continue;
+            postings.delete(blockId);
+            if (postings.size === 0) {
                 this.index.delete(token);
+                this.sortedTerms = null;
             }
         }
+        this.blockTokens.delete(blockId);
+        this.totalTokens -= tokens.length;
+
+        this.markDirty(blockData.pageId);
     }
 
     /**
      * Update block in index
      */
     updateBlock(block: Block) {
-        this.removeBlock(block.id);
         this.indexBlock(block);
     }
 
     /**
-     * Search for blocks matching query
+     * Apply a batch of block changes from subscribeToPageBlocks
+     */
+    applyChanges(changes: BlockChange[]) {
+        for (const change of changes) {
+            if (change.type === 'removed') {
+                this.removeBlock(change.block.id);
+            } else {
+                this.indexBlock(change.block);
+            }
+        }
+    }
+
+    /**
+     * Search for blocks matching query.
+     * Words are ranked with BM25; "quoted phrases" must appear verbatim;
+     * the last word matches as a prefix while it is still being typed.
      */
     search(query: string, limit: number = 10): SearchResult[] {
         if (!query.trim()) return [];
 
-        const tokens = this.tokenize(query);
-        if (tokens.length === 0) return [];
+        const { terms, phrases, prefix } = this.parseQuery(query);
+        if (terms.length === 0 && phrases.length === 0 && !prefix) return [];
 
-        // Count matches per block
         const blockScores = new Map<string, number>();
 
-        for (const token of tokens) {
-            const matchingBlocks = this.index.get(token);
-            if (!matchingBlocks) continue;
+        for (const term of terms) {
+            this.scoreTerm(term, 1, blockScores);
+        }
 
-            for (const blockId of matchingBlocks) {
-                blockScores.set(blockId, (blockScores.get(blockId) || 0) + 1);
+        if (prefix) {
+            for (const term of this.expandPrefix(prefix)) {
+                this.scoreTerm(term, term === prefix ? 1 : PREFIX_WEIGHT, blockScores);
             }
         }
 
-        // Sort by score and return results
-        const results = Array.from(blockScores.entries())
-            .sort((a, b) => b[1] - a[1])
-            .slice(0, limit)
+        // Phrases are required: keep only blocks containing every phrase
+        let candidates: Map<string, number> = blockScores;
+        if (phrases.length > 0) {
+            let matches: Set<string> | null = null;
+            for (const phrase of phrases) {
+                const phraseMatches = this.matchPhrase(phrase);
+                matches = matches
+                    ? new Set(Array.from(matches).filter(id => phraseMatches.has(id)))
+                    : phraseMatches;
+            }
+
+            candidates = new Map();
+            for (const blockId of matches!) {
+                candidates.set(blockId, blockScores.get(blockId) || 0);
+            }
+            for (const phrase of phrases) {
+                for (const term of new Set(phrase)) {
+                    this.scoreTerm(term, 1, candidates, true);
+                }
+            }
+        }
+
+        const tokens = [...terms, ...phrases.flat(), ...(prefix ? [prefix] : [])];
+
+        const results = selectTopK(candidates, limit)
             .map(([blockId, score]) => {
                 const blockData = this.blocks.get(blockId);
                 if (!blockData) return null;
@@ -125,6 +247,103 @@ class ClientSearchIndex {
         return results;
     }
 
+    /**
+     * Split a query into free terms, quoted phrases and a trailing prefix
+     */
+    private parseQuery(query: string) {
+        const phrases: string[][] = [];
+        const rest = query.replace(/"([^"]*)"/g, (_, phrase: string) => {
+            const tokens = this.tokenize(phrase);
+            if (tokens.length > 0) phrases.push(tokens);
+            return ' ';
+        });
+
+        const terms = this.tokenize(rest);
+
+        // The word under the cursor (no trailing space yet) matches as a
+        // prefix, unless tokenizing drops it (stop word, single letter):
+        // then the last remaining term is a finished word, not a prefix
+        let prefix: string | null = null;
+        const trailing = /[\w가-힣]+$/.exec(rest);
+        if (trailing && this.tokenize(trailing[0]).length > 0) {
+            prefix = terms.pop()!;
+        }
+
+        return { terms, phrases, prefix };
+    }
+
+    /**
+     * Add the BM25 contribution of one term to each block's score
+     * @param onlyExisting - Only score blocks already present in `scores`
+     */
+    private scoreTerm(term: string, weight: number, scores: Map<string, number>, onlyExisting = false) {
+        const postings = this.index.get(term);
+        if (!postings) return;
+
+        const totalBlocks = this.blocks.size;
+        const averageLength = this.totalTokens / totalBlocks || 1;
+        const idf = Math.log(1 + (totalBlocks - postings.size + 0.5) / (postings.size + 0.5));
+
+        for (const [blockId, positions] of postings) {
+            if (onlyExisting && !scores.has(blockId)) continue;
+
+            const tf = positions.length;
+            const length = this.blockTokens.get(blockId)!.length;
+            const score = idf * (tf * (BM25_K1 + 1)) /
+                (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / averageLength));
+
+            scores.set(blockId, (scores.get(blockId) || 0) + weight * score);
+        }
+    }
+
+    /**
+     * Terms in the dictionary starting with a prefix
+     */
+    private expandPrefix(prefix: string): string[] {
+        if (!this.sortedTerms) {
+            this.sortedTerms = Array.from(this.index.keys()).sort();
+        }
+        const terms = this.sortedTerms;
+
+        // Binary search for the first term >= prefix
+        let low = 0;
+        let high = terms.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (terms[mid] < prefix) low = mid + 1;
+            else high = mid;
+        }
+
+        const matches: string[] = [];
+        for (let i = low; i < terms.length && matches.length < MAX_PREFIX_EXPANSIONS; i++) {
+            if (!terms[i].startsWith(prefix)) break;
+            matches.push(terms[i]);
+        }
+        return matches;
+    }
+
+    /**
+     * Blocks where the phrase tokens appear at consecutive positions
+     */
+    private matchPhrase(phrase: string[]): Set<string> {
+        const matches = new Set<string>();
+        const postingLists = phrase.map(token => this.index.get(token));
+        if (postingLists.some(postings => !postings)) return matches;
+
+        const [first, ...rest] = postingLists as Map<string, number[]>[];
+        for (const [blockId, positions] of first) {
+            const restPositions = rest.map(postings => postings.get(blockId));
+            if (restPositions.some(p => !p)) continue;
+
+            const found = positions.some(start =>
+                restPositions.every((p, i) => hasPosition(p!, start + i + 1))
+            );
+            if (found) matches.add(blockId);
+        }
+
+        return matches;
+    }
+
     /**
      * Get text snippet with highlighted matches
      */
@@ -165,34 +384,496 @@ class ClientSearchIndex {
     }
 
     /**
-     * Clear entire index
+     * Clear entire index (in memory and persisted)
      */
     clear() {
         this.index.clear();
+        this.blockTokens.clear();
+        this.totalTokens = 0;
+        this.sortedTerms = null;
         this.blocks.clear();
+        this.pageBlocks.clear();
+        this.loadedPages.clear();
+        this.dirtyPages.clear();
+
+        this.openDB().then(db => {
+            db?.transaction([SEGMENTS_STORE], 'readwrite').objectStore(SEGMENTS_STORE).clear();
+        }).catch(error => {
+            console.error('Failed to clear search index:', error);
+        });
+    }
+
+    /**
+     * Load a page's persisted segment, unless the page is already in memory
+     */
+    async loadPage(pageId: string): Promise<void> {
+        if (this.loadedPages.has(pageId)) return;
+
+        const db = await this.openDB();
+        if (!db) return;
+
+        const segment = await new Promise<IndexSegment | undefined>((resolve, reject) => {
+            const request = db.transaction([SEGMENTS_STORE], 'readonly').objectStore(SEGMENTS_STORE).get(pageId);
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+
+        this.loadSegment(pageId, segment);
+    }
+
+    /**
+     * Load every persisted segment not already in memory
+     */
+    async loadAll(): Promise<void> {
+        const db = await this.openDB();
+        if (!db) return;
+
+        const segments = await new Promise<IndexSegment[]>((resolve, reject) => {
+            const request = db.transaction([SEGMENTS_STORE], 'readonly').objectStore(SEGMENTS_STORE).getAll();
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+
+        segments.forEach(segment => this.loadSegment(segment.pageId, segment));
+    }
+
+    private loadSegment(pageId: string, segment: IndexSegment | undefined) {
+        // Live updates that arrived while the read was in flight win
+        if (this.loadedPages.has(pageId)) return;
+        this.loadedPages.add(pageId);
+        if (!segment) return;
+
+        for (const [blockId, plainText, tokens] of segment.blocks) {
+            if (!this.blocks.has(blockId)) {
+                this.addEntry(blockId, pageId, plainText, tokens);
+            }
+        }
+    }
+
+    private markDirty(pageId: string) {
+        this.dirtyPages.add(pageId);
+        if (this.persistTimer) return;
+
+        this.persistTimer = setTimeout(() => {
+            this.persistTimer = null;
+            this.persist().catch(error => {
+                console.error('Failed to persist search index:', error);
+            });
+        }, PERSIST_DELAY);
+    }
+
+    /**
+     * Write the segments of all changed pages to IndexedDB
+     */
+    async persist(): Promise<void> {
+        if (this.dirtyPages.size === 0) return;
+
+        const db = await this.openDB();
+        if (!db) return;
+
+        const pageIds = Array.from(this.dirtyPages);
+        this.dirtyPages.clear();
+
+        // A failed write leaves its pages dirty for the next persist
+        const restoreDirty = () => pageIds.forEach(pageId => this.dirtyPages.add(pageId));
+
+        return new Promise<void>((resolve, reject) => {
+            const transaction = db.transaction([SEGMENTS_STORE], 'readwrite');
+            const store = transaction.objectStore(SEGMENTS_STORE);
+
+            for (const pageId of pageIds) {
+                const blockIds = this.pageBlocks.get(pageId);
+                if (!blockIds || blockIds.size === 0) {
+                    store.delete(pageId);
+                    continue;
+                }
+
+                const segment: IndexSegment = {
+                    pageId,
+                    blocks: Array.from(blockIds).map(blockId => [
+                        blockId,
+                        this.blocks.get(blockId)!.plainText,
+                        this.blockTokens.get(blockId)!,
+                    ]),
+                    savedAt: Date.now(),
+                };
+                store.put(segment);
+            }
+
+            transaction.oncomplete = () => resolve();
+            transaction.onerror = () => {
+                restoreDirty();
+                reject(transaction.error);
+            };
+            // Aborts without an error event too (e.g. quota, the database closing)
+            transaction.onabort = () => {
+                restoreDirty();
+                reject(transaction.error || new Error('Search index write aborted'));
+            };
+        }).catch(error => {
+            // Also covers db.transaction() throwing
+            restoreDirty();
+            throw error;
+        });
+    }
+
+    private openDB(): Promise<IDBDatabase | null> {
+        if (this.db) return Promise.resolve(this.db);
+        if (this.dbPromise) return this.dbPromise;
+
+        if (typeof indexedDB === 'undefined') {
+            return Promise.resolve(null);
+        }
+
+        this.dbPromise = new Promise((resolve, reject) => {
+            const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+            request.onerror = () => reject(request.error);
+            request.onsuccess = () => {
+                this.db = request.result;
+                resolve(this.db);
+            };
+
+            request.onupgradeneeded = (event) => {
+                const db = (event.target as IDBOpenDBRequest).result;
+                // v1 segments stored distinct tokens without positions; drop them
+                if (db.objectStoreNames.contains(SEGMENTS_STORE)) {
+                    db.deleteObjectStore(SEGMENTS_STORE);
+                }
+                db.createObjectStore(SEGMENTS_STORE, { keyPath: 'pageId' });
+            };
+        });
+
+        return this.dbPromise;
     }
 
     /**
      * Get index statistics
      */
-    getStats() {
+    getStats(): SearchIndexStats {
         return {
             totalTokens: this.index.size,
             totalBlocks: this.blocks.size,
             averageTokensPerBlock: this.blocks.size > 0
-                ? Array.from(this.blocks.values())
-                    .map(b => this.tokenize(b.plainText).length)
-                    .reduce((a, b) => a + b, 0) / this.blocks.size
+                ? this.totalTokens / this.blocks.size
                 : 0,
         };
     }
 }
 
+/**
+ * Binary search a sorted positions array
+ */
+function hasPosition(positions: number[], position: number): boolean {
+    let low = 0;
+    let high = positions.length - 1;
+    while (low <= high) {
+        const mid = (low + high) >>> 1;
+        if (positions[mid] === position) return true;
+        if (positions[mid] < position) low = mid + 1;
+        else high = mid - 1;
+    }
+    return false;
+}
+
+/**
+ * Highest-scoring k entries, using a bounded min-heap instead of sorting every candidate
+ */
+function selectTopK(scores: Map<string, number>, k: number): [string, number][] {
+    const heap: [string, number][] = [];
+    if (k <= 0) return heap;
+
+    const siftDown = (i: number) => {
+        while (true) {
+            const left = 2 * i + 1;
+            const right = left + 1;
+            let smallest = i;
+            if (left < heap.length && heap[left][1] < heap[smallest][1]) smallest = left;
+            if (right < heap.length && heap[right][1] < heap[smallest][1]) smallest = right;
+            if (smallest === i) return;
+            [heap[i], heap[smallest]] = [heap[smallest], heap[i]];
+            i = smallest;
+        }
+    };
+
+    for (const entry of scores) {
+        if (heap.length < k) {
+            heap.push(entry);
+            // Sift up
+            let i = heap.length - 1;
+            while (i > 0) {
+                const parent = (i - 1) >>> 1;
+                if (heap[parent][1] <= heap[i][1]) break;
+                [heap[i], heap[parent]] = [heap[parent], heap[i]];
+                i = parent;
+            }
+        } else if (entry[1] > heap[0][1]) {
+            heap[0] = entry;
+            siftDown(0);
+        }
+    }
+
+    return heap.sort((a, b) => b[1] - a[1]);
+}
+
+// --- Worker protocol ---
+
+/**
+ * Blocks packed for transfer to the worker: only IDs and plain text cross
+ * the boundary, with all text UTF-8 encoded into one transferable buffer.
+ * Block i's text spans bytes offsets[i]..offsets[i + 1].
+ */
+export interface PackedBlocks {
+    ids: string[];
+    pageIds: string[];
+    text: ArrayBuffer;
+    offsets: ArrayBuffer; // Uint32Array
+}
+
+/**
+ * Search results packed for transfer back to the main thread
+ */
+export interface PackedResults {
+    blockIds: string[];
+    pageIds: string[];
+    snippets: string[];
+    scores: ArrayBuffer; // Float64Array
+}
+
+export type SearchRequest =
+    | { type: 'index'; blocks: PackedBlocks }
+    | { type: 'remove'; blockIds: string[] }
+    | { type: 'search'; query: string; limit?: number }
+    | { type: 'stats' }
+    | { type: 'load'; pageId?: string }
+    | { type: 'clear' };
+
+export interface SearchResponse {
+    id: number;
+    result?: unknown;
+    error?: string;
+}
+
+function packBlocks(blocks: { id: string; pageId: string; plainText: string }[]): PackedBlocks {
+    const encoder = new TextEncoder();
+    const encoded = blocks.map(block => encoder.encode(block.plainText));
+
+    const offsets = new Uint32Array(blocks.length + 1);
+    encoded.forEach((bytes, i) => {
+        offsets[i + 1] = offsets[i] + bytes.length;
+    });
+
+    const text = new Uint8Array(offsets[blocks.length]);
+    encoded.forEach((bytes, i) => text.set(bytes, offsets[i]));
+
+    return {
+        ids: blocks.map(block => block.id),
+        pageIds: blocks.map(block => block.pageId),
+        text: text.buffer,
+        offsets: offsets.buffer,
+    };
+}
+
+/**
+ * Execute a request against an index. Shared by the worker and the
+ * in-thread fallback; returns the result and any buffers to transfer.
+ */
+export async function handleSearchRequest(
+    index: ClientSearchIndex,
+    request: SearchRequest
+): Promise<{ result: unknown; transfer: Transferable[] }> {
+    switch (request.type) {
+        case 'index': {
+            const { ids, pageIds } = request.blocks;
+            const text = new Uint8Array(request.blocks.text);
+            const offsets = new Uint32Array(request.blocks.offsets);
+            const decoder = new TextDecoder();
+
+            ids.forEach((id, i) => {
+                index.indexText(id, pageIds[i], decoder.decode(text.subarray(offsets[i], offsets[i + 1])));
+            });
+            return { result: null, transfer: [] };
+        }
+        case 'remove':
+            request.blockIds.forEach(blockId => index.removeBlock(blockId));
+            return { result: null, transfer: [] };
+        case 'search': {
+            const results = index.search(request.query, request.limit);
+            const packed: PackedResults = {
+                blockIds: results.map(r => r.blockId),
+                pageIds: results.map(r => r.pageId),
+                snippets: results.map(r => r.snippet),
+                scores: Float64Array.from(results, r => r.score).buffer,
+            };
+            return { result: packed, transfer: [packed.scores] };
+        }
+        case 'stats':
+            return { result: index.getStats(), transfer: [] };
+        case 'load':
+            await (request.pageId ? index.loadPage(request.pageId) : index.loadAll());
+            return { result: null, transfer: [] };
+        case 'clear':
+            index.clear();
+            return { result: null, transfer: [] };
+    }
+}
+
+/**
+ * Main-thread handle to the search index. Every call is async; the index
+ * itself lives in a dedicated worker so tokenizing never blocks typing.
+ * Falls back to an in-thread index where workers are unavailable.
+ */
+class SearchIndexClient {
+    private worker: Worker | null = null;
+    private local: ClientSearchIndex | null = null;
+    private localQueue: Promise<unknown> = Promise.resolve();
+    private nextId = 0;
+    private pending: Map<number, { resolve: (value: any) => void; reject: (error: Error) => void }> = new Map();
+
+    private getWorker(): Worker | null {
+        if (this.worker || this.local) return this.worker;
+
+        if (typeof Worker === 'undefined') {
+            this.local = new ClientSearchIndex();
+            return null;
+        }
+
+        try {
+            this.worker = new Worker(new URL('./search-worker.ts', import.meta.url), { type: 'module' });
+            this.worker.onmessage = (event: MessageEvent<SearchResponse>) => {
+                const { id, result, error } = event.data;
+                const request = this.pending.get(id);
+                if (!request) return;
+                this.pending.delete(id);
+                if (error) request.reject(new Error(error));
+                else request.resolve(result);
+            };
+            // A worker that fails to load (or whose replies can't be read)
+            // never answers; give up on it instead of hanging every caller
+            this.worker.onerror = (event: ErrorEvent) => {
+                event.preventDefault();
+                this.abandonWorker(new Error(event.message || 'Search worker failed'));
+            };
+            this.worker.onmessageerror = () => {
+                this.abandonWorker(new Error('Search worker sent an unreadable message'));
+            };
+        } catch (error) {
+            console.error('Failed to start search worker, indexing on main thread:', error);
+            this.local = new ClientSearchIndex();
+        }
+        return this.worker;
+    }
+
+    /**
+     * Reject everything in flight and index on the main thread from now on.
+     * In-flight requests can't be replayed: their buffers were transferred.
+     */
+    private abandonWorker(error: Error) {
+        console.error('Search worker failed, indexing on main thread:', error);
+        this.worker?.terminate();
+        this.worker = null;
+        this.local = new ClientSearchIndex();
+
+        const pending = Array.from(this.pending.values());
+        this.pending.clear();
+        pending.forEach(request => request.reject(error));
+    }
+
+    private async request<T>(request: SearchRequest, transfer: Transferable[] = []): Promise<T> {
+        const worker = this.getWorker();
+        if (!worker) {
+            // Same ordering guarantee as the worker
+            const run = this.localQueue.then(() => handleSearchRequest(this.local!, request));
+            this.localQueue = run.catch(() => undefined);
+            return (await run).result as T;
+        }
+
+        const id = this.nextId++;
+        return new Promise<T>((resolve, reject) => {
+            this.pending.set(id, { resolve, reject });
+            worker.postMessage({ id, request }, transfer);
+        });
+    }
+
+    /**
+     * Index arbitrary text documents that belong to a page (e.g. a page body).
+     * IDs share a namespace with block IDs.
+     */
+    indexDocuments(entries: { id: string; pageId: string; plainText: string }[]): Promise<void> {
+        if (entries.length === 0) return Promise.resolve();
+        const blocks = packBlocks(entries);
+        return this.request({ type: 'index', blocks }, [blocks.text, blocks.offsets]);
+    }
+
+    removeDocuments(ids: string[]): Promise<void> {
+        if (ids.length === 0) return Promise.resolve();
+        return this.request({ type: 'remove', blockIds: ids });
+    }
+
+    async search(query: string, limit?: number): Promise<SearchResult[]> {
+        const packed = await this.request<PackedResults>({ type: 'search', query, limit });
+        const scores = new Float64Array(packed.scores);
+        return packed.blockIds.map((blockId, i) => ({
+            blockId,
+            score: scores[i],
+            snippet: packed.snippets[i],
+            pageId: packed.pageIds[i],
+        }));
+    }
+
+    indexBlocks(blocks: Block[]): Promise<void> {
+        return this.indexDocuments(blocks.map(block => ({
+            id: block.id,
+            pageId: block.page_id,
+            plainText: block.plainText || '',
+        })));
+    }
+
+    indexBlock(block: Block): Promise<void> {
+        return this.indexBlocks([block]);
+    }
+
+    updateBlock(block: Block): Promise<void> {
+        return this.indexBlocks([block]);
+    }
+
+    removeBlock(blockId: string): Promise<void> {
+        return this.removeDocuments([blockId]);
+    }
+
+    /**
+     * Apply a batch of block changes from subscribeToPageBlocks
+     */
+    async applyChanges(changes: BlockChange[]): Promise<void> {
+        const removed = changes.filter(c => c.type === 'removed').map(c => c.block.id);
+        const changed = changes.filter(c => c.type !== 'removed').map(c => c.block);
+
+        await this.removeDocuments(removed);
+        await this.indexBlocks(changed);
+    }
+
+    loadPage(pageId: string): Promise<void> {
+        return this.request({ type: 'load', pageId });
+    }
+
+    loadAll(): Promise<void> {
+        return this.request({ type: 'load' });
+    }
+
+    getStats(): Promise<SearchIndexStats> {
+        return this.request({ type: 'stats' });
+    }
+
+    clear(): Promise<void> {
+        return this.request({ type: 'clear' });
+    }
+}
+
 // Singleton instance
-export const searchIndex = new ClientSearchIndex();
+export const searchIndex = new SearchIndexClient();
 
 /**
- * Hook for using search index
+ * Hook for using search index (all methods are async)
  */
 export function useSearchIndex() {
     return {
@@ -201,6 +882,9 @@ export function useSearchIndex() {
         updateBlock: (block: Block) => searchIndex.updateBlock(block),
         removeBlock: (blockId: string) => searchIndex.removeBlock(blockId),
         indexBlocks: (blocks: Block[]) => searchIndex.indexBlocks(blocks),
+        applyChanges: (changes: BlockChange[]) => searchIndex.applyChanges(changes),
+        loadPage: (pageId: string) => searchIndex.loadPage(pageId),
+        loadAll: () => searchIndex.loadAll(),
         getStats: () => searchIndex.getStats(),
     };
 }
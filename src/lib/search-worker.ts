@@ -0,0 +1,32 @@
+/**
+ * Search Index Worker
+ * Hosts the ClientSearchIndex off the main thread; see SearchIndexClient
+ * in search-index.ts for the other side of the protocol
+ */
+
+import { ClientSearchIndex, SearchRequest, SearchResponse, handleSearchRequest } from './search-index';
+
+// Minimal typing for the dedicated worker global (tsconfig only includes the DOM lib)
+const ctx = self as unknown as {
+    onmessage: ((event: MessageEvent<{ id: number; request: SearchRequest }>) => void) | null;
+    postMessage: (message: SearchResponse, transfer: Transferable[]) => void;
+};
+
+const index = new ClientSearchIndex();
+
+// Requests run strictly in arrival order, so a segment load finishes
+// before later index/search requests see the index
+let queue: Promise<void> = Promise.resolve();
+
+ctx.onmessage = (event) => {
+    const { id, request } = event.data;
+
+    queue = queue.then(async () => {
+        try {
+            const { result, transfer } = await handleSearchRequest(index, request);
+            ctx.postMessage({ id, result }, transfer);
+        } catch (error) {
+            ctx.postMessage({ id, error: error instanceof Error ? error.message : 'Unknown error' }, []);
+        }
+    });
+};
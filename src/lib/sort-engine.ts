@@ -3,6 +3,9 @@
  */
 
 import { Page } from './workspace';
+import { GroupIndex, GroupSpec, GroupedPages } from './group-index';
+
+export type { GroupedPages } from './group-index';
 
 export type SortDirection = 'ascending' | 'descending';
 
@@ -14,25 +17,144 @@ export interface Sort {
 
 /**
  * Apply multiple sorts to pages
+ * Keys are extracted once per row and the sorted result is memoized per
+ * input array and sort spec.
  */
 export function applySorts(pages: Page[], sorts: Sort[]): Page[] {
   if (!sorts.length) return pages;
 
-  return [...pages].sort((a, b) => {
-    for (const sort of sorts) {
-      const aValue = a.propertyValues?.[sort.propertyId];
-      const bValue = b.propertyValues?.[sort.propertyId];
-      
-      const comparison = compareValues(aValue, bValue);
-      
+  const specKey = sorts.map(sort => `${sort.propertyId}:${sort.direction}`).join('|');
+  const cached = sortCache.get(pages);
+  if (cached && cached.specKey === specKey) return cached.result;
+
+  const order = sortPermutation(pages, sorts);
+  const result = new Array<Page>(pages.length);
+  for (let i = 0; i < order.length; i++) {
+    result[i] = pages[order[i]];
+  }
+
+  sortCache.set(pages, { specKey, result });
+  return result;
+}
+
+const KIND_NULL = 0;
+const KIND_NUMBER = 1;
+const KIND_DATE = 2;
+const KIND_STRING = 3;
+
+/**
+ * Precomputed sort key for one property across all rows
+ */
+interface SortKey {
+  kinds: Uint8Array;
+  numbers: Float64Array;
+  // Position of the row's lowercased string in collator order
+  ranks: Uint32Array;
+  sign: number;
+}
+
+const collator = new Intl.Collator();
+const sortCache = new WeakMap<Page[], { specKey: string; result: Page[] }>();
+
+/**
+ * Compute the stable sorted order of `pages` as indices into the input
+ */
+export function sortPermutation(pages: Page[], sorts: Sort[]): Uint32Array {
+  const keys = sorts.map(sort => buildSortKey(pages, sort));
+  const order = new Uint32Array(pages.length);
+  for (let i = 0; i < order.length; i++) order[i] = i;
+
+  return order.sort((a, b) => {
+    for (const key of keys) {
+      const comparison = compareKeys(key, a, b);
+
       if (comparison !== 0) {
-        return sort.direction === 'ascending' ? comparison : -comparison;
+        return key.sign * comparison;
       }
     }
-    return 0;
+    return a - b;
   });
 }
 
+function buildSortKey(pages: Page[], sort: Sort): SortKey {
+  const n = pages.length;
+  const kinds = new Uint8Array(n);
+  const numbers = new Float64Array(n);
+  const ranks = new Uint32Array(n);
+  const strings: string[] = new Array(n);
+  const unique = new Set<string>();
+
+  for (let i = 0; i < n; i++) {
+    const value = pages[i].propertyValues?.[sort.propertyId];
+    if (value == null) continue;
+
+    if (typeof value === 'number') {
+      kinds[i] = KIND_NUMBER;
+      numbers[i] = value;
+    } else if (value instanceof Date) {
+      kinds[i] = KIND_DATE;
+      numbers[i] = value.getTime();
+    } else {
+      kinds[i] = KIND_STRING;
+    }
+
+    // Mixed-type comparisons fall back to strings, so every value gets a rank
+    const str = String(value).toLowerCase();
+    strings[i] = str;
+    unique.add(str);
+  }
+
+  const rankOf = new Map<string, number>();
+  let rank = 0;
+  let previous: string | undefined;
+  for (const str of Array.from(unique).sort(collator.compare)) {
+    // Strings the collator considers equal share a rank
+    if (previous !== undefined && collator.compare(previous, str) !== 0) rank++;
+    rankOf.set(str, rank);
+    previous = str;
+  }
+
+  for (let i = 0; i < n; i++) {
+    if (kinds[i] !== KIND_NULL) ranks[i] = rankOf.get(strings[i])!;
+  }
+
+  return { kinds, numbers, ranks, sign: sort.direction === 'ascending' ? 1 : -1 };
+}
+
+/**
+ * Compare two rows by a precomputed key
+ */
+function compareKeys(key: SortKey, a: number, b: number): number {
+  const aKind = key.kinds[a];
+  const bKind = key.kinds[b];
+
+  // Handle null/undefined
+  if (aKind === KIND_NULL && bKind === KIND_NULL) return 0;
+  if (aKind === KIND_NULL) return 1;
+  if (bKind === KIND_NULL) return -1;
+
+  // Handle numbers and dates
+  if (aKind === bKind && aKind !== KIND_STRING) {
+    return key.numbers[a] - key.numbers[b];
+  }
+
+  return key.ranks[a] - key.ranks[b];
+}
+
+/**
+ * Compare two pages by a sort spec, ordering rows the same way as applySorts
+ */
+export function comparePages(a: Page, b: Page, sorts: Sort[]): number {
+  for (const sort of sorts) {
+    const comparison = compareValues(a.propertyValues?.[sort.propertyId], b.propertyValues?.[sort.propertyId]);
+
+    if (comparison !== 0) {
+      return sort.direction === 'ascending' ? comparison : -comparison;
+    }
+  }
+  return 0;
+}
+
 /**
  * Compare two values
  */
@@ -53,31 +175,14 @@ function compareValues(a: any, b: any): number {
   }
 
   // Handle strings (case-insensitive)
-  const aStr = String(a).toLowerCase();
-  const bStr = String(b).toLowerCase();
-  
-  return aStr.localeCompare(bStr);
+  return collator.compare(String(a).toLowerCase(), String(b).toLowerCase());
 }
 
 /**
  * Group pages by property value
+ * Multi-select values fan out to each option; see GroupSpec for date and
+ * numeric bucketing.
  */
-export interface GroupedPages {
-  [key: string]: Page[];
-}
-
-export function groupPages(pages: Page[], propertyId: string): GroupedPages {
-  const grouped: GroupedPages = {};
-
-  pages.forEach(page => {
-    const value = page.propertyValues?.[propertyId];
-    const key = value != null ? String(value) : '__none__';
-
-    if (!grouped[key]) {
-      grouped[key] = [];
-    }
-    grouped[key].push(page);
-  });
-
-  return grouped;
+export function groupPages(pages: Page[], propertyId: string, options: Omit<GroupSpec, 'propertyId'> = {}): GroupedPages {
+  return new GroupIndex({ propertyId, ...options }).sync(pages);
 }
@@ -0,0 +1,131 @@
+/**
+ * User Profiles
+ * Batched, de-duplicated loading of users/{uid} profiles. IDs requested in
+ * the same tick are fetched together with chunked `documentId() in` queries
+ * issued in parallel, and profiles are cached until their TTL expires.
+ */
+
+import { collection, documentId, getDocs, query, where } from 'firebase/firestore';
+import { LRUCache } from 'lru-cache';
+import { db } from './firebase';
+
+export interface UserProfile {
+    uid: string;
+    displayName?: string;
+    email?: string;
+    photoURL?: string | null;
+    [key: string]: any;
+}
+
+// Firestore 'in' query limit
+const IN_QUERY_LIMIT = 30;
+const PROFILE_TTL = 10 * 60 * 1000; // 10 minutes
+const MAX_PROFILES = 2000;
+
+class UserProfileLoader {
+    private profiles = new LRUCache<string, UserProfile>({ max: MAX_PROFILES, ttl: PROFILE_TTL });
+    // IDs without a profile document, so they aren't re-queried every render
+    private missing = new LRUCache<string, true>({ max: MAX_PROFILES, ttl: PROFILE_TTL });
+
+    // Requests waiting for the next batch
+    private queued = new Map<string, (profile: UserProfile | null) => void>();
+    private inflight = new Map<string, Promise<UserProfile | null>>();
+    private flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+    /**
+     * Load one profile; concurrent requests for the same user share a fetch
+     */
+    load(uid: string): Promise<UserProfile | null> {
+        const cached = this.profiles.get(uid);
+        if (cached) return Promise.resolve(cached);
+        if (this.missing.has(uid)) return Promise.resolve(null);
+
+        const pending = this.inflight.get(uid);
+        if (pending) return pending;
+
+        const promise = new Promise<UserProfile | null>(resolve => {
+            this.queued.set(uid, resolve);
+        });
+        this.inflight.set(uid, promise);
+
+        if (!this.flushTimer) {
+            this.flushTimer = setTimeout(() => this.flush(), 0);
+        }
+        return promise;
+    }
+
+    /**
+     * Load several profiles; users without a profile are left out
+     */
+    async loadMany(uids: string[]): Promise<Map<string, UserProfile>> {
+        const unique = Array.from(new Set(uids.filter(Boolean)));
+        const loaded = await Promise.all(unique.map(uid => this.load(uid)));
+
+        const result = new Map<string, UserProfile>();
+        loaded.forEach(profile => {
+            if (profile) result.set(profile.uid, profile);
+        });
+        return result;
+    }
+
+    /**
+     * Cached profile, if any (no fetch)
+     */
+    peek(uid: string): UserProfile | undefined {
+        return this.profiles.get(uid);
+    }
+
+    /**
+     * Drop a cached profile, e.g. after the user edited it
+     */
+    invalidate(uid: string) {
+        this.profiles.delete(uid);
+        this.missing.delete(uid);
+        // A fetch already under way may have read the old profile: later loads
+        // start a new one, and its result isn't cached
+        if (!this.queued.has(uid)) this.inflight.delete(uid);
+    }
+
+    private async flush() {
+        this.flushTimer = null;
+        const batch = new Map(this.queued);
+        this.queued.clear();
+
+        const ids = Array.from(batch.keys());
+        // Fetches still current when they finish (see invalidate)
+        const promises = new Map(ids.map(uid => [uid, this.inflight.get(uid)]));
+        const chunks: string[][] = [];
+        for (let i = 0; i < ids.length; i += IN_QUERY_LIMIT) {
+            chunks.push(ids.slice(i, i + IN_QUERY_LIMIT));
+        }
+
+        await Promise.all(chunks.map(async chunk => {
+            const found = new Map<string, UserProfile>();
+            let failed = false;
+
+            try {
+                const q = query(collection(db, 'users'), where(documentId(), 'in', chunk));
+                const snapshot = await getDocs(q);
+                snapshot.forEach(userDoc => {
+                    found.set(userDoc.id, { ...userDoc.data(), uid: userDoc.id });
+                });
+            } catch (error) {
+                console.error('Failed to load user profiles:', error);
+                failed = true;
+            }
+
+            chunk.forEach(uid => {
+                const profile = found.get(uid) ?? null;
+                if (this.inflight.get(uid) === promises.get(uid)) {
+                    if (profile) this.profiles.set(uid, profile);
+                    else if (!failed) this.missing.set(uid, true);
+                    this.inflight.delete(uid);
+                }
+                batch.get(uid)!(profile);
+            });
+        }));
+    }
+}
+
+// Singleton instance
+export const userProfiles = new UserProfileLoader();
@@ -0,0 +1,418 @@
+/**
+ * Workspace Search
+ * Local index of page titles and page bodies for the command palette.
+ * Titles come from subscribeToWorkspacePages. Bodies are read one page at a
+ * time (so the page's own read rule applies) in the background as page
+ * snapshots arrive, and only for pages updated since their body was last
+ * indexed; searching itself never reads from Firestore.
+ */
+
+import { Page, getPageBody, subscribeToWorkspacePages } from './workspace';
+import { searchIndex } from './search-index';
+
+export interface WorkspaceSearchResult {
+    pageId: string;
+    title: string;
+    type: Page['type'];
+    icon?: string;
+    lastModified?: Date;
+    preview?: string;
+}
+
+interface PageEntry {
+    id: string;
+    title: string;
+    lowerTitle: string;
+    type: Page['type'];
+    icon?: string;
+    updatedAt?: any;
+    // Inline body of pages not yet moved to a body document
+    inlineContent?: string;
+}
+
+// Body documents live in the block search index under this prefix
+const BODY_DOC_PREFIX = 'page-body:';
+// Page bodies fetched in parallel while refreshing
+const BODY_FETCH_CONCURRENCY = 8;
+// Retry delay for a body that failed to load; doubles per failure up to the max
+const BODY_RETRY_MS = 30 * 1000;
+const BODY_RETRY_MAX_MS = 30 * 60 * 1000;
+
+interface FailedBody {
+    attempts: number;
+    retryAt: number;
+}
+
+class WorkspaceSearch {
+    private workspaceId: string | null = null;
+    private unsubscribe: (() => void) | null = null;
+    private subscribers = 0;
+
+    // Page ID -> title/metadata (trashed pages excluded)
+    private pages: Map<string, PageEntry> = new Map();
+    // Page ID -> page version (updatedAt) whose body is in the search index;
+    // kept across sessions like the index segments themselves
+    private indexed = new Map<string, number>();
+    private refreshing: Promise<void> | null = null;
+    private refreshQueued = false;
+    // Page ID -> backoff for bodies that could not be read (permissions, offline)
+    private failed = new Map<string, FailedBody>();
+    private retryTimer: ReturnType<typeof setTimeout> | null = null;
+    private listeners = new Set<() => void>();
+
+    /**
+     * Start keeping the index current for a workspace.
+     * Returns a cleanup function; the listener stops when the last user leaves.
+     */
+    subscribe(workspaceId: string): () => void {
+        if (this.workspaceId !== workspaceId) {
+            this.stop();
+            this.workspaceId = workspaceId;
+
+            // Block text indexed in earlier sessions comes from IndexedDB;
+            // the worker handles requests in order, so this lands before the seed
+            searchIndex.loadAll().catch(error => {
+                console.error('Failed to load search index:', error);
+            });
+            this.indexed = loadIndexedVersions(workspaceId);
+            this.unsubscribe = subscribeToWorkspacePages(workspaceId, pages => this.applyPages(pages));
+        }
+        this.subscribers++;
+
+        let active = true;
+        return () => {
+            if (!active || this.workspaceId !== workspaceId) return;
+            active = false;
+            this.subscribers--;
+            if (this.subscribers === 0) this.stop();
+        };
+    }
+
+    private stop() {
+        this.unsubscribe?.();
+        this.unsubscribe = null;
+        this.workspaceId = null;
+        this.subscribers = 0;
+
+        // Indexed bodies stay in the (persisted) search index for next time;
+        // results are limited to this workspace's pages
+        this.pages.clear();
+        this.indexed = new Map();
+        this.failed.clear();
+        this.refreshQueued = false;
+        if (this.retryTimer) clearTimeout(this.retryTimer);
+        this.retryTimer = null;
+    }
+
+    private applyPages(pages: Page[]) {
+        const seen = new Set<string>();
+
+        for (const page of pages) {
+            if (page.inTrash) continue;
+            seen.add(page.id);
+
+            const title = page.title || 'Untitled';
+            this.pages.set(page.id, {
+                id: page.id,
+                title,
+                lowerTitle: title.toLowerCase(),
+                type: page.type,
+                icon: page.icon,
+                updatedAt: page.updatedAt,
+                inlineContent: page.content,
+            });
+        }
+
+        for (const id of Array.from(this.pages.keys())) {
+            if (!seen.has(id)) {
+                this.pages.delete(id);
+                this.failed.delete(id);
+            }
+        }
+
+        // Bodies of deleted or trashed pages leave the search index
+        const removedBodies: string[] = [];
+        for (const id of Array.from(this.indexed.keys())) {
+            if (!this.pages.has(id)) {
+                this.indexed.delete(id);
+                removedBodies.push(BODY_DOC_PREFIX + id);
+            }
+        }
+        if (removedBodies.length > 0) {
+            searchIndex.removeDocuments(removedBodies).catch(error => {
+                console.error('Failed to remove page bodies from search index:', error);
+            });
+            saveIndexedVersions(this.workspaceId!, this.indexed);
+        }
+
+        this.listeners.forEach(listener => listener());
+
+        // Backfill bodies of new and updated pages
+        this.refreshBodies().catch(error => {
+            console.error('Failed to refresh page bodies:', error);
+        });
+    }
+
+    /**
+     * Index the bodies of pages updated since they were last indexed.
+     * Listeners are notified once new bodies are searchable.
+     */
+    private refreshBodies(): Promise<void> {
+        if (this.refreshing) {
+            // Pages that went stale during this pass get another one
+            this.refreshQueued = true;
+            return this.refreshing;
+        }
+        this.refreshing = this.indexStaleBodies().finally(() => {
+            this.refreshing = null;
+            if (this.refreshQueued) {
+                this.refreshQueued = false;
+                this.refreshBodies().catch(error => {
+                    console.error('Failed to refresh page bodies:', error);
+                });
+            }
+        });
+        return this.refreshing;
+    }
+
+    private async indexStaleBodies() {
+        const workspaceId = this.workspaceId;
+        const now = Date.now();
+        const stale = Array.from(this.pages.values()).filter(entry =>
+            this.indexed.get(entry.id) !== pageVersion(entry) &&
+            !((this.failed.get(entry.id)?.retryAt ?? 0) > now)
+        );
+        if (!workspaceId || stale.length === 0) return;
+
+        let indexedAny = false;
+        for (let i = 0; i < stale.length; i += BODY_FETCH_CONCURRENCY) {
+            const batch = stale.slice(i, i + BODY_FETCH_CONCURRENCY);
+            const bodies = await Promise.all(batch.map(entry =>
+                entry.inlineContent !== undefined
+                    ? entry.inlineContent
+                    : getPageBody(entry.id).catch(error => {
+                        console.error('Failed to load page body for search:', error);
+                        return null;
+                    })
+            ));
+            if (this.workspaceId !== workspaceId) return;
+
+            const documents: { id: string; pageId: string; plainText: string }[] = [];
+            batch.forEach((entry, j) => {
+                const body = bodies[j];
+                if (!this.pages.has(entry.id)) return;
+                if (body === null) {
+                    this.markFailed(entry.id);
+                    return;
+                }
+                this.failed.delete(entry.id);
+                this.indexed.set(entry.id, pageVersion(entry));
+                documents.push({ id: BODY_DOC_PREFIX + entry.id, pageId: entry.id, plainText: htmlToText(body) });
+            });
+            if (documents.length === 0) continue;
+
+            await searchIndex.indexDocuments(documents);
+            indexedAny = true;
+        }
+
+        this.scheduleRetry();
+        if (!indexedAny) return;
+
+        saveIndexedVersions(workspaceId, this.indexed);
+        this.listeners.forEach(listener => listener());
+    }
+
+    private markFailed(pageId: string) {
+        const attempts = (this.failed.get(pageId)?.attempts ?? 0) + 1;
+        const delay = Math.min(BODY_RETRY_MS * 2 ** (attempts - 1), BODY_RETRY_MAX_MS);
+        this.failed.set(pageId, { attempts, retryAt: Date.now() + delay });
+    }
+
+    /**
+     * Retry failed bodies when the earliest backoff runs out
+     */
+    private scheduleRetry() {
+        if (this.retryTimer) clearTimeout(this.retryTimer);
+        this.retryTimer = null;
+        if (this.failed.size === 0) return;
+
+        const retryAt = Math.min(...Array.from(this.failed.values(), failure => failure.retryAt));
+        this.retryTimer = setTimeout(() => {
+            this.retryTimer = null;
+            this.refreshBodies().catch(error => {
+                console.error('Failed to refresh page bodies:', error);
+            });
+        }, Math.max(0, retryAt - Date.now()));
+    }
+
+    /**
+     * Be notified whenever the indexed pages change
+     */
+    onChange(listener: () => void): () => void {
+        this.listeners.add(listener);
+        return () => {
+            this.listeners.delete(listener);
+        };
+    }
+
+    /**
+     * Substring match on titles only, synchronous; an empty query lists every page
+     */
+    searchTitles(query: string): WorkspaceSearchResult[] {
+        const q = query.trim().toLowerCase();
+        const results: WorkspaceSearchResult[] = [];
+
+        this.pages.forEach(entry => {
+            if (q && !entry.lowerTitle.includes(q)) return;
+            results.push({
+                pageId: entry.id,
+                title: entry.title,
+                type: entry.type,
+                icon: entry.icon,
+                lastModified: entry.updatedAt?.toDate?.(),
+            });
+        });
+
+        return results;
+    }
+
+    /**
+     * Search titles (fuzzy) and body text (BM25, via the search worker).
+     * Title matches rank first, then pages matched only by their content.
+     */
+    async search(query: string, limit: number = 10): Promise<WorkspaceSearchResult[]> {
+        const q = query.trim().toLowerCase();
+        if (!q) return [];
+
+        const titleMatches: { entry: PageEntry; score: number }[] = [];
+        for (const entry of this.pages.values()) {
+            if (fuzzyMatch(q, entry.lowerTitle)) {
+                titleMatches.push({ entry, score: calculateRelevance(q, entry.lowerTitle) });
+            }
+        }
+        titleMatches.sort((a, b) => b.score - a.score);
+
+        // Searches what is indexed now; listeners hear when fresher bodies land
+        const contentMatches = await searchIndex.search(query, limit * 2);
+
+        // Best snippet per page (results arrive best-first)
+        const snippets = new Map<string, string>();
+        for (const match of contentMatches) {
+            if (!snippets.has(match.pageId)) snippets.set(match.pageId, match.snippet);
+        }
+
+        const results: WorkspaceSearchResult[] = [];
+        const added = new Set<string>();
+        const add = (entry: PageEntry) => {
+            if (added.has(entry.id) || results.length >= limit) return;
+            added.add(entry.id);
+            results.push({
+                pageId: entry.id,
+                title: entry.title,
+                type: entry.type,
+                icon: entry.icon,
+                lastModified: entry.updatedAt?.toDate?.(),
+                preview: snippets.get(entry.id),
+            });
+        };
+
+        titleMatches.forEach(({ entry }) => add(entry));
+        snippets.forEach((_, pageId) => {
+            const entry = this.pages.get(pageId);
+            if (entry) add(entry);
+        });
+
+        return results;
+    }
+}
+
+/**
+ * Version of a page's body: body saves also bump the page's updatedAt
+ * (within BODY_TOUCH_DELAY, see updatePage)
+ */
+function pageVersion(entry: PageEntry): number {
+    return entry.updatedAt?.toMillis?.() ?? 0;
+}
+
+function indexedVersionsKey(workspaceId: string): string {
+    return `search-body-versions:${workspaceId}`;
+}
+
+function loadIndexedVersions(workspaceId: string): Map<string, number> {
+    if (typeof window === 'undefined') return new Map();
+    try {
+        const stored = localStorage.getItem(indexedVersionsKey(workspaceId));
+        return new Map(stored ? Object.entries(JSON.parse(stored) as Record<string, number>) : []);
+    } catch {
+        return new Map();
+    }
+}
+
+function saveIndexedVersions(workspaceId: string, versions: Map<string, number>) {
+    if (typeof window === 'undefined') return;
+    try {
+        localStorage.setItem(indexedVersionsKey(workspaceId), JSON.stringify(Object.fromEntries(versions)));
+    } catch (error) {
+        console.error('Failed to save search index versions:', error);
+    }
+}
+
+/**
+ * Strip Tiptap HTML down to searchable text
+ */
+function htmlToText(html: string): string {
+    return html
+        .replace(/<[^>]*>/g, ' ')
+        .replace(/&nbsp;/g, ' ')
+        .replace(/&amp;/g, '&')
+        .replace(/&lt;/g, '<')
+        .replace(/&gt;/g, '>')
+        .replace(/&quot;/g, '"')
+        .replace(/&#39;/g, "'")
+        .replace(/\s+/g, ' ')
+        .trim();
+}
+
+/**
+ * Fuzzy match algorithm (both arguments lowercase)
+ */
+function fuzzyMatch(q: string, t: string): boolean {
+    let qIndex = 0;
+    for (let i = 0; i < t.length && qIndex < q.length; i++) {
+        if (t[i] === q[qIndex]) {
+            qIndex++;
+        }
+    }
+
+    return qIndex === q.length;
+}
+
+/**
+ * Calculate relevance score (both arguments lowercase)
+ */
+function calculateRelevance(q: string, t: string): number {
+    // Exact match
+    if (t === q) return 100;
+
+    // Starts with
+    if (t.startsWith(q)) return 90;
+
+    // Contains
+    if (t.includes(q)) return 80;
+
+    // Fuzzy match score
+    let score = 0;
+    let lastIndex = -1;
+    for (const char of q) {
+        const index = t.indexOf(char, lastIndex + 1);
+        if (index > lastIndex) {
+            score += 10;
+            lastIndex = index;
+        }
+    }
+
+    return score;
+}
+
+// Singleton instance
+export const workspaceSearch = new WorkspaceSearch();
@@ -13,8 +13,16 @@ import {
     deleteDoc,
     arrayUnion,
     onSnapshot, // Import onSnapshot
-    setDoc
+    setDoc,
+    writeBatch,
+    deleteField,
+    increment,
+    Query
 } from "firebase/firestore";
+import { LRUCache } from "lru-cache";
+import { subscribeToQueryDeltas } from "./delta-store";
+import { metrics } from "./metrics";
+import { userProfiles } from "./user-profiles";
 
 export interface Workspace {
     id: string;
@@ -31,7 +39,7 @@ export interface Page {
     title: string;
     icon?: string;
     cover?: string;
-    content?: string; // HTML content from Tiptap
+    content?: string; // HTML content from Tiptap (stored in the body document, see getPageBody)
     createdAt?: any;
     updatedAt?: any;
     isExpanded?: boolean; // For sidebar UI state
@@ -40,6 +48,10 @@ export interface Page {
     section?: 'private' | 'workspace';
     createdBy?: string;
     order?: number;
+    // Child page documents (trashed ones included), so the sidebar knows
+    // whether to offer an expand chevron before loading the children.
+    // Missing on pages created before it was kept (see countChildPages).
+    childCount?: number;
 
     // Database Fields
     type: 'page' | 'database' | 'calendar';
@@ -89,27 +101,48 @@ export interface Page {
     isFavorite?: boolean;
 }
 
-// --- Simple Page Cache ---
-interface CacheEntry {
-    data: Page;
-    timestamp: number;
+/**
+ * A single page change from a realtime snapshot
+ */
+export interface PageChange {
+    type: 'added' | 'modified' | 'removed';
+    page: Page;
 }
 
-const pageCache = new Map<string, CacheEntry>();
-const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+/**
+ * Lightweight page metadata for navigation (sidebar, favorites, trash):
+ * everything except the body and database fields
+ */
+export type PageMeta = Omit<Page, 'content' | 'propertyValues' | 'properties'>;
 
 /**
- * Clear expired cache entries
+ * Project a page down to its metadata
  */
-function clearExpiredCache() {
-    const now = Date.now();
-    for (const [key, entry] of pageCache.entries()) {
-        if (now - entry.timestamp > CACHE_TTL) {
-            pageCache.delete(key);
-        }
-    }
+export function toPageMeta(page: Page): PageMeta {
+    const { content, propertyValues, properties, ...meta } = page;
+    return meta;
 }
 
+// --- Page Cache ---
+// LRU bounded by approximate entry size. Entries older than CACHE_TTL are
+// served stale while a refetch runs, and realtime listeners refresh cached
+// entries as remote changes arrive (see refreshCachedPage).
+const PAGE_CACHE_MAX_BYTES = 8 * 1024 * 1024;
+const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+
+const pageCache = new LRUCache<string, Page>({
+    maxSize: PAGE_CACHE_MAX_BYTES,
+    // UTF-16 size of the serialized page; close enough for a budget
+    sizeCalculation: page => Math.max(1, JSON.stringify(page).length * 2),
+    ttl: CACHE_TTL,
+    allowStale: true,
+    allowStaleOnFetchRejection: true,
+    fetchMethod: async (pageId) => {
+        const snap = await getDoc(doc(db, "pages", pageId));
+        return snap.exists() ? { id: snap.id, ...snap.data() } as Page : undefined;
+    },
+});
+
 /**
  * Invalidate cache for a specific page
  */
@@ -117,9 +150,27 @@ function invalidatePageCache(pageId: string) {
     pageCache.delete(pageId);
 }
 
-// Clear expired cache every minute
-if (typeof window !== 'undefined') {
-    setInterval(clearExpiredCache, 60 * 1000);
+/**
+ * Update a cached page from a listener; pages not in the cache are left out
+ * so workspace-wide listeners don't evict the pages actually being opened
+ */
+function refreshCachedPage(page: Page) {
+    if (pageCache.peek(page.id, { allowStale: true }) !== undefined) {
+        pageCache.set(page.id, page);
+    }
+}
+
+/**
+ * Page cache hit/miss counters
+ */
+export function getPageCacheStats() {
+    return {
+        hits: metrics.getCounter('page-cache-hit'),
+        staleHits: metrics.getCounter('page-cache-stale'),
+        misses: metrics.getCounter('page-cache-miss'),
+        entries: pageCache.size,
+        bytes: pageCache.calculatedSize,
+    };
 }
 
 // --- Workspaces ---
@@ -194,7 +245,6 @@ export const createPage = async (
         workspaceId,
         parentId: parentId || null,
         title: finalTitle,
-        content: "",
         type,
         section,
         createdBy: userId,
@@ -208,10 +258,29 @@ export const createPage = async (
         inTrash: false,
         order: new Date().getTime() // Initial order by creation time
     };
-    await setDoc(pageRef, newPage);
-    return newPage;
+    const batch = writeBatch(db);
+    batch.set(pageRef, newPage);
+    batch.set(pageBodyRef(pageRef.id), { workspaceId, content: "", updatedAt: serverTimestamp() });
+    await batch.commit();
+    movedBodies.add(pageRef.id);
+    await adjustChildCount(parentId, 1);
+    return { ...newPage, content: "" };
 };
 
+/**
+ * Keep a parent's childCount in step with its children. Only a hint for
+ * the sidebar, so a failed update (e.g. the parent is gone) is logged and
+ * does not fail the page operation.
+ */
+export async function adjustChildCount(parentId: string | null | undefined, delta: number) {
+    if (!parentId) return;
+    try {
+        await updateDoc(doc(db, "pages", parentId), { childCount: increment(delta) });
+    } catch (error) {
+        console.error("Failed to update child count:", error);
+    }
+}
+
 export async function getWorkspacePages(workspaceId: string): Promise<Page[]> {
     // Determine sort algorithm - for now create time
     const q = query(
@@ -229,6 +298,45 @@ export async function getWorkspacePages(workspaceId: string): Promise<Page[]> {
     return pages;
 }
 
+/**
+ * Live top-level pages of a workspace (the first level of the sidebar)
+ */
+export function subscribeToRootPages(workspaceId: string, callback: (pages: Page[], changes: PageChange[]) => void) {
+    const q = query(
+        collection(db, "pages"),
+        where("workspaceId", "==", workspaceId),
+        where("parentId", "==", null)
+    );
+
+    return subscribeToPageDeltas(q, callback);
+}
+
+/**
+ * Live favorite pages of a workspace
+ */
+export function subscribeToFavoritePages(workspaceId: string, callback: (pages: Page[], changes: PageChange[]) => void) {
+    const q = query(
+        collection(db, "pages"),
+        where("workspaceId", "==", workspaceId),
+        where("isFavorite", "==", true)
+    );
+
+    return subscribeToPageDeltas(q, callback);
+}
+
+/**
+ * Live trashed pages of a workspace
+ */
+export function subscribeToTrashedPages(workspaceId: string, callback: (pages: Page[], changes: PageChange[]) => void) {
+    const q = query(
+        collection(db, "pages"),
+        where("workspaceId", "==", workspaceId),
+        where("inTrash", "==", true)
+    );
+
+    return subscribeToPageDeltas(q, callback);
+}
+
 export async function getChildPages(parentId: string): Promise<Page[]> {
     const q = query(
         collection(db, "pages"),
@@ -242,63 +350,141 @@ export async function getChildPages(parentId: string): Promise<Page[]> {
     return pages;
 }
 
-// Get a single page by ID with caching
+// Get a single page by ID with caching (stale entries are returned while they refresh)
 export async function getPage(pageId: string): Promise<Page | null> {
-    // Check cache first
-    const cached = pageCache.get(pageId);
-    if (cached && Date.now() - cached.timestamp < CACHE_TTL) {
-        return cached.data;
+    const status: LRUCache.Status<Page> = {};
+    const page = await pageCache.fetch(pageId, { status });
+
+    if (status.fetch === 'hit') {
+        metrics.increment('page-cache-hit');
+    } else if (status.fetch === 'stale') {
+        metrics.increment('page-cache-stale');
+    } else {
+        metrics.increment('page-cache-miss');
     }
 
-    const docRef = doc(db, "pages", pageId);
-    const snap = await getDoc(docRef);
-    if (snap.exists()) {
-        const page = { id: snap.id, ...snap.data() } as Page;
-        // Store in cache
-        pageCache.set(pageId, { data: page, timestamp: Date.now() });
-        return page;
-    }
-    return null;
+    return page ?? null;
 }
 
 export async function updatePage(pageId: string, data: Partial<Page>): Promise<void> {
+    const { content, ...meta } = data;
     const docRef = doc(db, "pages", pageId);
-    await updateDoc(docRef, {
-        ...data,
-        updatedAt: serverTimestamp()
-    });
+
+    if (content === undefined) {
+        await updateDoc(docRef, {
+            ...meta,
+            updatedAt: serverTimestamp()
+        });
+        cancelBodyTouch(pageId);
+    } else if (movedBodies.has(pageId) && Object.keys(meta).length === 0) {
+        // Body only: page listeners aren't woken on every autosave; the
+        // page's updatedAt follows within BODY_TOUCH_DELAY
+        await setDoc(pageBodyRef(pageId), {
+            content,
+            updatedAt: serverTimestamp()
+        }, { merge: true });
+        scheduleBodyTouch(pageId);
+        return;
+    } else {
+        // The body goes to its own document; also drop any inline body left from before the split.
+        // workspaceId is written once, when the body is created or migrated
+        const batch = writeBatch(db);
+        batch.set(pageBodyRef(pageId), {
+            content,
+            updatedAt: serverTimestamp()
+        }, { merge: true });
+        batch.update(docRef, {
+            ...meta,
+            content: deleteField(),
+            updatedAt: serverTimestamp()
+        });
+        await batch.commit();
+        movedBodies.add(pageId);
+        cancelBodyTouch(pageId);
+    }
 
     // Invalidate cache for updated page
     invalidatePageCache(pageId);
 }
 
+// Pages known to have no inline body left: created after the split, or
+// saved once through updatePage in this session (which deletes it)
+const movedBodies = new Set<string>();
+
+// Body-only saves bump the page's updatedAt at most this often, so "last
+// edited" and workspace search (which re-reads bodies of pages whose
+// updatedAt changed) still follow body edits
+const BODY_TOUCH_DELAY = 30 * 1000;
+const pendingBodyTouches = new Map<string, ReturnType<typeof setTimeout>>();
+
+function scheduleBodyTouch(pageId: string) {
+    if (pendingBodyTouches.has(pageId)) return;
+    if (pendingBodyTouches.size === 0 && typeof window !== "undefined") {
+        window.addEventListener("pagehide", flushBodyTouches);
+    }
+    pendingBodyTouches.set(pageId, setTimeout(() => touchPage(pageId), BODY_TOUCH_DELAY));
+}
+
+function cancelBodyTouch(pageId: string) {
+    const timer = pendingBodyTouches.get(pageId);
+    if (timer === undefined) return;
+    clearTimeout(timer);
+    pendingBodyTouches.delete(pageId);
+}
+
+function touchPage(pageId: string) {
+    cancelBodyTouch(pageId);
+    updateDoc(doc(db, "pages", pageId), { updatedAt: serverTimestamp() })
+        .then(() => invalidatePageCache(pageId))
+        .catch(error => console.error("Failed to update page timestamp:", error));
+}
+
+/**
+ * Write pending updatedAt bumps now (the tab is going away)
+ */
+function flushBodyTouches() {
+    Array.from(pendingBodyTouches.keys()).forEach(touchPage);
+}
+
 export async function movePage(pageId: string, newParentId: string | null, newOrder: number) {
     const docRef = doc(db, "pages", pageId);
+    const snap = await getDoc(docRef);
+    const oldParentId = snap.exists() ? (snap.data().parentId ?? null) : null;
+
     await updateDoc(docRef, {
         parentId: newParentId,
         order: newOrder,
         updatedAt: serverTimestamp()
     });
+    invalidatePageCache(pageId);
+
+    if (oldParentId !== newParentId) {
+        await Promise.all([adjustChildCount(oldParentId, -1), adjustChildCount(newParentId, 1)]);
+    }
 }
 
 export async function deletePage(pageId: string) {
     // Note: This needs to recursively delete children in a real production app.
     // For MVP, we just delete the node. Children become orphans (or hidden).
-    await deleteDoc(doc(db, "pages", pageId));
+    const snap = await getDoc(doc(db, "pages", pageId));
+    const parentId = snap.exists() ? snap.data().parentId : null;
+
+    cancelBodyTouch(pageId);
+    const batch = writeBatch(db);
+    batch.delete(doc(db, "pages", pageId));
+    batch.delete(pageBodyRef(pageId));
+    await batch.commit();
+    invalidatePageCache(pageId);
+    await adjustChildCount(parentId, -1);
 }
 
-export function subscribeToWorkspacePages(workspaceId: string, callback: (pages: Page[]) => void) {
+export function subscribeToWorkspacePages(workspaceId: string, callback: (pages: Page[], changes: PageChange[]) => void) {
     const q = query(
         collection(db, "pages"),
         where("workspaceId", "==", workspaceId)
     );
-    return onSnapshot(q, (snapshot) => {
-        const pages: Page[] = [];
-        snapshot.forEach(doc => {
-            pages.push({ id: doc.id, ...doc.data() } as Page);
-        });
-        callback(pages);
-    });
+
+    return subscribeToPageDeltas(q, callback);
 }
 
 export function subscribeToPage(pageId: string, callback: (page: Page | null) => void) {
@@ -310,24 +496,84 @@ export function subscribeToPage(pageId: string, callback: (page: Page | null) =>
         }
 
         if (docSnap.exists()) {
-            callback({ id: docSnap.id, ...docSnap.data() } as Page);
+            const page = { id: docSnap.id, ...docSnap.data() } as Page;
+            pageCache.set(page.id, page);
+            callback(page);
         } else {
+            invalidatePageCache(pageId);
             callback(null);
         }
     });
 }
 
-export function subscribeToChildPages(parentId: string, callback: (pages: Page[]) => void) {
+export function subscribeToChildPages(parentId: string, callback: (pages: Page[], changes: PageChange[]) => void) {
     const q = query(
         collection(db, "pages"),
         where("parentId", "==", parentId)
     );
-    return onSnapshot(q, (snapshot) => {
-        const pages: Page[] = [];
-        snapshot.forEach(doc => {
-            pages.push({ id: doc.id, ...doc.data() } as Page);
-        });
-        callback(pages);
+
+    return subscribeToPageDeltas(q, callback);
+}
+
+/**
+ * Subscribe to a page query as deltas; unchanged pages keep their object
+ * identity across snapshots
+ */
+function subscribeToPageDeltas(q: Query, callback: (pages: Page[], changes: PageChange[]) => void) {
+    return subscribeToQueryDeltas(
+        q,
+        doc => ({ id: doc.id, ...doc.data() } as Page),
+        (pages, deltas) => {
+            // A removal only means the page left this query, so it stays cached
+            deltas.forEach(({ type, item }) => {
+                if (type !== 'removed') refreshCachedPage(item);
+            });
+            callback(pages, deltas.map(({ type, item }) => ({ type, page: item })));
+        }
+    );
+}
+
+// --- Page bodies ---
+// Page bodies live in pages/{pageId}/body/current so that listeners on the
+// pages collection only carry metadata. Pages not yet moved by
+// backend/src/scripts/split-page-bodies.ts still hold `content` inline.
+
+export const PAGE_BODY_COLLECTION = "body";
+
+export function pageBodyRef(pageId: string) {
+    return doc(db, "pages", pageId, PAGE_BODY_COLLECTION, "current");
+}
+
+/**
+ * Load a page body, falling back to the inline body of unmigrated pages
+ */
+export async function getPageBody(pageId: string): Promise<string> {
+    const snap = await getDoc(pageBodyRef(pageId));
+    if (snap.exists()) return snap.data().content || "";
+
+    const pageSnap = await getDoc(doc(db, "pages", pageId));
+    return pageSnap.exists() ? pageSnap.data().content || "" : "";
+}
+
+/**
+ * Live page body for the editor
+ */
+export function subscribeToPageBody(pageId: string, callback: (content: string) => void) {
+    let loadedInline = false;
+
+    return onSnapshot(pageBodyRef(pageId), (snap) => {
+        // Ignore local writes to prevent overwriting user input
+        if (snap.metadata.hasPendingWrites) return;
+
+        if (snap.exists()) {
+            callback(snap.data().content || "");
+        } else if (!loadedInline) {
+            // Unmigrated page: the body is still inline
+            loadedInline = true;
+            getPageBody(pageId)
+                .then(callback)
+                .catch(error => console.error("Failed to load page body:", error));
+        }
     });
 }
 
@@ -361,17 +607,14 @@ export async function getWorkspaceMembers(workspaceId: string) {
 
     if (!wsSnap.exists()) return [];
 
-    const memberIds = wsSnap.data().members || [];
-    const members = [];
+    const memberIds: string[] = wsSnap.data().members || [];
 
-    // Ideally use 'in' query if list is small, or parallel fetches
-    for (const uid of memberIds) {
-        const userSnap = await getDoc(doc(db, "users", uid));
-        if (userSnap.exists()) {
-            members.push({ uid, ...userSnap.data() });
-        }
-    }
-    return members;
+    // Batched 'in' queries through the shared profile loader
+    const profiles = await userProfiles.loadMany(memberIds);
+    return memberIds.flatMap(uid => {
+        const profile = profiles.get(uid);
+        return profile ? [profile] : [];
+    });
 }
 
 // --- Collaboration: Updates & Analytics ---
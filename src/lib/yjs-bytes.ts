@@ -0,0 +1,54 @@
+/**
+ * Yjs payload storage
+ * How the Firestore provider stores Yjs updates and snapshots: as Firestore
+ * Bytes, split into document-sized parts when too large. Kept free of the
+ * Firestore instance so scripts/bench-yjs-bytes.ts can run it under Node.
+ */
+
+import type { Bytes } from 'firebase/firestore';
+
+// Payloads written before the switch to Bytes are base64 strings
+export type StoredBytes = Bytes | string;
+
+// Firestore documents are capped at 1 MiB; leave room for the other fields
+export const MAX_PART_BYTES = 900 * 1024;
+
+/**
+ * Payload bytes of a stored update or snapshot
+ */
+export function fromStoredBytes(data: StoredBytes): Uint8Array {
+    if (typeof data !== 'string') return data.toUint8Array();
+
+    // Legacy base64 payload
+    const binary = atob(data);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+/**
+ * Split a payload into document-sized views (no copying)
+ */
+export function splitBytes(bytes: Uint8Array): Uint8Array[] {
+    if (bytes.byteLength <= MAX_PART_BYTES) return [bytes];
+
+    const parts: Uint8Array[] = [];
+    for (let offset = 0; offset < bytes.byteLength; offset += MAX_PART_BYTES) {
+        parts.push(bytes.subarray(offset, offset + MAX_PART_BYTES));
+    }
+    return parts;
+}
+
+export function joinBytes(parts: Uint8Array[]): Uint8Array {
+    if (parts.length === 1) return parts[0];
+
+    const joined = new Uint8Array(parts.reduce((size, part) => size + part.byteLength, 0));
+    let offset = 0;
+    for (const part of parts) {
+        joined.set(part, offset);
+        offset += part.byteLength;
+    }
+    return joined;
+}
@@ -1,49 +1,198 @@
 /**
  * Yjs Firestore Provider
- * Syncs Yjs document with Firestore for real-time collaboration
+ * Syncs Yjs document with Firestore for real-time collaboration.
+ * Updates are appended to pages/{id}/yjs-updates and periodically compacted
+ * into pages/{id}/yjs-snapshot/current, so a cold load is one snapshot plus
+ * a short tail of updates. Payloads are stored as Firestore Bytes; ones over
+ * the document size limit are split across several documents.
+ * A per-page cursor persisted with the local replica lets a reconnecting
+ * client resume the update stream where it left off, and state vectors
+ * decide which local state still has to be written. Awareness (cursors,
+ * presence) is not stored; it goes over the page's awareness channel.
  */
 
 import * as Y from 'yjs';
 import { Awareness } from 'y-protocols/awareness';
 import { db } from '@/lib/firebase';
+import { joinAwarenessRoom } from '@/lib/awareness-channel';
+import { getAdaptiveDelay, AdaptiveDebounceOptions } from '@/hooks/useAdaptiveDebounce';
 import {
     collection,
     doc,
+    getDoc,
+    getDocs,
+    getCountFromServer,
     onSnapshot,
     addDoc,
     query,
     orderBy,
-    limit,
     serverTimestamp,
     Timestamp,
     where,
+    runTransaction,
+    writeBatch,
+    Bytes,
+    QueryConstraint,
+    DocumentReference,
 } from 'firebase/firestore';
+import { StoredBytes, fromStoredBytes, splitBytes, joinBytes } from '@/lib/yjs-bytes';
 
 interface FirestoreUpdate {
-    data: string; // base64 encoded Yjs update
+    data: StoredBytes; // Yjs update (or one part of it)
     timestamp: Timestamp;
     userId: string;
+    // Set when the update is split across documents
+    group?: string;
+    part?: number;
+    parts?: number;
 }
 
+interface FirestoreSnapshot {
+    data: StoredBytes; // merged Yjs update (first part when split)
+    stateVector: StoredBytes; // state vector of the merged update
+    compactedThrough: Timestamp; // timestamp of the newest update merged in
+    updateCount: number;
+    compactedAt: Timestamp;
+    // Number of parts; parts after the first live in `current-{partsId}-{index}`
+    // (`current-{index}` when partsId is missing)
+    parts?: number;
+    partsId?: string;
+}
+
+interface PartialUpdate {
+    parts: Uint8Array[];
+    docIds: string[];
+    // Server timestamp of each part (missing until written)
+    timestamps: (Timestamp | undefined)[];
+}
+
+interface ReceivedUpdate {
+    key: string;
+    update: Uint8Array;
+    docIds: string[];
+    timestamp: Timestamp | null;
+}
+
+interface TailUpdate {
+    data: Uint8Array;
+    timestamp: Timestamp;
+    // Documents holding this update (several when split)
+    docIds: string[];
+}
+
+/**
+ * Key-value store kept next to the local replica (y-indexeddb's
+ * IndexeddbPersistence implements it)
+ */
+export interface SyncCursorStore {
+    get(key: string): Promise<any>;
+    set(key: string, value: any): Promise<any>;
+}
+
+interface StoredSyncCursor {
+    // Timestamp of the newest update the local replica holds
+    seconds: number;
+    nanoseconds: number;
+    // Clocks known to be in Firestore at that point
+    stateVector: Uint8Array;
+}
+
+const SYNC_CURSOR_KEY = 'firestore-sync-cursor';
+
+// Updates since the last snapshot that trigger a compaction
+const COMPACTION_THRESHOLD = 200;
+// Random delay before compacting, so clients seeing the same tail rarely race
+const COMPACTION_JITTER = 5000;
+// Firestore batch write limit
+const DELETE_BATCH_SIZE = 500;
+// Parts written per commit; Firestore caps a commit at about 10 MiB
+const PARTS_PER_COMMIT = 8;
+// A split update still missing parts after this long was abandoned by its writer
+const PARTIAL_TIMEOUT = 10 * 60 * 1000;
+
+export interface FlushOptions {
+    // Delay between flushes while typing, adapted like useAdaptiveDebounce
+    baseDelay: number;
+    collaborativeDelay?: number;
+    idleDelay?: number;
+    // Pending bytes that force an immediate flush
+    maxPendingBytes: number;
+}
+
+const DEFAULT_FLUSH_OPTIONS: FlushOptions = {
+    baseDelay: 1000,
+    maxPendingBytes: 64 * 1024,
+};
+
 export class FirestoreYjsProvider {
     public ydoc: Y.Doc;
     public awareness: Awareness;
     private pageId: string;
     private userId: string;
     private unsubscribe: (() => void) | null = null;
+    private unsubscribeSnapshot: (() => void) | null = null;
+    private leaveAwarenessRoom: () => void;
     private synced = false;
+    private destroyed = false;
+
+    // Latest compacted snapshot and the update log after it
+    private snapshotData: Uint8Array | null = null;
+    private compactedThrough: Timestamp | null = null;
+    private tail = new Map<string, TailUpdate>();
+    // Split updates still waiting for some of their parts, by group
+    private partials = new Map<string, PartialUpdate>();
+    private snapshot: FirestoreSnapshot | null = null;
+    private compactionTimer: ReturnType<typeof setTimeout> | null = null;
+    private compacting = false;
+
+    // Sync cursor: every update up to appliedThrough is in the local replica
+    private cursorStore: SyncCursorStore | null;
+    private appliedThrough: Timestamp | null = null;
+    // Clock per Yjs client known to be in Firestore
+    private remoteState = new Map<number, number>();
+    // Set when the listener resumed from the cursor, so the tail before it
+    // was never downloaded; compaction backfills it first
+    private resumedFrom: Timestamp | null = null;
+    private skippedUpdates = 0;
 
-    constructor(pageId: string, userId: string, ydoc?: Y.Doc) {
+    // Outbound buffer: local updates are merged and written together
+    private flushOptions: FlushOptions;
+    private pending: Uint8Array[] = [];
+    private pendingBytes = 0;
+    private flushTimer: ReturnType<typeof setTimeout> | null = null;
+    private lastLocalUpdate = Date.now();
+    private hasCollaborators = false;
+
+    constructor(
+        pageId: string,
+        userId: string,
+        ydoc?: Y.Doc,
+        flushOptions?: Partial<FlushOptions>,
+        cursorStore?: SyncCursorStore
+    ) {
         this.pageId = pageId;
         this.userId = userId;
         this.ydoc = ydoc || new Y.Doc();
-        this.awareness = new Awareness(this.ydoc);
+        this.flushOptions = { ...DEFAULT_FLUSH_OPTIONS, ...flushOptions };
+        this.cursorStore = cursorStore || null;
+
+        // Shared with the page's presence and cursors
+        const room = joinAwarenessRoom(pageId, userId);
+        this.awareness = room.awareness;
+        this.leaveAwarenessRoom = room.leave;
+
+        // Flush faster while other clients are present
+        this.awareness.on('change', this.handleAwarenessChange);
 
-        // Set user info in awareness
+        // Set user info in awareness (presence may have set it already)
+        const user = this.awareness.getLocalState()?.user;
         this.awareness.setLocalStateField('user', {
+            ...user,
             userId: this.userId,
-            color: this.getUserColor(userId),
+            color: user?.color ?? this.getUserColor(userId),
         });
+        // Peers may already be known to the room (e.g. from usePresence)
+        this.handleAwarenessChange();
 
         this.connect();
     }
@@ -53,70 +202,590 @@ export class FirestoreYjsProvider {
      */
     private connect() {
         // Listen to local Yjs changes
-        this.ydoc.on('update', this.handleLocalUpdate.bind(this));
+        this.ydoc.on('update', this.handleLocalUpdate);
 
-        // Subscribe to Firestore updates
-        this.subscribeToFirestore();
+        // Don't lose buffered updates when the tab is hidden or closed
+        if (typeof window !== 'undefined') {
+            document.addEventListener('visibilitychange', this.handleVisibilityChange);
+            window.addEventListener('pagehide', this.flush);
+        }
+
+        // Load the cursor and the snapshot, then subscribe to the updates after them
+        this.loadCursor().then(() => {
+            if (!this.destroyed) this.subscribeToSnapshot();
+        });
+    }
+
+    private async loadCursor() {
+        if (!this.cursorStore) return;
+
+        try {
+            const cursor = await this.cursorStore.get(SYNC_CURSOR_KEY) as StoredSyncCursor | undefined;
+            if (!cursor) return;
+
+            this.appliedThrough = new Timestamp(cursor.seconds, cursor.nanoseconds);
+            mergeState(this.remoteState, Y.decodeStateVector(cursor.stateVector));
+        } catch (error) {
+            console.error('Failed to load Yjs sync cursor:', error);
+        }
+    }
+
+    private saveCursor() {
+        if (!this.cursorStore || !this.appliedThrough) return;
+
+        // Resume no later than the parts of a split update still being assembled
+        const pendingSince = this.pendingPartsSince();
+        const through = pendingSince && compareTimestamps(pendingSince, this.appliedThrough) < 0
+            ? pendingSince
+            : this.appliedThrough;
+
+        const cursor: StoredSyncCursor = {
+            seconds: through.seconds,
+            nanoseconds: through.nanoseconds,
+            stateVector: Y.encodeStateVector(this.remoteState),
+        };
+        this.cursorStore.set(SYNC_CURSOR_KEY, cursor).catch(error => {
+            console.error('Failed to save Yjs sync cursor:', error);
+        });
+    }
+
+    /**
+     * Record an update as applied: advances the cursor and, when the update
+     * continues a client's known range, that client's remote clock
+     */
+    private markApplied(update: Uint8Array, timestamp: Timestamp) {
+        if (!this.appliedThrough || compareTimestamps(timestamp, this.appliedThrough) > 0) {
+            this.appliedThrough = timestamp;
+        }
+
+        const { from, to } = Y.parseUpdateMeta(update);
+        to.forEach((clock, client) => {
+            const known = this.remoteState.get(client) ?? 0;
+            if ((from.get(client) ?? 0) <= known && clock > known) this.remoteState.set(client, clock);
+        });
     }
 
     /**
-     * Handle local Yjs document updates
+     * Write local state Firestore doesn't have yet, e.g. edits from an
+     * earlier session that closed before its buffer was flushed
      */
-    private handleLocalUpdate = async (update: Uint8Array, origin: any) => {
+    private pushMissingState() {
+        const local = Y.decodeStateVector(Y.encodeStateVector(this.ydoc));
+        let ahead = false;
+        local.forEach((clock, client) => {
+            if (clock > (this.remoteState.get(client) ?? 0)) ahead = true;
+        });
+        if (!ahead) return;
+
+        // The diff already contains anything still buffered
+        const missing = Y.encodeStateAsUpdate(this.ydoc, Y.encodeStateVector(this.remoteState));
+        this.pending = [missing];
+        this.pendingBytes = missing.byteLength;
+        this.flush();
+    }
+
+    private get updatesPath() {
+        return `pages/${this.pageId}/yjs-updates`;
+    }
+
+    private get snapshotRef() {
+        return doc(db, `pages/${this.pageId}/yjs-snapshot`, 'current');
+    }
+
+    /**
+     * Buffer local Yjs document updates; flushed on an adaptive interval or
+     * once the buffer grows past maxPendingBytes
+     */
+    private handleLocalUpdate = (update: Uint8Array, origin: any) => {
         // Don't sync back updates that came from Firestore
         if (origin === 'firestore') return;
 
+        const now = Date.now();
+        const idleFor = now - this.lastLocalUpdate;
+        this.lastLocalUpdate = now;
+
+        this.pending.push(update);
+        this.pendingBytes += update.byteLength;
+
+        if (this.pendingBytes >= this.flushOptions.maxPendingBytes) {
+            this.flush();
+        } else if (!this.flushTimer) {
+            // Throttle, not debounce: continuous typing still flushes every interval
+            const delay = getAdaptiveDelay(this.getDelayOptions(), idleFor);
+            this.flushTimer = setTimeout(this.flush, delay);
+        }
+    };
+
+    /**
+     * Write all buffered updates as one merged update
+     */
+    flush = async () => {
+        if (this.flushTimer) {
+            clearTimeout(this.flushTimer);
+            this.flushTimer = null;
+        }
+        if (this.pending.length === 0) return;
+
+        const update = this.pending.length === 1 ? this.pending[0] : Y.mergeUpdates(this.pending);
+        this.pending = [];
+        this.pendingBytes = 0;
+
         try {
-            // Encode update to base64
-            const encoded = btoa(String.fromCharCode(...Array.from(update)));
-
-            // Send to Firestore
-            await addDoc(collection(db, `pages/${this.pageId}/yjs-updates`), {
-                data: encoded,
-                timestamp: serverTimestamp(),
-                userId: this.userId,
-            });
+            const parts = splitBytes(update);
+            if (parts.length === 1) {
+                // Send to Firestore
+                await addDoc(collection(db, this.updatesPath), {
+                    data: Bytes.fromUint8Array(update),
+                    timestamp: serverTimestamp(),
+                    userId: this.userId,
+                });
+                return;
+            }
+
+            // Too large for one document: write the parts a few per commit;
+            // readers apply the update once every part of the group is there
+            const group = doc(collection(db, this.updatesPath)).id;
+            const written: string[] = [];
+            try {
+                for (let start = 0; start < parts.length; start += PARTS_PER_COMMIT) {
+                    const batch = writeBatch(db);
+                    const ids: string[] = [];
+                    parts.slice(start, start + PARTS_PER_COMMIT).forEach((part, i) => {
+                        const id = `${group}-${start + i}`;
+                        batch.set(doc(db, this.updatesPath, id), {
+                            data: Bytes.fromUint8Array(part),
+                            timestamp: serverTimestamp(),
+                            userId: this.userId,
+                            group,
+                            part: start + i,
+                            parts: parts.length,
+                        });
+                        ids.push(id);
+                    });
+                    await batch.commit();
+                    written.push(...ids);
+                }
+            } catch (error) {
+                // Don't leave a group behind that can never be completed
+                this.deleteDocs(written.map(id => doc(db, this.updatesPath, id))).catch(cleanupError => {
+                    console.error('Failed to delete partial Yjs update:', cleanupError);
+                });
+                throw error;
+            }
         } catch (error) {
             console.error('Failed to send update to Firestore:', error);
         }
     };
 
+    private getDelayOptions(): AdaptiveDebounceOptions {
+        const { baseDelay, collaborativeDelay, idleDelay } = this.flushOptions;
+        return { baseDelay, collaborativeDelay, idleDelay, hasCollaborators: this.hasCollaborators };
+    }
+
     /**
-     * Subscribe to Firestore updates
+     * Another user is on the page. The room's awareness holds every peer
+     * heard over the awareness channel; this client and the same user's
+     * other tabs don't count.
      */
-    private subscribeToFirestore() {
-        const updatesRef = collection(db, `pages/${this.pageId}/yjs-updates`);
-        const q = query(
-            updatesRef,
-            orderBy('timestamp', 'asc'),
-            limit(100) // Last 100 updates
+    private handleAwarenessChange = () => {
+        let hasCollaborators = false;
+        this.awareness.getStates().forEach((state, clientId) => {
+            const peerId = state.user?.userId;
+            if (clientId !== this.awareness.clientID && peerId && peerId !== this.userId) hasCollaborators = true;
+        });
+        this.hasCollaborators = hasCollaborators;
+    };
+
+    private handleVisibilityChange = () => {
+        if (document.visibilityState === 'hidden') this.flush();
+    };
+
+    /**
+     * Follow the compacted snapshot. The first delivery starts the update
+     * listener; later ones come from compactions by any client.
+     */
+    private subscribeToSnapshot() {
+        this.unsubscribeSnapshot = onSnapshot(this.snapshotRef, (snap) => {
+            const snapshot = snap.exists() ? snap.data() as FirestoreSnapshot : null;
+            const applied = snapshot &&
+                (!this.compactedThrough || compareTimestamps(snapshot.compactedThrough, this.compactedThrough) > 0)
+                ? this.applySnapshot(snapshot)
+                : Promise.resolve();
+
+            applied.then(() => {
+                if (!this.unsubscribe && !this.destroyed) this.subscribeToFirestore();
+            });
+        }, (error) => {
+            console.error('Failed to load Yjs snapshot:', error);
+            if (!this.unsubscribe) this.subscribeToFirestore();
+        });
+    }
+
+    private async applySnapshot(snapshot: FirestoreSnapshot) {
+        try {
+            // The local replica already holds every update this snapshot merged
+            const covered = !!this.appliedThrough && compareTimestamps(snapshot.compactedThrough, this.appliedThrough) <= 0;
+
+            if (covered) {
+                // Only needed again for compaction, which loads it on demand
+                this.snapshotData = null;
+            } else {
+                const data = await this.readSnapshotData(snapshot);
+                // A newer compaction replaced the parts meanwhile; its own delivery follows
+                if (!data) return;
+
+                Y.applyUpdate(this.ydoc, data, 'firestore');
+                this.snapshotData = data;
+                this.appliedThrough = snapshot.compactedThrough;
+            }
+
+            this.snapshot = snapshot;
+            this.compactedThrough = snapshot.compactedThrough;
+            mergeState(this.remoteState, Y.decodeStateVector(fromStoredBytes(snapshot.stateVector)));
+
+            // Updates merged into the snapshot are no longer part of the tail
+            this.tail.forEach((update, id) => {
+                if (compareTimestamps(update.timestamp, snapshot.compactedThrough) <= 0) this.tail.delete(id);
+            });
+
+            // Nothing skipped by a resume is left outside the snapshot
+            if (this.resumedFrom && compareTimestamps(this.resumedFrom, snapshot.compactedThrough) <= 0) {
+                this.resumedFrom = null;
+                this.skippedUpdates = 0;
+            }
+        } catch (error) {
+            console.error('Failed to apply Yjs snapshot:', error);
+        }
+    }
+
+    private async readSnapshotData(snapshot: FirestoreSnapshot): Promise<Uint8Array | null> {
+        const first = fromStoredBytes(snapshot.data);
+        const count = snapshot.parts ?? 1;
+        if (count <= 1) return first;
+
+        const rest = await Promise.all(
+            Array.from({ length: count - 1 }, (_, i) => getDoc(this.snapshotPartRef(snapshot.partsId, i + 1)))
         );
+        const parts = [first];
+        for (const part of rest) {
+            const data = part.data();
+            if (!data || !data.compactedThrough?.isEqual(snapshot.compactedThrough)) return null;
+            parts.push(fromStoredBytes(data.data));
+        }
+        return joinBytes(parts);
+    }
+
+    private snapshotPartRef(partsId: string | undefined, index: number) {
+        return doc(db, `pages/${this.pageId}/yjs-snapshot`, partsId ? `current-${partsId}-${index}` : `current-${index}`);
+    }
+
+    private snapshotPartRefs(snapshot: FirestoreSnapshot) {
+        return Array.from({ length: (snapshot.parts ?? 1) - 1 }, (_, i) => this.snapshotPartRef(snapshot.partsId, i + 1));
+    }
+
+    /**
+     * Decode an update document. Parts of a split update are held until the
+     * whole update has arrived; returns null while parts are missing. The
+     * timestamp of a split update is that of its newest part, and null
+     * until every part has one.
+     */
+    private receiveUpdate(docId: string, data: FirestoreUpdate): ReceivedUpdate | null {
+        const bytes = fromStoredBytes(data.data);
+        if (!data.group || !data.parts || data.parts <= 1) {
+            return { key: docId, update: bytes, docIds: [docId], timestamp: data.timestamp ?? null };
+        }
+
+        // Already assembled (later parts only resolve our own server timestamps)
+        if (this.tail.has(data.group)) return null;
+
+        let partial = this.partials.get(data.group);
+        if (!partial) {
+            partial = { parts: new Array(data.parts), docIds: [], timestamps: new Array(data.parts) };
+            this.partials.set(data.group, partial);
+        }
+        if (!partial.parts[data.part!]) partial.docIds.push(docId);
+        partial.parts[data.part!] = bytes;
+        partial.timestamps[data.part!] = data.timestamp ?? undefined;
+
+        if (partial.docIds.length < data.parts) return null;
+
+        let timestamp: Timestamp | null = null;
+        for (const partTimestamp of partial.timestamps) {
+            if (!partTimestamp) {
+                timestamp = null;
+                break;
+            }
+            if (!timestamp || compareTimestamps(partTimestamp, timestamp) > 0) timestamp = partTimestamp;
+        }
+        if (timestamp) this.partials.delete(data.group);
+        return { key: data.group, update: joinBytes(partial.parts), docIds: partial.docIds, timestamp };
+    }
+
+    /**
+     * Oldest part of a split update still waiting for the rest of its parts.
+     * Neither the sync cursor nor a compaction may move past it, or readers
+     * starting from there would never see that part.
+     */
+    private pendingPartsSince(): Timestamp | null {
+        let since: Timestamp | null = null;
+        for (const partial of this.partials.values()) {
+            if (isAbandoned(partial)) continue;
+            for (const timestamp of partial.timestamps) {
+                if (timestamp && (!since || compareTimestamps(timestamp, since) < 0)) since = timestamp;
+            }
+        }
+        return since;
+    }
+
+    /**
+     * Subscribe to the Firestore updates after the snapshot
+     */
+    private subscribeToFirestore() {
+        const updatesRef = collection(db, this.updatesPath);
+
+        // Resume from the cursor when the local replica is ahead of the snapshot
+        const resumeFrom = this.appliedThrough &&
+            (!this.compactedThrough || compareTimestamps(this.appliedThrough, this.compactedThrough) > 0)
+            ? this.appliedThrough
+            : null;
+        if (resumeFrom) {
+            this.resumedFrom = resumeFrom;
+            this.countSkippedUpdates(resumeFrom);
+        }
+
+        // Updates at the boundary are re-applied; Yjs updates are idempotent
+        const from = resumeFrom ?? this.compactedThrough;
+        const q = from
+            ? query(updatesRef, where('timestamp', '>=', from), orderBy('timestamp', 'asc'))
+            : query(updatesRef, orderBy('timestamp', 'asc'));
 
         this.unsubscribe = onSnapshot(q, (snapshot) => {
+            let advanced = false;
+
             snapshot.docChanges().forEach((change) => {
-                if (change.type === 'added') {
-                    const data = change.doc.data() as FirestoreUpdate;
+                const data = change.doc.data() as FirestoreUpdate;
 
-                    // Don't apply our own updates
-                    if (data.userId === this.userId) return;
+                if (change.type === 'removed') {
+                    this.tail.delete(data.group ?? change.doc.id);
+                    if (data.group) this.partials.delete(data.group);
+                    return;
+                }
+
+                try {
+                    const received = this.receiveUpdate(change.doc.id, data);
+                    if (!received) return;
 
-                    try {
-                        // Decode from base64
-                        const updateArray = Uint8Array.from(atob(data.data), (c) => c.charCodeAt(0));
+                    // Own updates get their server timestamp in a later 'modified' change
+                    const { timestamp } = received;
+                    if (timestamp && !this.isCompacted(timestamp)) {
+                        this.tail.set(received.key, { data: received.update, timestamp, docIds: received.docIds });
+                    }
 
+                    // Don't apply our own updates
+                    if (change.type === 'added' && data.userId !== this.userId) {
                         // Apply update with 'firestore' origin to prevent loop
-                        Y.applyUpdate(this.ydoc, updateArray, 'firestore');
-
-                        if (!this.synced) {
-                            this.synced = true;
-                            console.log('✅ Yjs document synced with Firestore');
-                        }
-                    } catch (error) {
-                        console.error('Failed to apply Firestore update:', error);
+                        Y.applyUpdate(this.ydoc, received.update, 'firestore');
+                    }
+
+                    // Own updates are in the replica already; either way it now holds this one
+                    if (timestamp) {
+                        this.markApplied(received.update, timestamp);
+                        advanced = true;
                     }
+                } catch (error) {
+                    console.error('Failed to apply Firestore update:', error);
                 }
             });
+
+            if (advanced) this.saveCursor();
+
+            if (!this.synced) {
+                this.synced = true;
+                this.pushMissingState();
+                console.log('✅ Yjs document synced with Firestore');
+            }
+
+            if (this.tail.size + this.skippedUpdates >= COMPACTION_THRESHOLD) this.scheduleCompaction();
+        });
+    }
+
+    /**
+     * Query for the updates a resumed listener skipped
+     */
+    private skippedQuery(resumeFrom: Timestamp, ...constraints: QueryConstraint[]) {
+        const range: QueryConstraint[] = [where('timestamp', '<', resumeFrom)];
+        if (this.compactedThrough) range.unshift(where('timestamp', '>=', this.compactedThrough));
+        return query(collection(db, this.updatesPath), ...range, ...constraints);
+    }
+
+    /**
+     * Count the skipped updates (an aggregation, no download) so they still
+     * count towards compaction
+     */
+    private async countSkippedUpdates(resumeFrom: Timestamp) {
+        try {
+            const count = await getCountFromServer(this.skippedQuery(resumeFrom));
+            if (this.resumedFrom !== resumeFrom) return;
+
+            this.skippedUpdates = count.data().count;
+            if (this.tail.size + this.skippedUpdates >= COMPACTION_THRESHOLD) this.scheduleCompaction();
+        } catch (error) {
+            console.error('Failed to count skipped Yjs updates:', error);
+        }
+    }
+
+    /**
+     * Download the updates a resumed listener skipped into the tail, so
+     * compaction can merge and delete them. They are not applied: the local
+     * replica already holds them.
+     */
+    private async backfillTail() {
+        const resumeFrom = this.resumedFrom!;
+        const skipped = await getDocs(this.skippedQuery(resumeFrom, orderBy('timestamp', 'asc')));
+
+        skipped.forEach(updateDoc => {
+            const data = updateDoc.data() as FirestoreUpdate;
+            const received = this.receiveUpdate(updateDoc.id, data);
+            if (received?.timestamp && !this.isCompacted(received.timestamp)) {
+                this.tail.set(received.key, { data: received.update, timestamp: received.timestamp, docIds: received.docIds });
+            }
         });
+
+        if (this.resumedFrom === resumeFrom) {
+            this.resumedFrom = null;
+            this.skippedUpdates = 0;
+        }
+    }
+
+    private isCompacted(timestamp: Timestamp): boolean {
+        return !!this.compactedThrough && compareTimestamps(timestamp, this.compactedThrough) <= 0;
+    }
+
+    private scheduleCompaction() {
+        if (this.compactionTimer || this.compacting) return;
+        this.compactionTimer = setTimeout(() => {
+            this.compactionTimer = null;
+            this.compact();
+        }, Math.random() * COMPACTION_JITTER);
+    }
+
+    /**
+     * Merge the snapshot and the update tail into a new snapshot, then delete
+     * the updates it supersedes. Parts after the first are written under a
+     * fresh partsId before the snapshot document; the transaction only
+     * writes that document if the stored snapshot is still the one merged
+     * here, so a compaction by another client is never overwritten with a
+     * merge that lacks its updates.
+     */
+    private async compact() {
+        if (this.compacting || this.destroyed || this.tail.size + this.skippedUpdates < COMPACTION_THRESHOLD) return;
+        this.compacting = true;
+
+        try {
+            if (this.resumedFrom) await this.backfillTail();
+            if (this.snapshot && !this.snapshotData) {
+                const snapshot = this.snapshot;
+                const data = await this.readSnapshotData(snapshot);
+                // Replaced meanwhile; the next compaction starts from the new one
+                if (!data || this.snapshot !== snapshot) return;
+                this.snapshotData = data;
+            }
+            if (this.tail.size === 0) return;
+
+            // The snapshot merged below; compared again inside the transaction
+            const base = this.compactedThrough;
+            const baseSnapshot = this.snapshot;
+
+            // Updates from the oldest incomplete split update on stay in the tail
+            const pendingSince = this.pendingPartsSince();
+            const entries = Array.from(this.tail.entries()).filter(([, update]) =>
+                !pendingSince || compareTimestamps(update.timestamp, pendingSince) < 0
+            );
+            if (entries.length === 0) return;
+
+            const updates = entries.map(([, update]) => update.data);
+            if (this.snapshotData) updates.unshift(this.snapshotData);
+
+            const merged = Y.mergeUpdates(updates);
+            const stateVector = Y.encodeStateVectorFromUpdate(merged);
+            const compactedThrough = entries.reduce(
+                (latest, [, update]) => compareTimestamps(update.timestamp, latest) > 0 ? update.timestamp : latest,
+                entries[0][1].timestamp
+            );
+
+            const parts = splitBytes(merged);
+            const partsId = doc(collection(db, this.updatesPath)).id;
+            const partRefs = parts.slice(1).map((_, i) => this.snapshotPartRef(partsId, i + 1));
+
+            let written: boolean;
+            try {
+                // Tagged with compactedThrough so readers can detect a mix of two compactions
+                for (let start = 0; start < partRefs.length; start += PARTS_PER_COMMIT) {
+                    const batch = writeBatch(db);
+                    partRefs.slice(start, start + PARTS_PER_COMMIT).forEach((ref, i) => {
+                        batch.set(ref, {
+                            data: Bytes.fromUint8Array(parts[start + i + 1]),
+                            compactedThrough,
+                        });
+                    });
+                    await batch.commit();
+                }
+
+                written = await runTransaction(db, async (transaction) => {
+                    const current = await transaction.get(this.snapshotRef);
+                    const currentThrough = current.exists() ? (current.data() as FirestoreSnapshot).compactedThrough : null;
+
+                    // Another client compacted since our snapshot; its delivery
+                    // updates the tail and a later compaction merges from there
+                    if (currentThrough ? !base || !currentThrough.isEqual(base) : !!base) return false;
+
+                    transaction.set(this.snapshotRef, {
+                        data: Bytes.fromUint8Array(parts[0]),
+                        stateVector: Bytes.fromUint8Array(stateVector),
+                        compactedThrough,
+                        updateCount: entries.length,
+                        compactedAt: serverTimestamp(),
+                        parts: parts.length,
+                        partsId,
+                    });
+                    return true;
+                });
+            } catch (error) {
+                this.deleteDocs(partRefs).catch(cleanupError => {
+                    console.error('Failed to delete unused Yjs snapshot parts:', cleanupError);
+                });
+                throw error;
+            }
+            if (!written) {
+                await this.deleteDocs(partRefs);
+                return;
+            }
+
+            // Merged updates, split updates whose writer never finished, and
+            // the parts of the snapshot this one replaced
+            const stale = entries.flatMap(([, update]) => update.docIds);
+            this.partials.forEach((partial, group) => {
+                if (!isAbandoned(partial)) return;
+                stale.push(...partial.docIds);
+                this.partials.delete(group);
+            });
+            await this.deleteDocs([
+                ...stale.map(id => doc(db, this.updatesPath, id)),
+                ...(baseSnapshot ? this.snapshotPartRefs(baseSnapshot) : []),
+            ]);
+        } catch (error) {
+            console.error('Failed to compact Yjs updates:', error);
+        } finally {
+            this.compacting = false;
+        }
+    }
+
+    private async deleteDocs(refs: DocumentReference[]) {
+        for (let i = 0; i < refs.length; i += DELETE_BATCH_SIZE) {
+            const batch = writeBatch(db);
+            refs.slice(i, i + DELETE_BATCH_SIZE).forEach(ref => batch.delete(ref));
+            await batch.commit();
+        }
     }
 
     /**
@@ -141,18 +810,54 @@ export class FirestoreYjsProvider {
      * Disconnect from Firestore
      */
     destroy() {
+        this.flush();
+        if (typeof window !== 'undefined') {
+            document.removeEventListener('visibilitychange', this.handleVisibilityChange);
+            window.removeEventListener('pagehide', this.flush);
+        }
+        this.awareness.off('change', this.handleAwarenessChange);
+
+        this.destroyed = true;
         if (this.unsubscribe) {
             this.unsubscribe();
         }
+        this.unsubscribeSnapshot?.();
+        if (this.compactionTimer) {
+            clearTimeout(this.compactionTimer);
+        }
         this.ydoc.off('update', this.handleLocalUpdate);
-        this.awareness.destroy();
+        this.leaveAwarenessRoom();
     }
 }
 
+function compareTimestamps(a: Timestamp, b: Timestamp): number {
+    return a.seconds - b.seconds || a.nanoseconds - b.nanoseconds;
+}
+
+/**
+ * The writer of a split update stopped before writing all its parts
+ */
+function isAbandoned(partial: PartialUpdate): boolean {
+    const newest = partial.timestamps.reduce<number | null>(
+        (latest, timestamp) => timestamp ? Math.max(latest ?? 0, timestamp.toMillis()) : latest,
+        null
+    );
+    return newest !== null && Date.now() - newest > PARTIAL_TIMEOUT;
+}
+
+/**
+ * Raise each client's clock in `state` to the one in `other`
+ */
+function mergeState(state: Map<number, number>, other: Map<number, number>) {
+    other.forEach((clock, client) => {
+        if (clock > (state.get(client) ?? 0)) state.set(client, clock);
+    });
+}
+
 /**
  * Setup Yjs for a page with offline support
  */
-export async function setupYjsForPage(pageId: string, userId: string) {
+export async function setupYjsForPage(pageId: string, userId: string, flushOptions?: Partial<FlushOptions>) {
     const { IndexeddbPersistence } = await import('y-indexeddb');
 
     const ydoc = new Y.Doc();
@@ -163,12 +868,13 @@ export async function setupYjsForPage(pageId: string, userId: string) {
     await indexeddbProvider.whenSynced;
     console.log('✅ Yjs synced with IndexedDB');
 
-    // Firestore provider for real-time sync
-    const firestoreProvider = new FirestoreYjsProvider(pageId, userId, ydoc);
+    // Firestore provider for real-time sync; the sync cursor lives next to the replica
+    const firestoreProvider = new FirestoreYjsProvider(pageId, userId, ydoc, flushOptions, indexeddbProvider);
 
     return {
         ydoc,
         awareness: firestoreProvider.awareness,
+        flush: firestoreProvider.flush,
         destroy: () => {
             indexeddbProvider.destroy();
             firestoreProvider.destroy();